@@ -0,0 +1,204 @@
+"""
+Headless, spec-driven batch builder for the Auto Ribbon Tool.
+
+Reads a JSON spec of assets, then builds and saves their rigs across a pool of
+worker processes. Each worker runs its own Maya standalone session:
+
+    mayapy AutoRibbonBatch.py spec.json [--workers 4] [--backend maya|fake] [--report report.json]
+
+Spec:
+
+    {
+        "defaults": {"tentacleLength": 500, "primaryAxis": "y", "secondaryAxis": "z", "rollAxis": "x"},
+        "assets": [
+            {"name": "squidA", "modelFile": "models/squidA.mb", "output": "rigs/squidA_rig.ma",
+             "model": "tentacle", "jointCount": 18, "stages": ["createRibbonCurve", "buildRig"]},
+            {"name": "octopus", "modelFile": "models/octopus.mb", "output": "rigs/octopus_rig.mb",
+             "tentacles": [{"prefix": "arm1_", "model": "arm1", "jointCount": 24}, ...]}
+        ]
+    }
+
+Asset keys other than name, modelFile, output, stages and tentacles are Tentacle
+arguments. An asset with "tentacles" is built with buildTentacles, each entry
+adding to the asset's arguments. A "templateCache" folder, in the defaults or
+per asset, reuses rigs of equal parameters across assets and runs, see
+AutoRibbonTemplates. Relative paths are relative to the spec file.
+
+The fake backend builds into AutoRibbonFakeCmds instead of Maya and saves the
+scene as JSON, so specs and the worker pool can be tested without a Maya license.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import AutoRibbonFakeCmds
+import AutoRibbonLauncher
+
+ASSET_KEYS = ('name', 'modelFile', 'output', 'stages', 'tentacles')
+STAGES = ('createRibbonCurve', 'setUpTentacleFK', 'tentacleRoll', 'tentacleRipple', 'tentacleRibbonDeformer',
+          'buildRig', 'buildPlanned')
+DEFAULT_STAGES = ('createRibbonCurve', 'buildRig')
+BACKENDS = ('maya', 'fake')
+
+# Session of this worker process, set up once by initializeWorker
+_worker = {}
+
+
+def loadSpec(path):
+    """
+    Reads a batch spec, applying its defaults to every asset and resolving paths against the spec's folder.
+
+    Returns:
+        list: Asset dicts.
+
+    Raises:
+        ValueError: The spec has duplicate names, missing outputs or unknown stages.
+    """
+    with open(path) as handle:
+        spec = json.load(handle)
+    root = os.path.dirname(os.path.abspath(path))
+
+    assets = []
+    problems = []
+    for index, entry in enumerate(spec.get('assets', [])):
+        asset = dict(spec.get('defaults', {}), **entry)
+        asset.setdefault('name', 'asset{}'.format(index + 1))
+        for key in ('modelFile', 'output', 'templateCache'):
+            if asset.get(key):
+                asset[key] = os.path.join(root, asset[key])
+        if not asset.get('output'):
+            problems.append("{}: no output file.".format(asset['name']))
+        unknown = [stage for stage in asset.get('stages', DEFAULT_STAGES) if stage not in STAGES]
+        if unknown:
+            problems.append("{}: unknown stages {}.".format(asset['name'], ', '.join(unknown)))
+        assets.append(asset)
+
+    names = [asset['name'] for asset in assets]
+    problems.extend("{}: duplicate asset name.".format(name) for name in sorted(set(names))
+                    if names.count(name) > 1)
+    if problems:
+        raise ValueError('\n'.join(problems))
+    return assets
+
+
+def initializeWorker(backend):
+    """Starts this process's Maya session (or FakeCmds) and loads the tool once."""
+    if backend == 'maya':
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        import maya.cmds as cmds
+    else:
+        cmds = AutoRibbonFakeCmds.install()
+    _worker.update(backend=backend, cmds=cmds, tool=AutoRibbonLauncher.loadTool())
+
+
+def tentacleArgs(asset):
+    """The Tentacle keyword arguments of an asset, with the Tentacle defaults the UI uses."""
+    kwargs = {'modelName': 'tentacle', 'isAutoMeasureLength': True}
+    kwargs.update((key, value) for key, value in asset.items() if key not in ASSET_KEYS)
+    # The cmds build commits through maya.cmds, which the fake worker already stands in for
+    if _worker['backend'] == 'fake' and kwargs.get('buildMode') == 'plan':
+        kwargs['backend'] = AutoRibbonFakeCmds.FakeModifierBackend(_worker['cmds'])
+    return kwargs
+
+
+def openModel(asset, models):
+    cmds = _worker['cmds']
+    if asset.get('modelFile') and _worker['backend'] == 'maya':
+        cmds.file(asset['modelFile'], open=True, force=True)
+    else:
+        cmds.file(new=True, force=True)
+        if _worker['backend'] == 'fake':
+            # The fake cannot read model files, so it gets empty meshes of the expected names
+            for model in models:
+                transform = cmds.createNode('transform', name=model)
+                cmds.createNode('mesh', name=model + 'Shape', parent=transform)
+
+
+def saveScene(path):
+    cmds = _worker['cmds']
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    cmds.file(rename=path)
+    cmds.file(save=True, force=True, type='mayaBinary' if path.lower().endswith('.mb') else 'mayaAscii')
+
+
+def buildAsset(asset):
+    """
+    Builds and saves one asset in this worker's session.
+
+    Returns:
+        dict: name, status ('ok' or 'failed'), output, seconds and error.
+    """
+    tool = _worker['tool']
+    start = time.perf_counter()
+    result = {'name': asset['name'], 'output': asset['output'], 'status': 'ok', 'error': None}
+    try:
+        kwargs = tentacleArgs(asset)
+        if 'tentacles' in asset:
+            specs = [dict(kwargs, **spec) for spec in asset['tentacles']]
+            openModel(asset, sorted(set(spec.get('model', 'tentacle') for spec in specs)))
+            # Already inside a pool worker, so the layouts are computed in this process
+            tool.buildTentacles(specs, processes=1)
+        else:
+            openModel(asset, [kwargs.get('model', 'tentacle')])
+            tentacle = tool.Tentacle(**kwargs)
+            for stage in asset.get('stages', DEFAULT_STAGES):
+                getattr(tentacle, stage)()
+        saveScene(asset['output'])
+    except Exception as error:
+        result.update(status='failed', error='{}: {}'.format(type(error).__name__, error))
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def run(assets, workers=None, backend='maya'):
+    """
+    Builds all assets, in a pool of `workers` processes or in this process when workers is 1.
+
+    Returns:
+        list: One buildAsset result per asset, in spec order.
+    """
+    if workers == 1 or len(assets) == 1:
+        initializeWorker(backend)
+        return [buildAsset(asset) for asset in assets]
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializeWorker, initargs=(backend,)) as executor:
+        return list(executor.map(buildAsset, assets))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('spec', help='JSON batch spec.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes, one per CPU by default.')
+    parser.add_argument('--backend', choices=BACKENDS, default='maya',
+                        help="'fake' builds into AutoRibbonFakeCmds, without Maya.")
+    parser.add_argument('--report', help='Write the results to this JSON file.')
+    args = parser.parse_args(argv)
+
+    try:
+        assets = loadSpec(args.spec)
+    except ValueError as error:
+        print(error)
+        return 2
+    start = time.perf_counter()
+    results = run(assets, args.workers, args.backend)
+    for result in results:
+        print('{:<8}{:<32}{:>10.2f}s  {}'.format(result['status'], result['name'], result['seconds'],
+                                                 result['error'] or result['output']))
+    failed = sum(result['status'] != 'ok' for result in results)
+    print('{} of {} assets built in {:.2f}s.'.format(len(results) - failed, len(results),
+                                                     time.perf_counter() - start))
+
+    if args.report:
+        with open(args.report, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Build-time benchmark for the Auto Ribbon Tool, runnable without Maya.
+
+Runs the RigLayout precomputation, createRibbonCurve, setUpTentacleFK, tentacleRoll, tentacleRipple and
+tentacleRibbonDeformer against the in-memory FakeCmds stand-in for a sweep
+of joint counts and reports wall time plus the number of cmds calls, nodes and
+connections per stage. Stages whose cost grows faster than linearly with the
+joint count are flagged, and --check fails on them and on the test_AutoRibbon.py
+regression tests. With --update, the built rig is then updated in place
+to jointCount + DELTA joints, timed as the updateRig stage.
+
+Usage:
+    python AutoRibbonBench.py [--counts 8 32 128 512] [--mode cmds|plan] [--set rollMode=solver ...]
+                              [--update DELTA] [--json out.json] [--check]
+"""
+
+import argparse
+import ast
+import importlib.util
+import json
+import math
+import os
+import sys
+import time
+
+import AutoRibbonFakeCmds
+
+TOOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AutoRibbonTool_v3.0.py')
+TEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_AutoRibbon.py')
+JOINT_COUNTS = (8, 32, 128, 512)
+STAGES = {
+    'cmds': ('createRibbonCurve', 'setUpTentacleFK', 'tentacleRoll', 'tentacleRipple', 'tentacleRibbonDeformer'),
+    'plan': ('createRibbonCurve', 'buildPlanned', 'tentacleRibbonDeformer'),
+}
+
+# Growth exponent above which a stage is reported as superlinear, with headroom for timer noise
+CALL_EXPONENT_LIMIT = 1.2
+TIME_EXPONENT_LIMIT = 1.5
+
+
+def loadTool(cmds=None):
+    """
+    Imports AutoRibbonTool_v3.0.py with FakeCmds installed as maya.cmds.
+
+    Returns:
+        tuple: (tool module, FakeCmds)
+    """
+    cmds = cmds or AutoRibbonFakeCmds.install()
+    spec = importlib.util.spec_from_file_location('AutoRibbonTool', TOOL_PATH)
+    tool = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(tool)
+    return tool, cmds
+
+
+def runStages(tool, cmds, jointCount, mode='cmds', options=None, updateDelta=None):
+    """
+    Builds one tentacle in a fresh fake scene.
+
+    Args:
+        options (dict): Extra Tentacle keyword arguments, e.g. {'rollMode': 'solver'}.
+        updateDelta (int): Joints to add (or remove, when negative) with updateRig after the build.
+
+    Returns:
+        list: One dict per stage with seconds, calls, nodes and connections.
+    """
+    cmds.reset()
+    model = cmds.createNode('transform', name='tentacle')
+    cmds.createNode('mesh', name='tentacleShape', parent=model)
+    # The cmds build commits its FK ctrl plan through maya.cmds, i.e. FakeCmds, by itself
+    kwargs = {'buildMode': mode}
+    if mode == 'plan':
+        kwargs['backend'] = AutoRibbonFakeCmds.FakeModifierBackend(cmds)
+    kwargs.update(options or {})
+    # Constructing the Tentacle computes its RigLayout, which is benchmarked as its own stage
+    start = time.perf_counter()
+    tentacle = tool.Tentacle(modelName='tentacle', jointCount=jointCount, tentacleLength=500,
+                             isAutoMeasureLength=True, primaryAxis='y', secondaryAxis='z', rollAxis='x',
+                             drvCtrl='CTRL_M_TentacleDrv_001', **kwargs)
+    results = [{'jointCount': jointCount, 'stage': 'RigLayout', 'seconds': time.perf_counter() - start,
+                'calls': 0, 'nodes': 0, 'connections': 0}]
+    stages = [(stage, getattr(tentacle, stage), {}) for stage in STAGES[mode]]
+    if updateDelta:
+        stages.append(('updateRig', tentacle.updateRig, {'jointCount': jointCount + updateDelta}))
+    for stage, method, stageArgs in stages:
+        before = cmds.stats()
+        start = time.perf_counter()
+        method(**stageArgs)
+        seconds = time.perf_counter() - start
+        after = cmds.stats()
+        results.append({'jointCount': jointCount, 'stage': stage, 'seconds': seconds,
+                        'calls': after['calls'] - before['calls'],
+                        'nodes': after['nodes'] - before['nodes'],
+                        'connections': after['connections'] - before['connections']})
+    return results
+
+
+def parseOption(option):
+    """Parses a KEY=VALUE option, keeping VALUE a string unless it is a Python literal."""
+    key, _, value = option.partition('=')
+    try:
+        return key, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return key, value
+
+
+def growthExponents(results):
+    """
+    Estimates the growth exponent of time and calls per stage between consecutive joint counts.
+
+    Returns:
+        list: (stage, jointCount from, jointCount to, time exponent, call exponent)
+    """
+    byStage = {}
+    for result in results:
+        byStage.setdefault(result['stage'], []).append(result)
+    exponents = []
+    for stage, rows in byStage.items():
+        rows.sort(key=lambda row: row['jointCount'])
+        for low, high in zip(rows, rows[1:]):
+            scale = math.log(float(high['jointCount']) / low['jointCount'])
+            timeExponent = math.log(max(high['seconds'], 1e-6) / max(low['seconds'], 1e-6)) / scale
+            callExponent = math.log(max(high['calls'], 1) / float(max(low['calls'], 1))) / scale
+            exponents.append((stage, low['jointCount'], high['jointCount'], timeExponent, callExponent))
+    return exponents
+
+
+def superlinear(exponents):
+    return [row for row in exponents if row[3] > TIME_EXPONENT_LIMIT or row[4] > CALL_EXPONENT_LIMIT]
+
+
+def formatReport(results, exponents):
+    lines = ['{:>6}  {:<24}{:>10}{:>8}{:>8}{:>8}'.format('joints', 'stage', 'ms', 'calls', 'nodes', 'conns')]
+    for row in results:
+        lines.append('{:>6}  {:<24}{:>10.2f}{:>8}{:>8}{:>8}'.format(row['jointCount'], row['stage'],
+                                                                    row['seconds'] * 1000.0, row['calls'],
+                                                                    row['nodes'], row['connections']))
+    flagged = superlinear(exponents)
+    lines.append('')
+    if flagged:
+        for stage, low, high, timeExponent, callExponent in flagged:
+            lines.append('SUPERLINEAR {} {}->{}: time ~n^{:.2f}, calls ~n^{:.2f}'.format(stage, low, high,
+                                                                                       timeExponent, callExponent))
+    else:
+        lines.append('All stages scale linearly with jointCount.')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=list(JOINT_COUNTS))
+    parser.add_argument('--mode', choices=sorted(STAGES), default='cmds')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='Extra Tentacle keyword argument, e.g. rollMode=solver.')
+    parser.add_argument('--update', type=int, metavar='DELTA',
+                        help='Also time updateRig to jointCount + DELTA joints.')
+    parser.add_argument('--json', help='Write the raw results to this file.')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with 1 when a stage grows superlinearly or a test_AutoRibbon.py test fails.')
+    args = parser.parse_args(argv)
+
+    options = dict(parseOption(option) for option in args.set)
+    if options.get('skinMode') == 'computed':
+        parser.error("skinMode=computed reads the model and writes its weights through maya.api, which FakeCmds "
+                     "does not stand in for. Its weights come from AutoRibbonMath.chainSkinWeights.")
+    tool, cmds = loadTool()
+    results = []
+    for jointCount in args.counts:
+        results.extend(runStages(tool, cmds, jointCount, args.mode, options, args.update))
+    exponents = growthExponents(results)
+    print(formatReport(results, exponents))
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'mode': args.mode, 'options': options, 'results': results,
+                       'exponents': [dict(zip(('stage', 'from', 'to', 'time', 'calls'), row))
+                                     for row in exponents]}, handle, indent=2)
+    if not args.check:
+        return 0
+    import pytest
+    testsFailed = pytest.main(['-q', TEST_PATH]) != 0
+    return 1 if superlinear(exponents) or testsFailed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
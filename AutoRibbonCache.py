@@ -0,0 +1,117 @@
+"""
+Joint animation cache of the Auto Ribbon Tool.
+
+A cache holds the world matrices of a rig's bind joints over a frame range,
+sampled from the rig by Tentacle.bakeCache or computed offline by
+AutoRibbonSolver. It is one uncompressed .npz file with the members:
+
+- transforms: (F, N, 4, 3) float32, every matrix without its constant last column
+- frames: (F,) frame numbers, ascending
+- joints: (N,) joint names
+
+The members are stored uncompressed, so readCache memory-maps the transforms
+instead of reading them. Opening the cache of a long shot costs next to
+nothing, and the autoRibbonCacheReader node of AutoRibbonNodes.py only pages
+in the frames it evaluates.
+
+This module has no Maya import.
+"""
+
+import struct
+import zipfile
+
+import numpy
+import numpy.lib.format
+
+# Local file header of a zip member: fixed part, then the name and extra field whose lengths end it
+ZIP_LOCAL_HEADER_SIZE = 30
+ARRAY_HEADER_READERS = {(1, 0): numpy.lib.format.read_array_header_1_0,
+                        (2, 0): numpy.lib.format.read_array_header_2_0}
+
+
+def writeCache(path, matrices, frames, joints):
+    """
+    Writes a joint cache.
+
+    Args:
+        path (str): .npz file to write.
+        matrices (ndarray): (F, N, 4, 4) world matrices, translation in the last row.
+        frames (list): The F frame numbers, ascending.
+        joints (list): The N joint names.
+    """
+    matrices = numpy.asarray(matrices)
+    frames = numpy.asarray(frames, dtype=float)
+    if matrices.ndim != 4 or matrices.shape[2:] != (4, 4):
+        raise ValueError("Matrices must have the shape (frames, joints, 4, 4).")
+    if matrices.shape[:2] != (len(frames), len(joints)):
+        raise ValueError("Expected matrices for {} frames and {} joints, got {}.".format(len(frames), len(joints),
+                                                                                        matrices.shape[:2]))
+    if numpy.any(numpy.diff(frames) <= 0.0):
+        raise ValueError("Frames must be ascending.")
+    with open(path, 'wb') as handle:
+        numpy.savez(handle, transforms=matrices[..., :3].astype(numpy.float32), frames=frames,
+                    joints=numpy.asarray(joints, dtype=str))
+
+
+def memoryMapMember(path, name):
+    """
+    Memory-maps an uncompressed array member of an .npz file.
+
+    Returns:
+        numpy.memmap: The read-only array, or None when the member is compressed.
+    """
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, 'rb') as handle:
+        handle.seek(info.header_offset)
+        nameLength, extraLength = struct.unpack('<HH', handle.read(ZIP_LOCAL_HEADER_SIZE)[26:30])
+        handle.seek(info.header_offset + ZIP_LOCAL_HEADER_SIZE + nameLength + extraLength)
+        version = numpy.lib.format.read_magic(handle)
+        if version not in ARRAY_HEADER_READERS:
+            return None
+        shape, fortranOrder, dtype = ARRAY_HEADER_READERS[version](handle)
+        offset = handle.tell()
+    return numpy.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                        order='F' if fortranOrder else 'C')
+
+
+class JointCache(object):
+    """
+    An opened joint cache.
+
+    Attributes:
+        transforms (ndarray): (F, N, 4, 3) float32, memory-mapped when possible.
+        frames (ndarray): (F,) frame numbers.
+        joints (list): Joint names.
+    """
+
+    def __init__(self, path, memoryMap=True):
+        self.path = path
+        with numpy.load(path) as archive:
+            self.frames = archive['frames']
+            self.joints = archive['joints'].tolist()
+            transforms = memoryMapMember(path, 'transforms') if memoryMap else None
+            self.transforms = archive['transforms'] if transforms is None else transforms
+
+    def frameIndex(self, frame):
+        """Index of the last sample at or before `frame`, held before the first and after the last one."""
+        index = numpy.searchsorted(self.frames, frame + 1e-6, side='right') - 1
+        return int(numpy.clip(index, 0, len(self.frames) - 1))
+
+    def matrices(self, frame):
+        """
+        Returns:
+            numpy.ndarray: (N, 4, 4) float64 matrices of the joints at `frame`.
+        """
+        transforms = self.transforms[self.frameIndex(frame)]
+        matrices = numpy.zeros((len(self.joints), 4, 4))
+        matrices[..., :3] = transforms
+        matrices[..., 3, 3] = 1.0
+        return matrices
+
+
+def readCache(path, memoryMap=True):
+    """Opens a joint cache written by writeCache, see JointCache."""
+    return JointCache(path, memoryMap)
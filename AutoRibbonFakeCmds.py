@@ -0,0 +1,624 @@
+"""
+Recording, in-memory stand-in for maya.cmds.
+
+FakeCmds implements the subset of maya.cmds the Auto Ribbon Tool uses on a
+dictionary scene of nodes, attributes and connections, and counts every call.
+install() registers it as `maya.cmds` so the tool can run without a Maya
+license, for benchmarks and headless checks.
+"""
+
+import collections
+import fnmatch
+import json
+import re
+import sys
+import types
+import uuid
+
+# Node types whose cmds.createNode also creates a parent transform
+SHAPE_TYPES = ('follicle', 'nurbsCurve', 'nurbsSurface', 'mesh', 'locator', 'deformTwist', 'deformSine')
+TRANSFORM_TYPES = ('transform', 'joint')
+# Nodes every scene has, which exports leave out and imports connect to
+DEFAULT_NODES = ('time1',)
+
+
+class FakeCmds(object):
+    """
+    In-memory maya.cmds. Every public command is counted in `calls`.
+
+    Attributes:
+        nodes (dict): Node name -> {'type', 'parent', 'attrs', 'uuid'}.
+        connections (dict): Destination plug -> source plug.
+        calls (Counter): Number of calls per command.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def __getattribute__(self, name):
+        attr = object.__getattribute__(self, name)
+        if not name.startswith('_') and name not in FakeCmds._internal and callable(attr):
+            object.__getattribute__(self, 'calls')[name] += 1
+        return attr
+
+    _internal = ('reset', 'stats', 'calls', 'nodes', 'connections')
+
+    def reset(self):
+        self.nodes = collections.OrderedDict()
+        self.connections = {}
+        self.calls = collections.Counter()
+        self._children = collections.defaultdict(list)
+        # Shape -> the transforms it is instanced under besides its 'parent'
+        self._instanceParents = collections.defaultdict(list)
+        self._plugs = collections.defaultdict(set)
+        self._selection = []
+        self._counters = collections.Counter()
+        self._uuids = {}
+        self._sceneName = None
+        self._time = 1.0
+        self._addDefaultNodes()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Total calls, nodes and connections in the fake scene.
+        """
+        return {'calls': sum(self.calls.values()), 'nodes': len(self.nodes), 'connections': len(self.connections)}
+
+    # ---- scene helpers
+
+    def _addDefaultNodes(self):
+        # Nodes every Maya scene starts with
+        self._add('time', 'time1')
+
+    def _history(self, nodes):
+        """The nodes with their descendants and every node upstream of them, in scene order."""
+        found = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node in found or node in DEFAULT_NODES:
+                continue
+            found.add(node)
+            stack.extend(self._children.get(node, []))
+            stack.extend(self.connections[plug].split('.')[0] for plug in self._plugs.get(node, ())
+                         if plug.split('.')[0] == node)
+        return [node for node in self.nodes if node in found]
+
+    def _uniqueName(self, name):
+        if name not in self.nodes:
+            return name
+        base = re.sub(r'\d+$', '', name)
+        self._counters[base] = max(self._counters[base], 1)
+        while True:
+            candidate = '{}{}'.format(base, self._counters[base])
+            self._counters[base] += 1
+            if candidate not in self.nodes:
+                return candidate
+
+    def _add(self, nodeType, name=None, parent=None):
+        name = self._uniqueName(name or nodeType + '1')
+        self.nodes[name] = {'type': nodeType, 'parent': None, 'attrs': {}, 'uuid': str(uuid.uuid4()).upper()}
+        self._uuids[self.nodes[name]['uuid']] = name
+        if parent:
+            self._reparent(name, parent)
+        return name
+
+    def _reparent(self, node, parent):
+        old = self.nodes[node]['parent']
+        if old:
+            self._children[old].remove(node)
+        self.nodes[node]['parent'] = parent
+        if parent:
+            self._children[parent].append(node)
+
+    def _instance(self, shape, parent):
+        shape = self._node(shape)
+        parent = self._node(parent)
+        self._instanceParents[shape].append(parent)
+        self._children[parent].append(shape)
+
+    def _uninstance(self, shape, parent):
+        # The shape stays under its other parents, one of which takes over as its 'parent'
+        self._children[parent].remove(shape)
+        parents = self._instanceParents[shape]
+        if parent in parents:
+            parents.remove(parent)
+        else:
+            self.nodes[shape]['parent'] = parents.pop(0)
+        if not parents:
+            del self._instanceParents[shape]
+
+    def _node(self, name):
+        name = name.split('|')[-1]
+        if name not in self.nodes:
+            raise RuntimeError("No object matches name: {}".format(name))
+        return name
+
+    def _names(self, args):
+        names = []
+        for arg in args:
+            names.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+        return names
+
+    def _connect(self, source, destination):
+        if destination in self.connections:
+            raise RuntimeError("'{}' is already connected.".format(destination))
+        self._node(source.split('.')[0])
+        self._node(destination.split('.')[0])
+        self.connections[destination] = source
+        self._plugs[source.split('.')[0]].add(destination)
+        self._plugs[destination.split('.')[0]].add(destination)
+
+    def _select(self, node):
+        self._selection = [node]
+
+    # ---- commands
+
+    def error(self, message):
+        raise RuntimeError(message)
+
+    def warning(self, message):
+        pass
+
+    def undoInfo(self, *args, **kwargs):
+        # The undo queue is always on, but nothing is recorded
+        if kwargs.get('query') and kwargs.get('state'):
+            return True
+        return None
+
+    def refresh(self, *args, **kwargs):
+        return None
+
+    def objExists(self, name):
+        return name.split('.')[0].split('|')[-1] in self.nodes
+
+    def nodeType(self, name, **kwargs):
+        return self.nodes[self._node(name)]['type']
+
+    def ls(self, *patterns, **kwargs):
+        nodeType = kwargs.get('type')
+        if kwargs.get('selection') or kwargs.get('sl'):
+            return list(self._selection)
+        if not patterns:
+            names = list(self.nodes)
+        else:
+            # Explicit names and UUIDs resolve in argument order, wildcards in scene order
+            names = []
+            for pattern in self._names(patterns):
+                if pattern in self._uuids:
+                    names.append(self._uuids[pattern])
+                elif any(char in pattern for char in '*?['):
+                    names.extend(n for n in self.nodes if fnmatch.fnmatchcase(n, pattern))
+                elif pattern.split('|')[-1] in self.nodes:
+                    names.append(pattern.split('|')[-1])
+        if nodeType:
+            types_ = nodeType if isinstance(nodeType, (list, tuple)) else [nodeType]
+            if 'transform' in types_:
+                types_ = list(types_) + ['joint']
+            names = [n for n in names if self.nodes[n]['type'] in types_]
+        if kwargs.get('uuid'):
+            return [self.nodes[n]['uuid'] for n in names]
+        return list(names)
+
+    def select(self, *args, **kwargs):
+        if kwargs.get('clear') or kwargs.get('cl'):
+            self._selection = []
+            return
+        names = [self._node(n) for n in self._names(args)]
+        if kwargs.get('add'):
+            self._selection.extend(names)
+        else:
+            self._selection = names
+
+    def createNode(self, nodeType, name=None, parent=None, skipSelect=False, **kwargs):
+        if nodeType in SHAPE_TYPES and not parent:
+            transformName = name.replace('Shape', '') if name and 'Shape' in name else nodeType
+            parent = self._add('transform', transformName)
+        node = self._add(nodeType, name, parent and self._node(parent))
+        if not skipSelect:
+            self._select(node)
+        return node
+
+    def rename(self, node, newName):
+        node = self._node(node)
+        if newName == node:
+            return node
+        newName = self._uniqueName(newName)
+        self.nodes[newName] = self.nodes.pop(node)
+        self._uuids[self.nodes[newName]['uuid']] = newName
+        parent = self.nodes[newName]['parent']
+        if parent:
+            self._children[parent][self._children[parent].index(node)] = newName
+        for child in self._children.pop(node, []):
+            if self.nodes[child]['parent'] == node:
+                self.nodes[child]['parent'] = newName
+            else:
+                parents = self._instanceParents[child]
+                parents[parents.index(node)] = newName
+            self._children[newName].append(child)
+
+        def renamed(plug):
+            return newName + plug[len(node):] if plug.split('.')[0] == node else plug
+
+        for destination in list(self._plugs.pop(node, [])):
+            source = self.connections.pop(destination)
+            self.connections[renamed(destination)] = renamed(source)
+            for plug in (source, destination):
+                other = plug.split('.')[0]
+                if other != node:
+                    self._plugs[other].discard(destination)
+                    self._plugs[other].add(renamed(destination))
+            self._plugs[newName].add(renamed(destination))
+        return newName
+
+    def group(self, *args, **kwargs):
+        name = kwargs.get('name') or kwargs.get('n') or 'group1'
+        members = [self._node(n) for n in self._names(args)] if not kwargs.get('empty') else []
+        parent = self.nodes[members[0]]['parent'] if members else None
+        group = self._add('transform', name, parent)
+        for member in members:
+            self._reparent(member, group)
+        self._select(group)
+        return group
+
+    def parent(self, *args, **kwargs):
+        names = [self._node(n) for n in self._names(args)]
+        if kwargs.get('world') or kwargs.get('w'):
+            children, parent = names, None
+        else:
+            children, parent = names[:-1], names[-1]
+        for child in children:
+            if kwargs.get('add') and kwargs.get('shape'):
+                self._instance(child, parent)
+            else:
+                self._reparent(child, parent)
+        return children
+
+    def listRelatives(self, node, shapes=False, parent=False, children=False, type=None, **kwargs):
+        node = self._node(node)
+        if parent:
+            nodeParent = self.nodes[node]['parent']
+            return [nodeParent] if nodeParent else None
+        result = list(self._children.get(node, []))
+        if shapes:
+            result = [n for n in result if self.nodes[n]['type'] not in TRANSFORM_TYPES]
+        if type:
+            types = [type] if isinstance(type, str) else type
+            result = [n for n in result if self.nodes[n]['type'] in types]
+        return result or None
+
+    def delete(self, *args, **kwargs):
+        for name in self._names(args):
+            if name in self.nodes:
+                self._delete(name)
+
+    def _delete(self, node):
+        for child in list(self._children.get(node, [])):
+            if child in self._instanceParents:
+                self._uninstance(child, node)
+            else:
+                self._delete(child)
+        self._children.pop(node, None)
+        for parent in self._instanceParents.pop(node, []):
+            self._children[parent].remove(node)
+        for destination in self._plugs.pop(node, set()):
+            source = self.connections.pop(destination, None)
+            for plug in (source, destination):
+                if plug:
+                    self._plugs.get(plug.split('.')[0], set()).discard(destination)
+        self._reparent(node, None)
+        del self._uuids[self.nodes.pop(node)['uuid']]
+
+    def duplicate(self, node, **kwargs):
+        node = self._node(node)
+        copy = self._add(self.nodes[node]['type'], node, self.nodes[node]['parent'])
+        self.nodes[copy]['attrs'] = dict(self.nodes[node]['attrs'])
+        for child in self._children.get(node, []):
+            self._add(self.nodes[child]['type'], child, copy)
+        return [copy]
+
+    def setAttr(self, plug, *values, **kwargs):
+        node, _, attr = plug.partition('.')
+        node = self._node(node)
+        if values:
+            self.nodes[node]['attrs'][attr] = values[0] if len(values) == 1 else values
+
+    def getAttr(self, plug, **kwargs):
+        node, _, attr = plug.partition('.')
+        if attr.startswith(('worldMatrix', 'worldInverseMatrix')):
+            # Nothing is evaluated, every node sits at the origin
+            return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+        if attr == 'knots[*]':
+            # curveInfo: the knots of the connected curve shape
+            return list(self.nodes[self.connections[node + '.inputCurve'].split('.')[0]]['attrs'].get('knots', []))
+        if attr == 'cv[*]':
+            return [tuple(point) for point in self.nodes[self._node(node)]['attrs'].get('cv', [])]
+        return self.nodes[self._node(node)]['attrs'].get(attr, 0)
+
+    def addAttr(self, node, longName=None, **kwargs):
+        node = self._node(node)
+        self.nodes[node]['attrs'][longName] = kwargs.get('defaultValue', 0)
+
+    def attributeQuery(self, attr, node=None, exists=False, **kwargs):
+        return attr in self.nodes[self._node(node)]['attrs']
+
+    def connectAttr(self, source, destination, force=False, **kwargs):
+        if force and destination in self.connections:
+            self.disconnectAttr(self.connections[destination], destination)
+        self._connect(source, destination)
+
+    def disconnectAttr(self, source, destination):
+        self.connections.pop(destination, None)
+        self._plugs[destination.split('.')[0]].discard(destination)
+        self._plugs[source.split('.')[0]].discard(destination)
+
+    def listConnections(self, plug, source=True, destination=True, plugs=False, connections=False, **kwargs):
+        if isinstance(plug, (list, tuple)):
+            result = []
+            for item in plug:
+                result.extend(self.listConnections(item, source, destination, plugs, connections) or [])
+            return result or None
+        node = plug.split('.')[0]
+        result = []
+        for dst in self._plugs.get(node, ()):
+            src = self.connections[dst]
+            if destination and (src == plug or src.split('.')[0] == plug):
+                result.extend([src, dst if plugs else dst.split('.')[0]] if connections else
+                              [dst if plugs else dst.split('.')[0]])
+            if source and (dst == plug or dst.split('.')[0] == plug):
+                result.extend([dst, src if plugs else src.split('.')[0]] if connections else
+                              [src if plugs else src.split('.')[0]])
+        return result or None
+
+    def curve(self, *curves, name=None, p=None, point=None, d=1, degree=None, knot=None, replace=False, **kwargs):
+        if replace:
+            self._setCurve(self._node(curves[0]), p or point or [], degree or d, knot)
+            return curves[0]
+        transform = self._curve(name or 'curve1', p or point or [])
+        self._setCurve(transform, p or point or [], degree or d, knot)
+        return transform
+
+    def _curve(self, name, points):
+        transform = self._add('transform', name)
+        self._add('nurbsCurve', transform + 'Shape', transform)
+        self.nodes[transform]['attrs']['cv'] = list(points)
+        self._select(transform)
+        return transform
+
+    def _setCurve(self, transform, points, degree, knots=None):
+        # Uniform knots in Maya's form unless given, like cmds.curve
+        spans = len(points) - degree
+        knots = knots or [0] * (degree - 1) + list(range(spans + 1)) + [spans] * (degree - 1)
+        self.nodes[transform]['attrs']['cv'] = list(points)
+        shapeAttrs = self.nodes[self._children[transform][0]]['attrs']
+        shapeAttrs.update(degree=degree, spans=spans, knots=list(knots))
+
+    def circle(self, name=None, normal=(0, 0, 1), radius=1.0, **kwargs):
+        transform = self._curve(name or 'nurbsCircle1', [])
+        make = self._add('makeNurbCircle', 'makeNurbCircle1')
+        self._connect(make + '.outputCurve', transform + 'Shape.create')
+        return [transform, make]
+
+    def loft(self, *curves, **kwargs):
+        name = kwargs.get('name') or 'loftedSurface1'
+        transform = self._add('transform', name)
+        self._add('nurbsSurface', transform + 'Shape', transform)
+        return [transform]
+
+    def joint(self, *args, **kwargs):
+        parent = self._selection[-1] if self._selection and self.nodes[self._selection[-1]]['type'] == 'joint' \
+            else None
+        node = self._add('joint', kwargs.get('name') or 'joint1', parent)
+        self.nodes[node]['attrs']['translate'] = tuple(kwargs.get('position', (0, 0, 0)))
+        self._select(node)
+        return node
+
+    def makeIdentity(self, *args, **kwargs):
+        return None
+
+    def xform(self, *args, **kwargs):
+        if kwargs.get('matrix') or kwargs.get('m'):
+            return [0.0] * 16
+        return [0.0] * 3 if kwargs.get('query') else None
+
+    def scale(self, *args, **kwargs):
+        return None
+
+    def matchTransform(self, *args, **kwargs):
+        return None
+
+    def _constraint(self, kind, args, kwargs):
+        names = [self._node(n) for n in self._names(args)]
+        drivers, driven = names[:-1], names[-1]
+        node = self._add(kind, kwargs.get('name') or '{}_{}1'.format(driven, kind), driven)
+        for index, driver in enumerate(drivers):
+            self._connect(driver + '.worldMatrix[0]', '{}.target[{}].targetParentMatrix'.format(node, index))
+        output = {'parentConstraint': ('translate', 'rotate'), 'scaleConstraint': ('scale',)}[kind]
+        for attr in output:
+            if driven + '.' + attr not in self.connections:
+                self._connect('{}.constraint{}'.format(node, attr.capitalize()), '{}.{}'.format(driven, attr))
+        return [node]
+
+    def parentConstraint(self, *args, **kwargs):
+        return self._constraint('parentConstraint', args, kwargs)
+
+    def scaleConstraint(self, *args, **kwargs):
+        return self._constraint('scaleConstraint', args, kwargs)
+
+    def skinCluster(self, *args, **kwargs):
+        if kwargs.get('edit') and kwargs.get('unbind'):
+            self.delete(*args)
+            return None
+        names = [self._node(n) for n in self._names(args)] or list(self._selection)
+        influences = [n for n in names if self.nodes[n]['type'] == 'joint']
+        geometry = [n for n in names if self.nodes[n]['type'] != 'joint']
+        node = self._add('skinCluster', kwargs.get('name') or 'skinCluster1')
+        for index, influence in enumerate(influences):
+            self._connect(influence + '.worldMatrix[0]', '{}.matrix[{}]'.format(node, index))
+        for shape in geometry:
+            self._connect(node + '.outputGeometry[0]', shape + '.inMesh')
+        return [node]
+
+    def sets(self, *args, **kwargs):
+        node = self._add('objectSet', kwargs.get('name') or 'set1')
+        self.nodes[node]['attrs']['members'] = list(self._names(args) or self._selection)
+        return node
+
+    def expression(self, string='', name=None, **kwargs):
+        node = self._add('expression', name or 'expression1')
+        output = string.split('=')[0].strip()
+        if '.' in output and output.split('.')[0] in self.nodes:
+            self._connect(node + '.output[0]', output)
+        return node
+
+    def nonLinear(self, *args, **kwargs):
+        deformerType = kwargs.get('type', 'bend')
+        name = kwargs.get('name') or deformerType + '1'
+        deformer = self._add('nonLinear', name)
+        handle = self._add('transform', name + 'Handle')
+        handleShape = self._add('deform' + deformerType.capitalize(), name + 'HandleShape', handle)
+        self._connect(handleShape + '.deformerData', deformer + '.deformerData')
+        for geometry in self._names(args):
+            self._connect(self._node(geometry) + '.worldSpace[0]', deformer + '.input[0].inputGeometry')
+        return [deformer, handle]
+
+    def deformer(self, *args, **kwargs):
+        deformerType = kwargs.get('type', 'deformer')
+        deformer = self._add(deformerType, kwargs.get('name') or deformerType + '1')
+        for geometry in self._names(args):
+            self._connect(self._node(geometry) + '.worldSpace[0]', deformer + '.input[0].inputGeometry')
+        return [deformer]
+
+    def pluginInfo(self, *args, **kwargs):
+        return True
+
+    def loadPlugin(self, *args, **kwargs):
+        return None
+
+    def about(self, version=False, **kwargs):
+        return 'fake'
+
+    def currentTime(self, *args, **kwargs):
+        if kwargs.get('query'):
+            return self._time
+        self._time = float(args[0])
+        return self._time
+
+    def playbackOptions(self, query=False, minTime=False, maxTime=False, **kwargs):
+        return 120.0 if maxTime else 1.0
+
+    def dgeval(self, *args, **kwargs):
+        # Nothing is computed in the fake scene, the plugs only have to exist
+        for plug in self._names(args):
+            self._node(plug.split('.')[0])
+
+    def file(self, *args, **kwargs):
+        # Opening or creating a scene starts an empty one, saving writes the scene as JSON to the renamed path.
+        # Exporting the selection writes it with its history as JSON, which importing adds to the scene.
+        if kwargs.get('exportSelected'):
+            nodes = self._history(self._selection)
+            exported = set(nodes)
+            with open(args[0], 'w') as handle:
+                json.dump({'nodes': [[node, self.nodes[node]['type'],
+                                      self.nodes[node]['parent'] if self.nodes[node]['parent'] in exported else None,
+                                      self.nodes[node]['attrs']] for node in nodes],
+                           'connections': {dst: src for dst, src in self.connections.items()
+                                           if dst.split('.')[0] in exported},
+                           'instances': [[shape, parent] for shape, parents in self._instanceParents.items()
+                                         for parent in parents if shape in exported and parent in exported]},
+                          handle)
+            return args[0]
+        if kwargs.get('i') or kwargs.get('import'):
+            with open(args[0]) as handle:
+                scene = json.load(handle)
+            for node, nodeType, parent, attrs in scene['nodes']:
+                if node in self.nodes:
+                    raise RuntimeError("Imported node '{}' already exists.".format(node))
+                self._add(nodeType, node, parent)
+                self.nodes[node]['attrs'] = attrs
+            for dst, src in scene['connections'].items():
+                self._connect(src, dst)
+            for shape, parent in scene.get('instances', []):
+                self._instance(shape, parent)
+            return [node[0] for node in scene['nodes']]
+        if kwargs.get('new') or kwargs.get('open'):
+            self.nodes.clear()
+            self.connections.clear()
+            self._children.clear()
+            self._instanceParents.clear()
+            self._plugs.clear()
+            self._uuids.clear()
+            self._selection = []
+            self._sceneName = args[0] if kwargs.get('open') else None
+            self._addDefaultNodes()
+        if kwargs.get('rename'):
+            self._sceneName = kwargs['rename']
+        if kwargs.get('save'):
+            with open(self._sceneName, 'w') as handle:
+                json.dump({'nodes': self.nodes, 'connections': self.connections}, handle, indent=1)
+        return self._sceneName
+
+
+class FakeModifierBackend(object):
+    """Stand-in for AutoRibbonPlan.MayaModifierBackend that commits a whole plan into FakeCmds as one call."""
+
+    def __init__(self, cmds):
+        self.cmds = cmds
+
+    def commit(self, plan):
+        from AutoRibbonPlan import constraintConnections, constraintNode, nodeCreations
+        cmds = self.cmds
+        cmds.calls['modifierCommit'] += 1
+        for node in plan.nodes:
+            for nodeType, name, parent in nodeCreations(node):
+                self._createNode(nodeType, name, parent)
+        for shape, transform in plan.instances:
+            cmds._instance(shape, transform)
+        for constraint in plan.constraints:
+            nodeType, parent = constraintNode(constraint)
+            cmds._add(nodeType, constraint['name'], parent)
+            if nodeType == 'multMatrix':
+                offset = cmds.getAttr(constraint['driven'] + '.worldMatrix[0]')
+                cmds.nodes[constraint['name']]['attrs']['matrixIn[0]'] = offset
+        for attribute in plan.attributes:
+            attrs = cmds.nodes[cmds._node(attribute['node'])]['attrs']
+            attrs[attribute['longName']] = attribute['flags'].get('defaultValue', 0)
+        for curve in plan.curves:
+            cmds.nodes[cmds._node(curve['shape'])]['attrs']['cached'] = curve
+        for plug, value in plan.values:
+            node, _, attr = plug.partition('.')
+            cmds.nodes[cmds._node(node)]['attrs'][attr] = value
+        connections = list(plan.connections)
+        for constraint in plan.constraints:
+            connections.extend(constraintConnections(constraint))
+        for source, destination in connections:
+            cmds._connect(source, destination)
+        for name, string in plan.expressions:
+            cmds._add('expression', name)
+
+    def _createNode(self, nodeType, name, parent):
+        """Creates and renames a node the way MDagModifier.createNode and renameNode do."""
+        cmds = self.cmds
+        if nodeType in SHAPE_TYPES and not parent:
+            # Without a parent a shape gets a transform of its own, which is the node returned and renamed
+            transform = cmds._add('transform', name)
+            cmds._add(nodeType, None, transform)
+            return transform
+        # Given a parent, a shape goes straight under it
+        return cmds._add(nodeType, name, parent)
+
+
+def install():
+    """
+    Registers a FakeCmds instance as `maya.cmds`.
+
+    Returns:
+        FakeCmds: The installed stand-in.
+    """
+    cmds = FakeCmds()
+    maya = sys.modules.get('maya') or types.ModuleType('maya')
+    maya.cmds = cmds
+    sys.modules['maya'] = maya
+    sys.modules['maya.cmds'] = cmds
+    return cmds
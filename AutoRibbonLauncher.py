@@ -0,0 +1,38 @@
+"""
+Entry point of the Auto Ribbon Tool window, e.g. for a shelf button:
+
+    import AutoRibbonLauncher
+    AutoRibbonLauncher.show()
+
+The tool script is imported once per session and its window reused, so
+reopening the tool costs no module loading and no UI construction.
+"""
+
+import importlib.util
+import os
+import sys
+
+TOOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AutoRibbonTool_v3.0.py')
+MODULE_NAME = 'AutoRibbonTool'
+
+
+def loadTool():
+    """
+    Returns:
+        module: AutoRibbonTool_v3.0.py, imported on the first call.
+    """
+    if MODULE_NAME not in sys.modules:
+        spec = importlib.util.spec_from_file_location(MODULE_NAME, TOOL_PATH)
+        tool = importlib.util.module_from_spec(spec)
+        sys.modules[MODULE_NAME] = tool
+        try:
+            spec.loader.exec_module(tool)
+        except Exception:
+            del sys.modules[MODULE_NAME]
+            raise
+    return sys.modules[MODULE_NAME]
+
+
+def show():
+    """Shows the tool window, see AutoRibbonTool_v3.0.showWindow."""
+    return loadTool().showWindow()
@@ -0,0 +1,124 @@
+"""
+Headless layout engine of the Auto Ribbon Tool.
+
+RigLayout computes every position, follicle UV, control size and roll/ripple
+weight window of a tentacle as NumPy arrays up front from the Tentacle
+constructor arguments. The Maya stages only consume these arrays, so the math
+can be unit-tested and benchmarked without Maya. computeLayouts precomputes the
+layouts of a batch of tentacles in a process pool.
+
+This module has no Maya import.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy
+
+import AutoRibbonMath
+
+AXIS_VECTORS = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}
+
+# Joint orient that aims a joint's Y axis down the primary axis (rotate + makeIdentity in setUpTentacleFK)
+JOINT_ORIENTS = {'x': (0, 90, 0), 'y': (0, 0, 0), 'z': (90, 0, 0)}
+
+
+class RigLayout(object):
+    """
+    Precomputed layout of one tentacle.
+
+    Args:
+        jointCount (int): Number of joints.
+        tentacleLength (float): Tentacle length, or the length per segment when isAutoMeasureLength is False.
+        isAutoMeasureLength (bool): Divide tentacleLength over the joints.
+        primaryAxis (str): Axis the tentacle is built along.
+
+    Attributes:
+        curvePositions (ndarray): (N, 3) CVs of the ribbon curve from createRibbonCurve.
+        jointPositions (ndarray): (N, 3) initial joint positions.
+        follicleU, follicleV (ndarray): (N,) follicle UVs on the ribbon surface.
+        ctrlIsSquare (ndarray): (N-1,) True for the square FK ctrls, False for the circles.
+        ctrlSizes (ndarray): (N-1,) square half size or circle radius of each FK ctrl.
+        rollWeightMin, rollWeightMax (ndarray): (N-1,) roll section of each FK ctrl.
+        rippleStart, ripplePeak, rippleEnd (ndarray): (N,) ripple ramp positions of each joint before falloff.
+        curveLength (float): Arc length of the ribbon curve once sampleCurve ran, else None.
+    """
+
+    def __init__(self, jointCount, tentacleLength, isAutoMeasureLength=True, primaryAxis='y'):
+        if jointCount < 2:
+            raise ValueError("A tentacle needs at least 2 joints.")
+        self.jointCount = jointCount
+        self.tentacleLength = float(tentacleLength)
+        self.isAutoMeasureLength = isAutoMeasureLength
+        self.primaryAxis = primaryAxis
+        self.axisVector = numpy.array(AXIS_VECTORS[primaryAxis], dtype=float)
+        self.jointOrient = JOINT_ORIENTS[primaryAxis]
+
+        # Calculate length per segment
+        if isAutoMeasureLength:
+            self.lengthPerSegment = self.tentacleLength / jointCount
+        else:
+            self.lengthPerSegment = self.tentacleLength
+
+        index = numpy.arange(jointCount, dtype=float)
+        self.curvePositions = numpy.outer(index * self.tentacleLength / (jointCount - 1), self.axisVector)
+        self.jointPositions = numpy.outer(index * self.lengthPerSegment, self.axisVector)
+        self.follicleU = numpy.full(jointCount, 0.5)
+        self.follicleV = index / (jointCount - 1)
+
+        # FK ctrls: every 4th one is a square placeholder ctrl, the others circles
+        self.ctrlCount = jointCount - 1
+        self.ctrlIsSquare = numpy.arange(self.ctrlCount) % 4 == 0
+        self.ctrlSizes = numpy.where(self.ctrlIsSquare, self.lengthPerSegment / 0.5, self.lengthPerSegment / 1.0)
+        self.drvCtrlScale = self.lengthPerSegment / 0.5
+        self.endCtrlSize = self.tentacleLength / 3.0
+
+        self.rollWeightMin, self.rollWeightMax = AutoRibbonMath.rollWeightWindows(self.ctrlCount)
+        self.rippleUnitVal = 1.0 / (jointCount + 1)
+        self.rippleStart, self.ripplePeak, self.rippleEnd = AutoRibbonMath.rippleWindows(jointCount)
+        self.curveLength = None
+
+    def sampleCurve(self, cvs, knots, degree):
+        """
+        Moves the joints and their follicle V values to equal arc lengths along the edited ribbon curve,
+        instead of equal steps along the primary axis and equal steps in curve parameter. Only positions
+        are sampled, the joint frames come from the ribbon surface at the new V values.
+
+        Args:
+            cvs (list): The curve's CVs in object space.
+            knots (list): Its knots in Maya's form.
+            degree (int): Its degree.
+        """
+        positions, parameters, length = AutoRibbonMath.arcLengthSamples(cvs, knots, degree, self.jointCount)
+        self.jointPositions = positions
+        self.follicleV = parameters
+        self.curveLength = length
+
+
+def layoutFromSpec(spec):
+    """RigLayout of one Tentacle keyword argument spec, with the Tentacle defaults."""
+    return RigLayout(spec['jointCount'], spec['tentacleLength'], spec.get('isAutoMeasureLength', True),
+                     spec.get('primaryAxis', 'y'))
+
+
+def computeLayouts(specs, processes=None):
+    """
+    Computes the RigLayouts of many tentacles, in a process pool when processes is not 1.
+
+    Falls back to computing them in this process when no pool can be started, e.g. inside an
+    interactive Maya session whose executable cannot spawn workers.
+
+    Args:
+        specs (list): Tentacle keyword argument dicts.
+        processes (int): Worker count, None for one per CPU, 1 to stay in this process.
+
+    Returns:
+        list: One RigLayout per spec, in spec order.
+    """
+    if processes != 1 and len(specs) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                return list(executor.map(layoutFromSpec, specs))
+        except (OSError, BrokenProcessPool):
+            pass
+    return [layoutFromSpec(spec) for spec in specs]
@@ -0,0 +1,444 @@
+"""
+Vectorized math of the Auto Ribbon Tool's procedural networks.
+
+Each function evaluates what one node network of Tentacle computes per
+control or per joint, for every control/joint in one NumPy pass. Driver values
+broadcast, so passing arrays of F frames returns (F, count) results.
+chainParameters and cappedWeights compute the computed skin weights of the
+model bind, twistSinePoints the twist and sine deformers of the ribbon,
+rowDriveWeights and drivePoints the direct CV drive of the ribbon,
+fitCurve and surfaceSpanCount the adaptive resolution of the ribbon surface,
+arcLengthSamples the joint placement along an edited ribbon curve.
+
+This module has no Maya import; the AutoRibbonNodes.py solver nodes use it.
+"""
+
+import numpy
+
+# Handle X axis of the sine deformer, as tentacleRibbonDeformer rotates the handle per primary axis
+SINE_DIRECTIONS = {'x': (0, 1, 0), 'y': (1, 0, 0), 'z': (1, 0, 0)}
+
+
+def rampWeights(count):
+    """The 0..1 ramp the MASH_Distribute/MASH_Breakout pair of the roll network provides."""
+    return numpy.linspace(0.0, 1.0, count) if count > 1 else numpy.zeros(count)
+
+
+def rollWeightWindows(count):
+    """
+    Returns:
+        tuple: (weightMin, weightMax) arrays, the roll section of each FK control before falloff.
+    """
+    index = numpy.arange(count, dtype=float)
+    return 1.0 - (index + 1.0) / count, 1.0 - index / count
+
+
+def rollAngles(roll, angle, falloff, count):
+    """
+    Roll angle in degrees of each FK control, as the tentacleRoll remap/clamp/multiply network computes it.
+
+    Args:
+        roll, angle, falloff: Driver values, scalars or arrays of frames.
+        count (int): Number of FK controls.
+
+    Returns:
+        numpy.ndarray: Angles of shape (..., count).
+    """
+    roll, angle, falloff = (numpy.asarray(value, dtype=float)[..., None] for value in (roll, angle, falloff))
+    weightMin, weightMax = rollWeightWindows(count)
+    inputMin = numpy.clip(weightMin - falloff, 0.0, 1.0)
+    weight = numpy.clip((roll - inputMin) / numpy.maximum(weightMax - inputMin, 1e-6), 0.0, 1.0)
+    return weight * rampWeights(count) * angle
+
+
+def smoothStep(t):
+    """remapValue's 'Smooth' interpolation between two ramp points."""
+    t = numpy.clip(t, 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def rippleOut(ripple, offset, frequency):
+    """(Ripple + RippleOffset) % RippleFrequency, as the expr_m_rippleOut_001 expression computes it."""
+    ripple, offset, frequency = (numpy.asarray(value, dtype=float) for value in (ripple, offset, frequency))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return numpy.where(frequency != 0.0, numpy.fmod(ripple + offset, frequency), 0.0)
+
+
+def rippleWindows(count, falloff=0.0):
+    """
+    Returns:
+        tuple: (start, peak, end) ramp positions of each joint's remap_m_tentacleRipple node.
+    """
+    falloff = numpy.asarray(falloff, dtype=float)[..., None]
+    unitVal = 1.0 / (count + 1)
+    index = numpy.arange(count, dtype=float)
+    start = numpy.clip(index * unitVal - falloff, 0.0, 1.0)
+    end = numpy.clip((index + 1.0) * unitVal + falloff, 0.0, 1.0)
+    return start, (index + 0.5) * unitVal, end
+
+
+def rippleScales(ripple, frequency, amplitude, offset, falloff, count):
+    """
+    RippleOut and the ripple scale of each joint, as the tentacleRipple expression/remap/blend network computes them.
+
+    Returns:
+        tuple: (rippleOut of shape (...), scales of shape (..., count))
+    """
+    out = rippleOut(ripple, offset, frequency)
+    frequency = numpy.asarray(frequency, dtype=float)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        position = numpy.clip(numpy.where(frequency != 0.0, out / frequency, 0.0), 0.0, 1.0)[..., None]
+    start, peak, end = rippleWindows(count, falloff)
+    rise = smoothStep((position - start) / numpy.maximum(peak - start, 1e-9))
+    fall = 1.0 - smoothStep((position - peak) / numpy.maximum(end - peak, 1e-9))
+    weight = numpy.where(position < peak, numpy.where(position > start, rise, 0.0),
+                         numpy.where(position < end, fall, 0.0))
+    amplitude = numpy.asarray(amplitude, dtype=float)[..., None]
+    return out, 1.0 + (amplitude - 1.0) * weight
+
+
+def chainParameters(points, chainPositions, chunkSize=4096):
+    """
+    Projects points onto a joint chain polyline.
+
+    Args:
+        points (ndarray): (V, 3) world positions, e.g. the model's vertices.
+        chainPositions (ndarray): (J, 3) world positions of the joints, in chain order.
+        chunkSize (int): Points projected per pass, bounding the (chunk, J, 3) temporaries.
+
+    Returns:
+        numpy.ndarray: (V,) parameter of each point along the chain in joint index units, 0..J-1.
+    """
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    chainPositions = numpy.asarray(chainPositions, dtype=float).reshape(-1, 3)
+    if len(chainPositions) < 2:
+        return numpy.zeros(len(points))
+    starts = chainPositions[:-1]
+    segments = chainPositions[1:] - starts
+    lengthsSq = numpy.maximum((segments * segments).sum(-1), 1e-12)
+
+    parameters = numpy.empty(len(points))
+    for begin in range(0, len(points), chunkSize):
+        relative = points[begin:begin + chunkSize, None, :] - starts
+        t = numpy.clip((relative * segments).sum(-1) / lengthsSq, 0.0, 1.0)
+        distancesSq = ((relative - t[..., None] * segments) ** 2).sum(-1)
+        nearest = distancesSq.argmin(axis=1)
+        parameters[begin:begin + chunkSize] = nearest + t[numpy.arange(len(nearest)), nearest]
+    return parameters
+
+
+def cappedWeights(parameters, influenceCount, maxInfluences=2, falloff=1.0):
+    """
+    Skin weights from chain parameters: a linear falloff around each influence, capped to the strongest
+    maxInfluences per point and normalized.
+
+    Args:
+        parameters (ndarray): (V,) chain parameters from chainParameters.
+        influenceCount (int): Number of influences, the i-th sitting at parameter i.
+        maxInfluences (int): Influences kept per point.
+        falloff (float): Distance in joint spacings at which an influence's weight reaches 0.
+
+    Returns:
+        numpy.ndarray: (V, influenceCount) weights, rows summing to 1.
+    """
+    parameters = numpy.asarray(parameters, dtype=float)
+    distances = numpy.abs(parameters[:, None] - numpy.arange(influenceCount))
+    weights = numpy.clip(1.0 - distances / max(falloff, 1e-6), 0.0, 1.0)
+
+    if maxInfluences < influenceCount:
+        weakest = numpy.argpartition(weights, influenceCount - maxInfluences - 1, axis=1)
+        numpy.put_along_axis(weights, weakest[:, :influenceCount - maxInfluences], 0.0, axis=1)
+
+    # Points out of every influence's reach go fully to the nearest one
+    totals = weights.sum(axis=1)
+    orphans = totals <= 0.0
+    weights[orphans, distances[orphans].argmin(axis=1)] = 1.0
+    totals[orphans] = 1.0
+    return weights / totals[:, None]
+
+
+def chainSkinWeights(points, chainPositions, columns, maxInfluences=2, falloff=1.0):
+    """
+    Weight matrix of a model bound to a joint chain, for a skinCluster whose influences are the chain joints
+    but the last, in any order.
+
+    Args:
+        points (ndarray): (V, 3) world positions of the model's points.
+        chainPositions (ndarray): (J, 3) world positions of the chain joints, in chain order, including the last.
+        columns (list): Chain index of every skinCluster influence, in influence order.
+        maxInfluences (int): Influences kept per point.
+        falloff (float): Distance in joint spacings at which an influence's weight reaches 0.
+
+    Returns:
+        numpy.ndarray: (V, len(columns)) weights in influence order, rows summing to 1.
+    """
+    parameters = chainParameters(points, chainPositions)
+    weights = cappedWeights(parameters, len(chainPositions) - 1, maxInfluences, falloff)
+    return weights[:, list(columns)]
+
+
+def rotateAbout(points, axis, angles):
+    """Rotates (..., 3) points right-handed about a unit axis through the origin by angles in radians."""
+    points = numpy.asarray(points, dtype=float)
+    axis = numpy.asarray(axis, dtype=float)
+    cos = numpy.cos(angles)[..., None]
+    sin = numpy.sin(angles)[..., None]
+    along = (points @ axis)[..., None] * axis
+    return along + (points - along) * cos + numpy.cross(axis, points) * sin
+
+
+def twistSinePoints(points, axis, direction, length, startAngle, endAngle, amplitude, wavelength, offset,
+                    sineRotation, dropoff=1.0, envelope=1.0):
+    """
+    Twist followed by sine, as the two nonLinear deformers of tentacleRibbonDeformer apply them with their
+    handles fitted to the rest ribbon, for all points in one pass.
+
+    Args:
+        points (ndarray): (P, 3) object space points of the ribbon, its root at the origin along `axis`.
+        axis (ndarray): Unit primary axis.
+        direction (ndarray): Unit sine direction at a sine rotation of 0, see SINE_DIRECTIONS.
+        length (float): Rest length the handles span.
+        startAngle, endAngle (float): Twist in degrees at the root and the tip.
+        amplitude, wavelength, offset (float): Sine attributes of the driver control.
+        sineRotation (float): Turn of the sine direction about the axis in degrees.
+        dropoff (float): -1..1, as on Maya's sine deformer.
+        envelope (float or ndarray): Blend from the input (0) to the deformed points (1), or (P,) blends,
+            e.g. the envelope times the painted weights.
+
+    Returns:
+        numpy.ndarray: (P, 3) deformed points.
+    """
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    axis = numpy.asarray(axis, dtype=float)
+    halfLength = max(length / 2.0, 1e-9)
+    # Position along the handles, -1 at the root and 1 at the tip
+    t = (points @ axis - halfLength) / halfLength
+
+    # Twist holds its end angles past the handle's bounds
+    blend = numpy.clip((t + 1.0) / 2.0, 0.0, 1.0)
+    deformed = rotateAbout(points, axis, numpy.radians(startAngle + (endAngle - startAngle) * blend))
+
+    # Sine only inside the bounds, positive dropoff fading toward the ends and negative toward the center
+    distance = numpy.abs(t)
+    scale = 1.0 - dropoff * distance if dropoff >= 0.0 else 1.0 + dropoff * (1.0 - distance)
+    wave = amplitude * halfLength * scale * numpy.sin(2.0 * numpy.pi * (t / max(wavelength, 1e-6) + offset))
+    turned = rotateAbout(direction, axis, numpy.radians(sineRotation))
+    deformed += numpy.where(distance <= 1.0, wave, 0.0)[:, None] * turned
+
+    return points + numpy.reshape(envelope, (-1, 1)) * (deformed - points)
+
+
+def rowDriveWeights(parameters, count, blend=0.0):
+    """
+    Sparse weights of the direct ribbon drive: each point follows the driver of its CV row, blended with the
+    two neighbouring drivers.
+
+    Args:
+        parameters (ndarray): (P,) chain parameters of the points from chainParameters.
+        count (int): Number of drivers, one per CV row.
+        blend (float): 0..0.5 weight of each neighbour, the row's own driver keeps 1 - 2 * blend.
+
+    Returns:
+        tuple: (indices, weights), both (P, 3): own driver, previous and next. At the chain ends the missing
+        neighbour's weight goes back to the own driver.
+    """
+    nearest = numpy.clip(numpy.rint(parameters).astype(int), 0, count - 1)
+    indices = numpy.stack([nearest, nearest - 1, nearest + 1], axis=1)
+    weights = numpy.tile([1.0 - 2.0 * blend, blend, blend], (len(nearest), 1))
+    outside = (indices < 0) | (indices >= count)
+    weights[:, 0] += numpy.where(outside, weights, 0.0).sum(axis=1)
+    weights[outside] = 0.0
+    return numpy.clip(indices, 0, count - 1), weights
+
+
+def drivePoints(points, matrices, indices, weights):
+    """
+    Linear blend of points through row-vector matrices, like a skinCluster restricted to three influences.
+
+    Args:
+        points (ndarray): (P, 3) rest points.
+        matrices (ndarray): (count, 4, 4) bind pre-matrix times world matrix of every driver.
+        indices, weights (ndarray): (P, 3) from rowDriveWeights.
+
+    Returns:
+        numpy.ndarray: (P, 3) driven points.
+    """
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    homogeneous = numpy.hstack([points, numpy.ones((len(points), 1))])
+    moved = numpy.einsum('pj,pkjl->pkl', homogeneous, numpy.asarray(matrices, dtype=float)[indices])
+    return (weights[..., None] * moved[..., :3]).sum(axis=1)
+
+
+def localBasis(parameters, knots, degree):
+    """
+    The degree + 1 non-zero basis functions of a B-spline at each parameter, by the Cox-de Boor recursion
+    for all parameters at once.
+
+    Args:
+        parameters (ndarray): (T,) parameters within the knot range.
+        knots (ndarray): Full knot vector, with the end knots Maya leaves out (see fullKnots).
+        degree (int): Curve degree.
+
+    Returns:
+        tuple: (first, basis): (T,) index of the first CV each parameter depends on and the (T, degree + 1)
+        weights of it and the next CVs.
+    """
+    knots = numpy.asarray(knots, dtype=float)
+    t = numpy.clip(numpy.asarray(parameters, dtype=float), knots[degree], knots[-degree - 1])
+    span = numpy.clip(numpy.searchsorted(knots, t, side='right') - 1, degree, len(knots) - degree - 2)
+    basis = numpy.zeros((len(t), degree + 1))
+    basis[:, 0] = 1.0
+    left = [None] + [t - knots[span + 1 - j] for j in range(1, degree + 1)]
+    right = [None] + [knots[span + j] - t for j in range(1, degree + 1)]
+    for j in range(1, degree + 1):
+        saved = numpy.zeros(len(t))
+        for r in range(j):
+            temp = basis[:, r] / numpy.maximum(right[r + 1] + left[j - r], 1e-12)
+            basis[:, r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        basis[:, j] = saved
+    return span - degree, basis
+
+
+def knotBasis(parameters, knots, degree):
+    """
+    Returns:
+        numpy.ndarray: (T, len(knots) - degree - 1) weight of each CV of a B-spline at each parameter, see
+        localBasis.
+    """
+    first, basis = localBasis(parameters, knots, degree)
+    dense = numpy.zeros((len(first), len(knots) - degree - 1))
+    dense[numpy.arange(len(first))[:, None], first[:, None] + numpy.arange(degree + 1)] = basis
+    return dense
+
+
+def bsplineBasis(parameters, spanCount, degree=3):
+    """
+    Basis functions of a clamped uniform B-spline.
+
+    Args:
+        parameters (ndarray): (T,) normalized parameters, 0..1.
+        spanCount (int): Number of spans.
+        degree (int): Curve degree.
+
+    Returns:
+        numpy.ndarray: (T, spanCount + degree) weight of each CV at each parameter.
+    """
+    knots = numpy.concatenate([numpy.zeros(degree), numpy.arange(spanCount + 1.0), numpy.full(degree, spanCount)])
+    return knotBasis(numpy.asarray(parameters, dtype=float) * spanCount, knots, degree)
+
+
+def fullKnots(knots):
+    """Full knot vector of a curve from the knots in Maya's form, which leaves out the first and last knot."""
+    knots = numpy.asarray(knots, dtype=float)
+    return numpy.concatenate([knots[:1], knots, knots[-1:]])
+
+
+def curvePoints(cvs, knots, degree, parameters):
+    """
+    Evaluates a non-rational NURBS curve.
+
+    Args:
+        cvs (ndarray): (C, 3) CVs.
+        knots (ndarray): Full knot vector.
+        degree (int): Curve degree.
+        parameters (ndarray): (T,) curve parameters.
+
+    Returns:
+        numpy.ndarray: (T, 3) points.
+    """
+    cvs = numpy.asarray(cvs, dtype=float).reshape(-1, 3)
+    knots = numpy.asarray(knots, dtype=float)
+    first, basis = localBasis(parameters, knots, degree)
+    return numpy.einsum('tk,tkj->tj', basis, cvs[first[:, None] + numpy.arange(degree + 1)])
+
+
+def arcLengthSamples(cvs, knots, degree, count, samplesPerSpan=64):
+    """
+    Samples a curve at `count` points evenly spaced by arc length. One arc length table is built from a dense
+    evaluation of the whole curve, then inverted for all samples at once.
+
+    Args:
+        cvs (ndarray): (C, 3) CVs.
+        knots (ndarray): Knots in Maya's form, as MFnNurbsCurve.knots and curveInfo return them.
+        degree (int): Curve degree.
+        count (int): Number of samples, the first and last on the curve's ends.
+        samplesPerSpan (int): Table entries per span, at least four per sample.
+
+    Returns:
+        tuple: (positions, parameters, length): (count, 3) positions, (count,) parameters normalized to 0..1
+        like follicle and uvPin coordinates, and the curve length.
+    """
+    knots = fullKnots(knots)
+    start, end = knots[degree], knots[-degree - 1]
+    spanCount = len(numpy.unique(knots[degree:-degree]))
+    # The knots are in the table, so a degree 1 curve, i.e. a polyline, is measured exactly
+    table = numpy.union1d(numpy.linspace(start, end, max(samplesPerSpan * spanCount, 4 * count) + 1),
+                          knots[degree:-degree])
+    tablePoints = curvePoints(cvs, knots, degree, table)
+    lengths = numpy.concatenate([[0.0], numpy.cumsum(numpy.linalg.norm(numpy.diff(tablePoints, axis=0), axis=1))])
+    parameters = numpy.interp(numpy.linspace(0.0, lengths[-1], count), lengths, table)
+    positions = curvePoints(cvs, knots, degree, parameters)
+    return positions, (parameters - start) / (end - start), float(lengths[-1])
+
+
+def polylineSamples(points, samplesPerSegment=4):
+    """
+    Evenly subdivides a polyline, e.g. the ribbon curve's CVs.
+
+    Returns:
+        tuple: (samples, parameters), the (T, 3) positions and their (T,) normalized chord length parameters.
+    """
+    points = numpy.asarray(points, dtype=float).reshape(-1, 3)
+    steps = numpy.linspace(0.0, 1.0, samplesPerSegment, endpoint=False)
+    samples = numpy.vstack([(points[:-1, None, :] + steps[:, None] * numpy.diff(points, axis=0)[:, None, :])
+                            .reshape(-1, 3), points[-1:]])
+    lengths = numpy.concatenate([[0.0], numpy.cumsum(numpy.linalg.norm(numpy.diff(samples, axis=0), axis=1))])
+    return samples, lengths / max(lengths[-1], 1e-12)
+
+
+def fitCurve(points, spanCount, samplesPerSegment=4):
+    """
+    Least-squares fit of a cubic curve with `spanCount` uniform spans to a polyline, with its end CVs on the
+    polyline's ends.
+
+    Returns:
+        tuple: (cvs, error), the (spanCount + 3, 3) CVs and the largest distance of a polyline sample from the
+        fitted curve at the same parameter.
+    """
+    samples, parameters = polylineSamples(points, samplesPerSegment)
+    basis = bsplineBasis(parameters, spanCount)
+    cvs = numpy.empty((spanCount + 3, 3))
+    cvs[0], cvs[-1] = samples[0], samples[-1]
+    targets = samples - basis[:, :1] * cvs[0] - basis[:, -1:] * cvs[-1]
+    cvs[1:-1] = numpy.linalg.lstsq(basis[:, 1:-1], targets, rcond=None)[0]
+    error = numpy.linalg.norm(basis @ cvs - samples, axis=1).max()
+    return cvs, float(error)
+
+
+def surfaceSpanCount(points, tolerance, maxSpans=None):
+    """
+    Fewest spans of a cubic curve that follows a polyline within `tolerance`. Straight stretches need few
+    spans and bends more, so the count follows the curvature instead of the number of points.
+
+    Args:
+        points (ndarray): (M, 3) polyline points.
+        tolerance (float): Largest allowed distance from the polyline.
+        maxSpans (int): Upper bound, defaults to one span per polyline segment.
+
+    Returns:
+        int: The span count, found by doubling and then bisecting.
+    """
+    maxSpans = max(int(maxSpans or len(points) - 1), 1)
+    high = 1
+    while high < maxSpans and fitCurve(points, high)[1] > tolerance:
+        high *= 2
+    high = min(high, maxSpans)
+    low = high // 2 + 1 if high > 1 else 1
+    while low < high:
+        middle = (low + high) // 2
+        if fitCurve(points, middle)[1] > tolerance:
+            low = middle + 1
+        else:
+            high = middle
+    return high
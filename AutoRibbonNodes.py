@@ -0,0 +1,473 @@
+"""
+Maya Python API 2.0 plug-in for the Auto Ribbon Tool.
+
+Load it with cmds.loadPlugin(<path to this file>). It registers:
+
+- autoRibbonApplyPlan: wraps the modifiers executed by
+  AutoRibbonPlan.MayaModifierBackend so a whole plan commit is one undo step.
+- autoRibbonRollSolver: computes the roll angle of every FK control in one
+  NumPy pass, replacing the MASH + per-control remap/clamp network.
+- autoRibbonRippleSolver: computes RippleOut and every joint's ripple scale in
+  one NumPy pass, replacing the expression, MASH and per-joint remap/blend
+  network. It reads only its inputs, so it is safe for parallel evaluation
+  and cached playback.
+- autoRibbonTwistSine: one deformer applying the ribbon's twist and sine in
+  a single NumPy pass over all surface points, replacing the twist and sine
+  nonLinear deformers and their handles.
+- autoRibbonCvDrive: moves every CV row of the ribbon surface with its driver
+  joint's matrix, optionally blended with the neighbouring rows, replacing the
+  ribbon surface's skinCluster.
+- autoRibbonCacheReader: outputs the bind joint matrices of a joint cache
+  (AutoRibbonCache.py) at the current time, for rigs whose network was baked
+  down with Tentacle.loadCache.
+
+Node IDs are taken from the 0x0007F000 block of the local (unregistered) range.
+"""
+
+import os
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import numpy
+
+import AutoRibbonCache
+import AutoRibbonMath
+from AutoRibbonLayout import AXIS_VECTORS
+
+
+def maya_useNewAPI():
+    pass
+
+
+class AutoRibbonApplyPlan(om.MPxCommand):
+    """Takes ownership of already executed build modifiers for undo/redo."""
+
+    commandName = 'autoRibbonApplyPlan'
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        self.modifiers = ()
+
+    @staticmethod
+    def creator():
+        return AutoRibbonApplyPlan()
+
+    def doIt(self, args):
+        import AutoRibbonPlan
+        if AutoRibbonPlan.pendingModifiers:
+            self.modifiers = AutoRibbonPlan.pendingModifiers.pop()
+
+    def redoIt(self):
+        for modifier in self.modifiers:
+            modifier.doIt()
+
+    def undoIt(self):
+        for modifier in reversed(self.modifiers):
+            modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+
+def addInput(attribute, fn):
+    fn.keyable = True
+    om.MPxNode.addAttribute(attribute)
+
+
+def addArrayOutput(attribute, fn):
+    fn.array = True
+    fn.usesArrayDataBuilder = True
+    fn.writable = False
+    fn.storable = False
+    om.MPxNode.addAttribute(attribute)
+
+
+def readMatrixArray(handle):
+    """Reads a matrix array input as (count, 4, 4), indexed by logical index, missing elements as identity."""
+    values = {}
+    for _ in range(len(handle)):
+        values[handle.elementLogicalIndex()] = list(handle.inputValue().asMatrix())
+        handle.next()
+    matrices = numpy.tile(numpy.identity(4), (max(values) + 1 if values else 0, 1, 1))
+    for index, value in values.items():
+        matrices[index] = numpy.reshape(value, (4, 4))
+    return matrices
+
+
+def pointWeights(node, data, iterator, multiIndex):
+    """
+    Painted weights of a deformer's points, in iterator order.
+
+    Returns:
+        numpy.ndarray: (P,) weights, or None when none are painted and every point has the default weight 1.
+    """
+    weightList = data.inputArrayValue(oma.MPxDeformerNode.weightList)
+    try:
+        weightList.jumpToLogicalElement(multiIndex)
+    except RuntimeError:
+        return None
+    if not len(om.MArrayDataHandle(weightList.inputValue().child(oma.MPxDeformerNode.weights))):
+        return None
+    weights = []
+    iterator.reset()
+    while not iterator.isDone():
+        weights.append(node.weightValue(data, multiIndex, iterator.index()))
+        iterator.next()
+    iterator.reset()
+    return numpy.array(weights)
+
+
+def setArrayOutput(data, attribute, values, setter):
+    """Writes one array output in a single pass and marks it clean."""
+    handle = data.outputArrayValue(attribute)
+    builder = om.MArrayDataBuilder(data, attribute, len(values))
+    for index, value in enumerate(values):
+        setter(builder.addElement(index), value)
+    handle.set(builder)
+    handle.setAllClean()
+
+
+class AutoRibbonRollSolver(om.MPxNode):
+    """Roll angle of every FK control from the Roll/Angle/Falloff driver attributes."""
+
+    typeName = 'autoRibbonRollSolver'
+    typeId = om.MTypeId(0x0007F001)
+
+    roll = None
+    angle = None
+    falloff = None
+    count = None
+    outRoll = None
+
+    @staticmethod
+    def creator():
+        return AutoRibbonRollSolver()
+
+    @staticmethod
+    def initialize():
+        cls = AutoRibbonRollSolver
+        numeric = om.MFnNumericAttribute()
+        unit = om.MFnUnitAttribute()
+
+        cls.roll = numeric.create('roll', 'rl', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.roll, numeric)
+        cls.angle = numeric.create('angle', 'ang', om.MFnNumericData.kDouble, -70.0)
+        addInput(cls.angle, numeric)
+        cls.falloff = numeric.create('falloff', 'fo', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.falloff, numeric)
+        cls.count = numeric.create('count', 'cnt', om.MFnNumericData.kInt, 1)
+        numeric.setMin(1)
+        addInput(cls.count, numeric)
+
+        cls.outRoll = unit.create('outRoll', 'orl', om.MFnUnitAttribute.kAngle, 0.0)
+        addArrayOutput(cls.outRoll, unit)
+
+        for attribute in (cls.roll, cls.angle, cls.falloff, cls.count):
+            om.MPxNode.attributeAffects(attribute, cls.outRoll)
+
+    def compute(self, plug, data):
+        cls = AutoRibbonRollSolver
+        if plug != cls.outRoll and not (plug.isElement and plug.array() == cls.outRoll):
+            return None
+        angles = AutoRibbonMath.rollAngles(data.inputValue(cls.roll).asDouble(),
+                                           data.inputValue(cls.angle).asDouble(),
+                                           data.inputValue(cls.falloff).asDouble(),
+                                           data.inputValue(cls.count).asInt())
+        setArrayOutput(data, cls.outRoll, angles,
+                       lambda handle, value: handle.setMAngle(om.MAngle(float(value), om.MAngle.kDegrees)))
+        data.setClean(plug)
+
+
+class AutoRibbonRippleSolver(om.MPxNode):
+    """RippleOut and the ripple scale of every joint from the Ripple* driver attributes."""
+
+    typeName = 'autoRibbonRippleSolver'
+    typeId = om.MTypeId(0x0007F002)
+
+    ripple = None
+    frequency = None
+    amplitude = None
+    offset = None
+    falloff = None
+    count = None
+    rippleOut = None
+    outScale = None
+
+    @staticmethod
+    def creator():
+        return AutoRibbonRippleSolver()
+
+    @staticmethod
+    def initialize():
+        cls = AutoRibbonRippleSolver
+        numeric = om.MFnNumericAttribute()
+
+        cls.ripple = numeric.create('ripple', 'rp', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.ripple, numeric)
+        cls.frequency = numeric.create('frequency', 'frq', om.MFnNumericData.kDouble, 5.0)
+        addInput(cls.frequency, numeric)
+        cls.amplitude = numeric.create('amplitude', 'amp', om.MFnNumericData.kDouble, 1.5)
+        addInput(cls.amplitude, numeric)
+        cls.offset = numeric.create('offset', 'ofs', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.offset, numeric)
+        cls.falloff = numeric.create('falloff', 'fo', om.MFnNumericData.kDouble, 0.05)
+        addInput(cls.falloff, numeric)
+        cls.count = numeric.create('count', 'cnt', om.MFnNumericData.kInt, 1)
+        numeric.setMin(1)
+        addInput(cls.count, numeric)
+
+        cls.rippleOut = numeric.create('rippleOut', 'rpo', om.MFnNumericData.kDouble, 0.0)
+        numeric.writable = False
+        numeric.storable = False
+        om.MPxNode.addAttribute(cls.rippleOut)
+        cls.outScale = numeric.create('outScale', 'osc', om.MFnNumericData.kDouble, 1.0)
+        addArrayOutput(cls.outScale, numeric)
+
+        for attribute in (cls.ripple, cls.frequency, cls.amplitude, cls.offset, cls.falloff, cls.count):
+            om.MPxNode.attributeAffects(attribute, cls.rippleOut)
+            om.MPxNode.attributeAffects(attribute, cls.outScale)
+
+    def compute(self, plug, data):
+        cls = AutoRibbonRippleSolver
+        if plug not in (cls.rippleOut, cls.outScale) and not (plug.isElement and plug.array() == cls.outScale):
+            return None
+        rippleOut, scales = AutoRibbonMath.rippleScales(data.inputValue(cls.ripple).asDouble(),
+                                                        data.inputValue(cls.frequency).asDouble(),
+                                                        data.inputValue(cls.amplitude).asDouble(),
+                                                        data.inputValue(cls.offset).asDouble(),
+                                                        data.inputValue(cls.falloff).asDouble(),
+                                                        data.inputValue(cls.count).asInt())
+        outHandle = data.outputValue(cls.rippleOut)
+        outHandle.setDouble(float(rippleOut))
+        outHandle.setClean()
+        setArrayOutput(data, cls.outScale, scales, lambda handle, value: handle.setDouble(float(value)))
+        data.setClean(plug)
+
+
+class AutoRibbonTwistSine(oma.MPxDeformerNode):
+    """
+    Twist from startAngle (root) to endAngle (tip), then the sine wave, over all points at once. Painted
+    weights scale each point's deformation, as on the nonLinear deformers it replaces.
+    """
+
+    typeName = 'autoRibbonTwistSine'
+    typeId = om.MTypeId(0x0007F004)
+
+    startAngle = None
+    endAngle = None
+    amplitude = None
+    wavelength = None
+    offset = None
+    sineRotation = None
+    dropoff = None
+    primaryAxis = None
+    length = None
+
+    @staticmethod
+    def creator():
+        return AutoRibbonTwistSine()
+
+    @staticmethod
+    def initialize():
+        cls = AutoRibbonTwistSine
+        numeric = om.MFnNumericAttribute()
+        enum = om.MFnEnumAttribute()
+
+        cls.startAngle = numeric.create('startAngle', 'sa', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.startAngle, numeric)
+        cls.endAngle = numeric.create('endAngle', 'ea', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.endAngle, numeric)
+        cls.amplitude = numeric.create('amplitude', 'amp', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.amplitude, numeric)
+        cls.wavelength = numeric.create('wavelength', 'wl', om.MFnNumericData.kDouble, 1.0)
+        numeric.setMin(0.1)
+        addInput(cls.wavelength, numeric)
+        cls.offset = numeric.create('offset', 'off', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.offset, numeric)
+        cls.sineRotation = numeric.create('sineRotation', 'sr', om.MFnNumericData.kDouble, 0.0)
+        addInput(cls.sineRotation, numeric)
+        cls.dropoff = numeric.create('dropoff', 'dr', om.MFnNumericData.kDouble, 1.0)
+        numeric.setMin(-1.0)
+        numeric.setMax(1.0)
+        addInput(cls.dropoff, numeric)
+        cls.primaryAxis = enum.create('primaryAxis', 'pa', 1)
+        for index, axis in enumerate('xyz'):
+            enum.addField(axis, index)
+        om.MPxNode.addAttribute(cls.primaryAxis)
+        cls.length = numeric.create('length', 'len', om.MFnNumericData.kDouble, 1.0)
+        numeric.setMin(1e-3)
+        om.MPxNode.addAttribute(cls.length)
+
+        for attribute in (cls.startAngle, cls.endAngle, cls.amplitude, cls.wavelength, cls.offset, cls.sineRotation,
+                          cls.dropoff, cls.primaryAxis, cls.length):
+            om.MPxNode.attributeAffects(attribute, oma.MPxGeometryFilter.outputGeom)
+
+    def deform(self, data, iterator, matrix, multiIndex):
+        cls = AutoRibbonTwistSine
+        envelope = data.inputValue(oma.MPxGeometryFilter.envelope).asFloat()
+        if envelope == 0.0:
+            return
+        axis = 'xyz'[data.inputValue(cls.primaryAxis).asShort()]
+        weights = pointWeights(self, data, iterator, multiIndex)
+        if weights is not None:
+            envelope = envelope * weights
+        points = numpy.array(iterator.allPositions())[:, :3]
+        points = AutoRibbonMath.twistSinePoints(points, AXIS_VECTORS[axis], AutoRibbonMath.SINE_DIRECTIONS[axis],
+                                                data.inputValue(cls.length).asDouble(),
+                                                data.inputValue(cls.startAngle).asDouble(),
+                                                data.inputValue(cls.endAngle).asDouble(),
+                                                data.inputValue(cls.amplitude).asDouble(),
+                                                data.inputValue(cls.wavelength).asDouble(),
+                                                data.inputValue(cls.offset).asDouble(),
+                                                data.inputValue(cls.sineRotation).asDouble(),
+                                                data.inputValue(cls.dropoff).asDouble(), envelope)
+        iterator.setAllPositions(om.MPointArray(points.tolist()))
+
+
+class AutoRibbonCvDrive(oma.MPxDeformerNode):
+    """
+    Every point follows the driver of its CV row, blended with the neighbouring rows' drivers. Painted
+    weights scale each point's move together with the envelope.
+    """
+
+    typeName = 'autoRibbonCvDrive'
+    typeId = om.MTypeId(0x0007F005)
+
+    driverMatrix = None
+    bindPreMatrix = None
+    blend = None
+
+    @staticmethod
+    def creator():
+        return AutoRibbonCvDrive()
+
+    @staticmethod
+    def initialize():
+        cls = AutoRibbonCvDrive
+        numeric = om.MFnNumericAttribute()
+        matrix = om.MFnMatrixAttribute()
+
+        cls.driverMatrix = matrix.create('driverMatrix', 'dmx', om.MFnMatrixAttribute.kDouble)
+        matrix.array = True
+        om.MPxNode.addAttribute(cls.driverMatrix)
+        cls.bindPreMatrix = matrix.create('bindPreMatrix', 'bpm', om.MFnMatrixAttribute.kDouble)
+        matrix.array = True
+        om.MPxNode.addAttribute(cls.bindPreMatrix)
+        cls.blend = numeric.create('blend', 'bl', om.MFnNumericData.kDouble, 0.0)
+        numeric.setMin(0.0)
+        numeric.setMax(0.5)
+        addInput(cls.blend, numeric)
+
+        for attribute in (cls.driverMatrix, cls.bindPreMatrix, cls.blend):
+            om.MPxNode.attributeAffects(attribute, oma.MPxGeometryFilter.outputGeom)
+
+    def __init__(self):
+        oma.MPxDeformerNode.__init__(self)
+        # Row weights only change with the bind, so they are kept between evaluations
+        self.weightsKey = None
+        self.weights = None
+
+    def rowWeights(self, points, bindPositions, blend):
+        key = (len(points), blend, bindPositions.tobytes())
+        if key != self.weightsKey:
+            parameters = AutoRibbonMath.chainParameters(points, bindPositions)
+            self.weights = AutoRibbonMath.rowDriveWeights(parameters, len(bindPositions), blend)
+            self.weightsKey = key
+        return self.weights
+
+    def deform(self, data, iterator, matrix, multiIndex):
+        cls = AutoRibbonCvDrive
+        envelope = data.inputValue(oma.MPxGeometryFilter.envelope).asFloat()
+        drivers = readMatrixArray(data.inputArrayValue(cls.driverMatrix))
+        bindPreMatrices = readMatrixArray(data.inputArrayValue(cls.bindPreMatrix))
+        count = min(len(drivers), len(bindPreMatrices))
+        if envelope == 0.0 or count == 0:
+            return
+        localToWorld = numpy.reshape(list(matrix), (4, 4))
+        weights = pointWeights(self, data, iterator, multiIndex)
+        if weights is not None:
+            envelope = envelope * weights[:, None]
+        points = numpy.array(iterator.allPositions())
+        worldPoints = (points @ localToWorld)[:, :3]
+
+        bindPositions = numpy.linalg.inv(bindPreMatrices[:count])[:, 3, :3]
+        indices, weights = self.rowWeights(worldPoints, bindPositions, data.inputValue(cls.blend).asDouble())
+        driven = AutoRibbonMath.drivePoints(worldPoints, bindPreMatrices[:count] @ drivers[:count], indices, weights)
+        driven = worldPoints + envelope * (driven - worldPoints)
+        localPoints = numpy.hstack([driven, numpy.ones((len(driven), 1))]) @ numpy.linalg.inv(localToWorld)
+        iterator.setAllPositions(om.MPointArray(localPoints.tolist()))
+
+
+class AutoRibbonCacheReader(om.MPxNode):
+    """Bind joint matrices of a joint cache at the input time."""
+
+    typeName = 'autoRibbonCacheReader'
+    typeId = om.MTypeId(0x0007F003)
+
+    cachePath = None
+    time = None
+    outMatrix = None
+
+    # Opened caches by path and modification time, shared by all readers of a scene
+    caches = {}
+
+    @staticmethod
+    def creator():
+        return AutoRibbonCacheReader()
+
+    @staticmethod
+    def initialize():
+        cls = AutoRibbonCacheReader
+        typed = om.MFnTypedAttribute()
+        unit = om.MFnUnitAttribute()
+        matrix = om.MFnMatrixAttribute()
+
+        cls.cachePath = typed.create('cachePath', 'cp', om.MFnData.kString)
+        typed.usedAsFilename = True
+        om.MPxNode.addAttribute(cls.cachePath)
+        cls.time = unit.create('time', 'tm', om.MFnUnitAttribute.kTime, 0.0)
+        om.MPxNode.addAttribute(cls.time)
+
+        cls.outMatrix = matrix.create('outMatrix', 'omx', om.MFnMatrixAttribute.kDouble)
+        addArrayOutput(cls.outMatrix, matrix)
+
+        for attribute in (cls.cachePath, cls.time):
+            om.MPxNode.attributeAffects(attribute, cls.outMatrix)
+
+    @classmethod
+    def openCache(cls, path):
+        key = (path, os.path.getmtime(path))
+        if key not in cls.caches:
+            cls.caches[key] = AutoRibbonCache.readCache(path)
+        return cls.caches[key]
+
+    def compute(self, plug, data):
+        cls = AutoRibbonCacheReader
+        if plug != cls.outMatrix and not (plug.isElement and plug.array() == cls.outMatrix):
+            return None
+        path = data.inputValue(cls.cachePath).asString()
+        frame = data.inputValue(cls.time).asTime().asUnits(om.MTime.uiUnit())
+        matrices = self.openCache(path).matrices(frame) if os.path.isfile(path) else []
+        setArrayOutput(data, cls.outMatrix, matrices,
+                       lambda handle, value: handle.setMMatrix(om.MMatrix(value.ravel().tolist())))
+        data.setClean(plug)
+
+
+NODES = (AutoRibbonRollSolver, AutoRibbonRippleSolver, AutoRibbonCacheReader)
+DEFORMERS = (AutoRibbonTwistSine, AutoRibbonCvDrive)
+
+
+def initializePlugin(plugin):
+    fnPlugin = om.MFnPlugin(plugin, 'AutoRibbonTool', '3.0')
+    fnPlugin.registerCommand(AutoRibbonApplyPlan.commandName, AutoRibbonApplyPlan.creator)
+    for node in NODES:
+        fnPlugin.registerNode(node.typeName, node.typeId, node.creator, node.initialize, om.MPxNode.kDependNode)
+    for node in DEFORMERS:
+        fnPlugin.registerNode(node.typeName, node.typeId, node.creator, node.initialize, om.MPxNode.kDeformerNode)
+
+
+def uninitializePlugin(plugin):
+    fnPlugin = om.MFnPlugin(plugin)
+    fnPlugin.deregisterCommand(AutoRibbonApplyPlan.commandName)
+    for node in NODES + DEFORMERS:
+        fnPlugin.deregisterNode(node.typeId)
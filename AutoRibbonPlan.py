@@ -0,0 +1,645 @@
+"""
+Declarative build plans for the Auto Ribbon Tool.
+
+A BuildPlan records the nodes, attributes, values and connections of a rig
+without touching the scene. A backend then commits the whole plan at once:
+
+- MayaModifierBackend applies it through one OpenMaya DG/DAG modifier pair and
+  registers it as a single undo step.
+- CmdsBackend replays it through maya.cmds, one call per operation.
+- RecordingBackend applies it to an in-memory scene so the plan can be checked
+  without Maya.
+
+This module has no Maya import at module level.
+"""
+
+import os
+
+import numpy
+
+# Modifiers that have been executed by MayaModifierBackend but not yet handed to
+# the autoRibbonApplyPlan command for undo/redo.
+pendingModifiers = []
+
+SHAPE_TYPES = ('follicle', 'nurbsCurve', 'nurbsSurface', 'mesh', 'locator')
+
+NODES_PLUGIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AutoRibbonNodes.py')
+
+
+def loadNodesPlugin():
+    """Loads the AutoRibbonNodes.py plug-in (solver nodes and the autoRibbonApplyPlan command) once."""
+    import maya.cmds as cmds
+    if not cmds.pluginInfo(NODES_PLUGIN, query=True, loaded=True):
+        cmds.loadPlugin(NODES_PLUGIN, quiet=True)
+
+
+class BuildPlan(object):
+    """Ordered record of the scene operations of a rig build."""
+
+    def __init__(self):
+        self.nodes = []        # {'name', 'type', 'parent', 'shape'}
+        self.attributes = []   # {'node', 'longName', 'attributeType', 'flags'}
+        self.values = []       # (plug, value)
+        self.curves = []       # {'shape', 'points', 'degree', 'knots', 'periodic'}
+        self.instances = []    # (shape path, transform) - shape also instanced under transform
+        self.connections = []  # (source plug, destination plug)
+        self.matches = []      # (node, target) - snap node onto target's world transform
+        self.constraints = []  # {'name', 'type', 'driver', 'driven', 'maintainOffset'}
+        self.expressions = []  # (name, expression string)
+
+    def createNode(self, nodeType, name, parent=None, shapeName=None):
+        """
+        Plans a node. Shape types get a transform called `name` and a shape called `shapeName`.
+
+        Returns:
+            str: The name of the planned node (the transform for shape types).
+        """
+        if nodeType in SHAPE_TYPES and not shapeName:
+            shapeName = name + 'Shape'
+        self.nodes.append({'name': name, 'type': nodeType, 'parent': parent, 'shape': shapeName})
+        return name
+
+    def addAttr(self, node, longName, attributeType='float', **flags):
+        self.attributes.append({'node': node, 'longName': longName, 'attributeType': attributeType,
+                                'flags': flags})
+        return '{}.{}'.format(node, longName)
+
+    def setAttr(self, plug, *value):
+        self.values.append((plug, value[0] if len(value) == 1 else tuple(value)))
+
+    def setCurve(self, shape, points, degree=1, knots=None, periodic=False):
+        """Plans the geometry of a nurbsCurve shape from CV positions."""
+        if knots is None:
+            knots = curveKnots(len(points), degree, periodic)
+        self.curves.append({'shape': shape, 'points': [tuple(p) for p in points], 'degree': degree,
+                            'knots': list(knots), 'periodic': periodic})
+
+    def instanceShape(self, shape, transform):
+        """Plans `shape`, given as a path unique before any instancing like 'ctrl|ctrlShape', under `transform` too."""
+        self.instances.append((shape, transform))
+
+    def connectAttr(self, source, destination):
+        self.connections.append((source, destination))
+
+    def matchTransform(self, node, target):
+        """Plans snapping `node` onto the world transform of `target` (replaces a temporary constraint)."""
+        self.matches.append((node, target))
+
+    def constrain(self, constraintType, driver, driven, maintainOffset=False, name=None):
+        """
+        Plans a parentConstraint or scaleConstraint from `driver` to `driven`, or with 'matrix' a multMatrix
+        into the driven's offsetParentMatrix that does the work of both (see matrixConstraint).
+        """
+        if constraintType not in ('parent', 'scale', 'matrix'):
+            raise ValueError("Constraint type must be 'parent', 'scale' or 'matrix'.")
+        if constraintType == 'matrix':
+            name = name or '{}_multMatrix'.format(driven.split('|')[-1])
+        name = name or '{}_{}Constraint1'.format(driven.split('|')[-1], constraintType)
+        self.constraints.append({'name': name, 'type': constraintType, 'driver': driver, 'driven': driven,
+                                 'maintainOffset': maintainOffset})
+        return name
+
+    def expression(self, name, string):
+        self.expressions.append((name, string))
+        return name
+
+    def nodeNames(self):
+        names = []
+        for node in self.nodes:
+            names.append(node['name'])
+            if node['shape']:
+                names.append(node['shape'])
+        names.extend(constraint['name'] for constraint in self.constraints)
+        names.extend(name for name, _ in self.expressions)
+        return names
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counts of planned nodes, attributes, values and connections.
+        """
+        return {'nodes': len(self.nodeNames()),
+                'attributes': len(self.attributes),
+                'values': len(self.values) + len(self.curves) + len(self.matches),
+                'connections': len(self.connections) + sum(len(constraintConnections(c))
+                                                           for c in self.constraints)}
+
+
+def curveKnots(cvCount, degree, periodic=False):
+    """Returns a uniform knot vector in the form maya.cmds.curve and MFnNurbsCurve expect."""
+    if periodic:
+        return list(range(-(degree - 1), cvCount))
+    spans = cvCount - degree
+    return [0] * (degree - 1) + list(range(spans + 1)) + [spans] * (degree - 1)
+
+
+def nodeCreations(node):
+    """
+    Lists the (node type, name, parent) creations of a planned node, in order. Given a parent,
+    MDagModifier.createNode puts a shape type straight under it without a transform, so a shape type's
+    transform is created first and the shape under it, as CmdsBackend does.
+
+    Returns:
+        list: One creation, or the transform's and the shape's for shape types.
+    """
+    if node['shape']:
+        return [('transform', node['name'], node['parent']), (node['type'], node['shape'], node['name'])]
+    return [(node['type'], node['name'], node['parent'])]
+
+
+def constraintNode(constraint):
+    """
+    Returns:
+        tuple: (node type, parent) of a planned constraint's node.
+    """
+    if constraint['type'] == 'matrix':
+        return 'multMatrix', None
+    return constraint['type'] + 'Constraint', constraint['driven']
+
+
+def constraintConnections(constraint):
+    """Lists the (source, destination) connections that wire a planned constraint."""
+    node, driver, driven = constraint['name'], constraint['driver'], constraint['driven']
+    if constraint['type'] == 'matrix':
+        return [(driver + '.worldMatrix[0]', node + '.matrixIn[1]'),
+                (driven + '.parentInverseMatrix[0]', node + '.matrixIn[2]'),
+                (node + '.matrixSum', driven + '.offsetParentMatrix')]
+    target = node + '.target[0]'
+    if constraint['type'] == 'parent':
+        return [(driver + '.translate', target + '.targetTranslate'),
+                (driver + '.rotate', target + '.targetRotate'),
+                (driver + '.rotatePivot', target + '.targetRotatePivot'),
+                (driver + '.rotatePivotTranslate', target + '.targetRotateTranslate'),
+                (driver + '.rotateOrder', target + '.targetRotateOrder'),
+                (driver + '.parentMatrix[0]', target + '.targetParentMatrix'),
+                (driven + '.parentInverseMatrix[0]', node + '.constraintParentInverseMatrix'),
+                (driven + '.rotatePivot', node + '.constraintRotatePivot'),
+                (driven + '.rotatePivotTranslate', node + '.constraintRotateTranslate'),
+                (driven + '.rotateOrder', node + '.constraintRotateOrder'),
+                (node + '.constraintTranslate', driven + '.translate'),
+                (node + '.constraintRotate', driven + '.rotate')]
+    return [(driver + '.scale', target + '.targetScale'),
+            (driver + '.parentMatrix[0]', target + '.targetParentMatrix'),
+            (driven + '.parentInverseMatrix[0]', node + '.constraintParentInverseMatrix'),
+            (node + '.constraintScale', driven + '.scale')]
+
+
+def splitPlug(plug):
+    node, _, attr = plug.partition('.')
+    return node, attr
+
+
+class RecordedScene(object):
+    """In-memory result of RecordingBackend.commit."""
+
+    def __init__(self):
+        self.nodes = {}
+        self.parents = {}
+        self.attributes = {}
+        self.values = {}
+        self.connections = []
+        self.instances = []
+        self.problems = []
+
+    def inputs(self, plug):
+        return [source for source, destination in self.connections if destination == plug]
+
+
+class RecordingBackend(object):
+    """
+    Commits plans into a RecordedScene instead of Maya and checks them for
+    name clashes, dangling references and plugs with more than one input.
+
+    Args:
+        existing (iterable): Node names assumed to already exist in the scene.
+        strict (bool): Raise ValueError when the plan has problems.
+    """
+
+    def __init__(self, existing=(), strict=True):
+        self.scene = RecordedScene()
+        for name in existing:
+            self.scene.nodes[name] = 'existing'
+        self.strict = strict
+        self.commits = 0
+
+    def commit(self, plan):
+        scene = self.scene
+        for node in plan.nodes:
+            self._addNode(node['name'], node['type'] if not node['shape'] else 'transform', node['parent'])
+            if node['shape']:
+                self._addNode(node['shape'], node['type'], node['name'])
+        for shape, transform in plan.instances:
+            self._require(shape.split('|')[-1], 'instanceShape')
+            self._require(transform, 'instanceShape')
+            scene.instances.append((shape.split('|')[-1], transform))
+        for attribute in plan.attributes:
+            self._require(attribute['node'], 'addAttr')
+            scene.attributes['{}.{}'.format(attribute['node'], attribute['longName'])] = attribute
+        for plug, value in plan.values:
+            self._require(splitPlug(plug)[0], 'setAttr')
+            scene.values[plug] = value
+        for curve in plan.curves:
+            self._require(curve['shape'], 'setCurve')
+            scene.values[curve['shape'] + '.cached'] = curve
+        connections = list(plan.connections)
+        for constraint in plan.constraints:
+            self._addNode(constraint['name'], *constraintNode(constraint))
+            connections.extend(constraintConnections(constraint))
+        for name, string in plan.expressions:
+            self._addNode(name, 'expression', None)
+        for node, target in plan.matches:
+            self._require(node, 'matchTransform')
+            self._require(target, 'matchTransform')
+        connected = set(destination for _, destination in scene.connections)
+        for source, destination in connections:
+            self._require(splitPlug(source)[0], 'connectAttr')
+            self._require(splitPlug(destination)[0], 'connectAttr')
+            if destination in connected:
+                self._problem("'{}' already has an incoming connection".format(destination))
+            connected.add(destination)
+            scene.connections.append((source, destination))
+        self.commits += 1
+        if self.strict and scene.problems:
+            raise ValueError('Invalid build plan:\n' + '\n'.join(scene.problems))
+        return scene
+
+    def _addNode(self, name, nodeType, parent):
+        if name in self.scene.nodes:
+            self._problem("Node '{}' already exists".format(name))
+        if parent:
+            self._require(parent, 'parent')
+        self.scene.nodes[name] = nodeType
+        self.scene.parents[name] = parent
+
+    def _require(self, name, operation):
+        if name not in self.scene.nodes:
+            self._problem("{} references unknown node '{}'".format(operation, name))
+
+    def _problem(self, message):
+        self.scene.problems.append(message)
+
+
+class CmdsBackend(object):
+    """Replays a plan through maya.cmds, one call per operation."""
+
+    def commit(self, plan):
+        import maya.cmds as cmds
+
+        for node in plan.nodes:
+            kwargs = {'parent': node['parent']} if node['parent'] else {}
+            if node['shape']:
+                transform = cmds.createNode('transform', name=node['name'], skipSelect=True, **kwargs)
+                cmds.createNode(node['type'], name=node['shape'], parent=transform, skipSelect=True)
+            else:
+                cmds.createNode(node['type'], name=node['name'], skipSelect=True, **kwargs)
+        for shape, transform in plan.instances:
+            cmds.parent(shape, transform, shape=True, add=True)
+        for attribute in plan.attributes:
+            flags = dict(attribute['flags'])
+            channelBox = flags.pop('channelBox', False)
+            lock = flags.pop('lock', False)
+            cmds.addAttr(attribute['node'], longName=attribute['longName'],
+                         attributeType=attribute['attributeType'], **flags)
+            if channelBox or lock:
+                cmds.setAttr('{}.{}'.format(attribute['node'], attribute['longName']),
+                             channelBox=channelBox, lock=lock)
+        for curve in plan.curves:
+            cmds.setAttr(curve['shape'] + '.cached', *curveDataArgs(curve), type='nurbsCurve')
+        for plug, value in plan.values:
+            if isinstance(value, str):
+                cmds.setAttr(plug, value, type='string')
+            elif isinstance(value, tuple):
+                cmds.setAttr(plug, *value)
+            else:
+                cmds.setAttr(plug, value)
+        for source, destination in plan.connections:
+            cmds.connectAttr(source, destination)
+        for node, target in plan.matches:
+            cmds.matchTransform(node, target, position=True, rotation=True)
+        for constraint in plan.constraints:
+            if constraint['type'] == 'matrix':
+                matrixConstraint(constraint['driver'], constraint['driven'], constraint['maintainOffset'],
+                                 constraint['name'])
+                continue
+            command = cmds.parentConstraint if constraint['type'] == 'parent' else cmds.scaleConstraint
+            command(constraint['driver'], constraint['driven'], maintainOffset=constraint['maintainOffset'],
+                    name=constraint['name'])
+        for name, string in plan.expressions:
+            cmds.expression(string=string, name=name)
+
+
+def matrixConstraint(driver, driven, maintainOffset=True, name=None):
+    """
+    Makes `driven` follow `driver` like a parentConstraint plus scaleConstraint, with one multMatrix into its
+    offsetParentMatrix: matrixIn[0] holds the rest offset, then the driver's world matrix and the driven's
+    parent inverse. The driven's local channels are cleared, the offset holds its whole rest transform.
+
+    Returns:
+        str: The multMatrix node.
+    """
+    import maya.cmds as cmds
+
+    multMatrix = cmds.createNode('multMatrix', name=name or '{}_multMatrix'.format(driven), skipSelect=True)
+    offset = numpy.identity(4)
+    if maintainOffset:
+        offset = numpy.reshape(cmds.getAttr(driven + '.worldMatrix[0]'), (4, 4)) @ \
+            numpy.reshape(cmds.getAttr(driver + '.worldInverseMatrix[0]'), (4, 4))
+    cmds.setAttr(multMatrix + '.matrixIn[0]', offset.ravel().tolist(), type='matrix')
+    for attr in ('translate', 'rotate') + (('jointOrient',) if cmds.nodeType(driven) == 'joint' else ()):
+        cmds.setAttr('{}.{}'.format(driven, attr), 0, 0, 0)
+    for source, destination in constraintConnections({'type': 'matrix', 'name': multMatrix, 'driver': driver,
+                                                      'driven': driven}):
+        cmds.connectAttr(source, destination)
+    return multMatrix
+
+
+def curveDataArgs(curve):
+    """Flattens a planned curve into the value list of `setAttr -type nurbsCurve`."""
+    points = curve['points']
+    degree = curve['degree']
+    form = 2 if curve['periodic'] else 0
+    spans = len(points) - degree
+    args = [degree, spans, form, False, 3, len(curve['knots'])] + list(curve['knots']) + [len(points)]
+    for point in points:
+        args.extend(point)
+    return args
+
+
+class MayaModifierBackend(object):
+    """
+    Commits a plan through one MDagModifier/MDGModifier pair.
+
+    Every operation is queued on the modifiers and executed in a handful of
+    doIt() passes. When `undoable` is True the modifiers are handed to the
+    autoRibbonApplyPlan command (AutoRibbonNodes.py plug-in) so the whole
+    commit is a single entry in Maya's undo queue.
+    """
+
+    def __init__(self, undoable=True):
+        self.undoable = undoable
+        self._dagTypes = {}
+
+    def commit(self, plan):
+        import maya.api.OpenMaya as om
+        import maya.cmds as cmds
+
+        # DG node creation needs its own MDGModifier; every other operation goes
+        # through the DAG modifier so undoing it first leaves only bare DG nodes.
+        dagModifier = om.MDagModifier()
+        dgModifier = om.MDGModifier()
+        objects = {}
+        loadNodesPlugin()
+
+        def lookup(name):
+            if name not in objects:
+                selection = om.MSelectionList()
+                selection.add(name)
+                objects[name] = selection.getDependNode(0)
+            return objects[name]
+
+        def plugOf(plugName):
+            selection = om.MSelectionList()
+            selection.add(plugName)
+            return selection.getPlug(0)
+
+        def doIt():
+            dgModifier.doIt()
+            dagModifier.doIt()
+
+        # Pass 1: nodes
+        for node in plan.nodes:
+            for nodeType, name, parent in nodeCreations(node):
+                if self._isDag(nodeType):
+                    obj = dagModifier.createNode(nodeType, lookup(parent) if parent else om.MObject.kNullObj)
+                    dagModifier.renameNode(obj, name)
+                else:
+                    obj = dgModifier.createNode(nodeType)
+                    dgModifier.renameNode(obj, name)
+                objects[name] = obj
+        for constraint in plan.constraints:
+            nodeType, parent = constraintNode(constraint)
+            if parent:
+                obj = dagModifier.createNode(nodeType, lookup(parent))
+                dagModifier.renameNode(obj, constraint['name'])
+            else:
+                obj = dgModifier.createNode(nodeType)
+                dgModifier.renameNode(obj, constraint['name'])
+            objects[constraint['name']] = obj
+        doIt()
+
+        # Pass 2: dynamic attributes and curve data
+        for attribute in plan.attributes:
+            dagModifier.addAttribute(lookup(attribute['node']), _createAttribute(om, attribute))
+        doIt()
+        for curve in plan.curves:
+            dagModifier.newPlugValue(om.MFnDependencyNode(lookup(curve['shape'])).findPlug('cached', False),
+                                     _createCurveData(om, curve))
+
+        # Pass 3: shape instances, values and connections
+        for shape, transform in plan.instances:
+            dagModifier.commandToExecute('parent -add -shape {} {}'.format(shape, transform))
+        for plugName, value in plan.values:
+            _queueValue(om, dagModifier, plugOf(plugName), value)
+        for source, destination in plan.connections:
+            dagModifier.connect(plugOf(source), plugOf(destination))
+        # Locked last, after their values are set, and undone with the rest
+        for attribute in plan.attributes:
+            if attribute['flags'].get('lock'):
+                dagModifier.commandToExecute('setAttr -lock true {}.{}'.format(attribute['node'],
+                                                                               attribute['longName']))
+        doIt()
+
+        # Pass 4: placement, in plan order so parents are placed before children. Nodes placed earlier in the
+        # pass are not moved yet, so world matrices are composed with their planned ones and the pass is
+        # executed once.
+        placed = {}
+
+        def plannedWorld(obj):
+            world = om.MMatrix()
+            while not obj.hasFn(om.MFn.kWorld):
+                key = om.MObjectHandle(obj).hashCode()
+                if key in placed:
+                    return world * placed[key]
+                fnDag = om.MFnDagNode(obj)
+                world *= _matrixPlugValue(om, fnDag.findPlug('matrix', False)) * \
+                    _matrixPlugValue(om, fnDag.findPlug('offsetParentMatrix', False))
+                obj = fnDag.parent(0)
+            return world
+
+        for node, target in plan.matches:
+            obj = lookup(node)
+            targetWorld = plannedWorld(lookup(target))
+            local = targetWorld * plannedWorld(om.MFnDagNode(obj).parent(0)).inverse()
+            _queueTransform(om, dagModifier, om.MFnDependencyNode(obj), local)
+            placed[om.MObjectHandle(obj).hashCode()] = targetWorld
+        doIt()
+
+        # Pass 5: constraints, with offsets measured after placement
+        for constraint in plan.constraints:
+            fnConstraint = om.MFnDependencyNode(lookup(constraint['name']))
+            if constraint['type'] == 'matrix':
+                _queueMatrixConstraint(om, dagModifier, fnConstraint, constraint, lookup)
+                for source, destination in constraintConnections(constraint):
+                    dagModifier.connect(plugOf(source), plugOf(destination))
+                continue
+            target = fnConstraint.findPlug('target', False).elementByLogicalIndex(0)
+            _queueValue(om, dagModifier, _child(om, target, 'targetWeight'), 1.0)
+            if constraint['type'] == 'parent' and constraint['maintainOffset']:
+                offset = _worldMatrix(om, lookup(constraint['driven'])) * \
+                    _worldMatrix(om, lookup(constraint['driver'])).inverse()
+                transform = om.MTransformationMatrix(offset)
+                translation = transform.translation(om.MSpace.kTransform)
+                rotation = transform.rotation()
+                _queueValue(om, dagModifier, _child(om, target, 'targetOffsetTranslate'),
+                            (translation.x, translation.y, translation.z))
+                _queueValue(om, dagModifier, _child(om, target, 'targetOffsetRotate'),
+                            tuple(om.MAngle(angle).asDegrees() for angle in (rotation.x, rotation.y, rotation.z)))
+            if constraint['type'] == 'parent' and lookup(constraint['driven']).hasFn(om.MFn.kJoint):
+                dagModifier.connect(plugOf(constraint['driven'] + '.jointOrient'),
+                                    fnConstraint.findPlug('constraintJointOrient', False))
+            for source, destination in constraintConnections(constraint):
+                dagModifier.connect(plugOf(source), plugOf(destination))
+
+        # Pass 6: expressions, queued as commands so undoing the modifier deletes them with the rest
+        for name, string in plan.expressions:
+            dagModifier.commandToExecute('expression -name {} -string {}'.format(_melString(name),
+                                                                                 _melString(string)))
+        doIt()
+
+        if self.undoable:
+            pendingModifiers.append((dgModifier, dagModifier))
+            cmds.autoRibbonApplyPlan()
+        return objects
+
+    def _isDag(self, nodeType):
+        if nodeType not in self._dagTypes:
+            import maya.cmds as cmds
+            self._dagTypes[nodeType] = 'dagNode' in (cmds.nodeType(nodeType, isTypeName=True, inherited=True) or [])
+        return self._dagTypes[nodeType]
+
+
+def _melString(value):
+    """Quotes a Python string as a MEL string literal."""
+    for character, escaped in (('\\', '\\\\'), ('"', '\\"'), ('\n', '\\n'), ('\r', '\\r'), ('\t', '\\t')):
+        value = value.replace(character, escaped)
+    return '"{}"'.format(value)
+
+
+def _createAttribute(om, attribute):
+    flags = attribute['flags']
+    longName = attribute['longName']
+    if attribute['attributeType'] == 'enum':
+        fn = om.MFnEnumAttribute()
+        obj = fn.create(longName, longName)
+        for index, field in enumerate(f for f in flags.get('enumName', '').split(':') if f):
+            fn.addField(field, index)
+    else:
+        numericTypes = {'float': om.MFnNumericData.kFloat, 'double': om.MFnNumericData.kDouble,
+                        'long': om.MFnNumericData.kInt, 'bool': om.MFnNumericData.kBoolean}
+        fn = om.MFnNumericAttribute()
+        obj = fn.create(longName, longName, numericTypes[attribute['attributeType']], flags.get('defaultValue', 0))
+        if 'minValue' in flags:
+            fn.setMin(flags['minValue'])
+        if 'maxValue' in flags:
+            fn.setMax(flags['maxValue'])
+    if 'niceName' in flags:
+        fn.setNiceNameOverride(flags['niceName'])
+    fn.keyable = flags.get('keyable', False)
+    fn.channelBox = flags.get('channelBox', False)
+    return obj
+
+
+def _createCurveData(om, curve):
+    data = om.MFnNurbsCurveData().create()
+    form = om.MFnNurbsCurve.kPeriodic if curve['periodic'] else om.MFnNurbsCurve.kOpen
+    om.MFnNurbsCurve().create(om.MPointArray([om.MPoint(*p) for p in curve['points']]),
+                              om.MDoubleArray(curve['knots']), curve['degree'], form, False, True, data)
+    return data
+
+
+def _child(om, plug, name):
+    for index in range(plug.numChildren()):
+        child = plug.child(index)
+        if child.partialName(useLongNames=True).split('.')[-1] == name:
+            return child
+    raise RuntimeError("'{}' has no child '{}'".format(plug.name(), name))
+
+
+def _queueValue(om, modifier, plug, value):
+    if isinstance(value, (list, tuple)) and plug.isCompound:
+        for index, childValue in enumerate(value):
+            _queueValue(om, modifier, plug.child(index), childValue)
+        return
+    if isinstance(value, str):
+        modifier.newPlugValueString(plug, value)
+        return
+    attribute = plug.attribute()
+    if attribute.hasFn(om.MFn.kUnitAttribute):
+        unitType = om.MFnUnitAttribute(attribute).unitType()
+        if unitType == om.MFnUnitAttribute.kAngle:
+            modifier.newPlugValueMAngle(plug, om.MAngle(value, om.MAngle.kDegrees))
+        elif unitType == om.MFnUnitAttribute.kDistance:
+            modifier.newPlugValueMDistance(plug, om.MDistance(value, om.MDistance.uiUnit()))
+        else:
+            modifier.newPlugValueDouble(plug, value)
+    elif attribute.hasFn(om.MFn.kNumericAttribute):
+        numericType = om.MFnNumericAttribute(attribute).numericType()
+        if numericType == om.MFnNumericData.kBoolean:
+            modifier.newPlugValueBool(plug, bool(value))
+        elif numericType in (om.MFnNumericData.kInt, om.MFnNumericData.kShort, om.MFnNumericData.kLong,
+                             om.MFnNumericData.kByte, om.MFnNumericData.kChar):
+            modifier.newPlugValueInt(plug, int(value))
+        elif numericType == om.MFnNumericData.kFloat:
+            modifier.newPlugValueFloat(plug, value)
+        else:
+            modifier.newPlugValueDouble(plug, value)
+    elif attribute.hasFn(om.MFn.kEnumAttribute):
+        modifier.newPlugValueInt(plug, int(value))
+    else:
+        modifier.newPlugValueDouble(plug, value)
+
+
+def _matrixPlugValue(om, plug):
+    return om.MFnMatrixData(plug.asMObject()).matrix()
+
+
+def _worldMatrix(om, obj):
+    plug = om.MFnDependencyNode(obj).findPlug('worldMatrix', False).elementByLogicalIndex(0)
+    return _matrixPlugValue(om, plug)
+
+
+def _queueMatrixConstraint(om, modifier, fnMultMatrix, constraint, lookup):
+    """Queues the rest offset of a planned matrix constraint and clears the driven's local channels."""
+    offset = om.MMatrix()
+    if constraint['maintainOffset']:
+        offset = _worldMatrix(om, lookup(constraint['driven'])) * \
+            _worldMatrix(om, lookup(constraint['driver'])).inverse()
+    modifier.newPlugValue(fnMultMatrix.findPlug('matrixIn', False).elementByLogicalIndex(0),
+                          om.MFnMatrixData().create(offset))
+    fnDriven = om.MFnDependencyNode(lookup(constraint['driven']))
+    attrs = ('translate', 'rotate') + (('jointOrient',) if fnDriven.object().hasFn(om.MFn.kJoint) else ())
+    for attr in attrs:
+        _queueValue(om, modifier, fnDriven.findPlug(attr, False), (0.0, 0.0, 0.0))
+
+
+def _queueTransform(om, modifier, fnNode, local):
+    """Queues translate/rotate values so the node's local matrix becomes `local`."""
+    obj = fnNode.object()
+    transform = om.MTransformationMatrix(local)
+    if obj.hasFn(om.MFn.kJoint):
+        # Joint rotation is applied before jointOrient, so remove the orient first
+        orientPlug = fnNode.findPlug('jointOrient', False)
+        orient = om.MEulerRotation(*[orientPlug.child(i).asMAngle().asRadians() for i in range(3)])
+        transform = om.MTransformationMatrix(local * orient.asMatrix().inverse())
+        transform.setTranslation(om.MTransformationMatrix(local).translation(om.MSpace.kTransform),
+                                 om.MSpace.kTransform)
+    translation = transform.translation(om.MSpace.kTransform)
+    rotation = transform.rotation()
+    for index, value in enumerate((translation.x, translation.y, translation.z)):
+        plug = fnNode.findPlug('translate', False).child(index)
+        if not plug.isDestination:
+            modifier.newPlugValueMDistance(plug, om.MDistance(value))
+    for index, value in enumerate((rotation.x, rotation.y, rotation.z)):
+        plug = fnNode.findPlug('rotate', False).child(index)
+        if not plug.isDestination:
+            modifier.newPlugValueMAngle(plug, om.MAngle(value))
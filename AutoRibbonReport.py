@@ -0,0 +1,89 @@
+"""
+Runtime cost report of the Auto Ribbon Tool.
+
+Tentacle.costReport tags every node of a rig with the build stage that created
+it: setUpTentacleFK, tentacleRoll, tentacleRipple, tentacleRibbonDeformer or
+tentacleLod. It then samples how long each stage takes to evaluate over a frame
+range. This module turns those samples into:
+
+- a JSON report with the node census and the evaluation time of every stage
+- a Chrome trace (chrome://tracing or https://ui.perfetto.dev) with one slice
+  per stage and frame
+
+A sample event is a dict with the keys stage, frame, start and seconds. start
+is a time.perf_counter() value.
+
+This module has no Maya import.
+"""
+
+import json
+
+
+def nodeCensus(nodeStages, nodeTypes):
+    """
+    Counts the nodes of every stage, in total and by node type.
+
+    Args:
+        nodeStages (dict): Node name to stage.
+        nodeTypes (dict): Node name to node type.
+
+    Returns:
+        dict: Stage to {'nodes': count, 'types': {node type: count}}.
+    """
+    census = {}
+    for node, stage in nodeStages.items():
+        entry = census.setdefault(stage, {'nodes': 0, 'types': {}})
+        entry['nodes'] += 1
+        entry['types'][nodeTypes[node]] = entry['types'].get(nodeTypes[node], 0) + 1
+    return census
+
+
+def profileSummary(events, frameCount):
+    """
+    Totals the sampled evaluation time of every stage.
+
+    Returns:
+        dict: 'stages' maps each stage to its total seconds, milliseconds per frame and share of the sampled
+            time; 'dominant' is the stage with the largest share.
+    """
+    totals = {}
+    for event in events:
+        totals[event['stage']] = totals.get(event['stage'], 0.0) + event['seconds']
+    total = sum(totals.values())
+    stages = {stage: {'seconds': seconds, 'msPerFrame': seconds * 1000.0 / max(frameCount, 1),
+                      'share': seconds / total if total > 0.0 else 0.0}
+              for stage, seconds in totals.items()}
+    return {'frameCount': frameCount, 'seconds': total, 'stages': stages,
+            'dominant': max(totals, key=totals.get) if totals else None}
+
+
+def chromeTrace(events, name='autoRibbon'):
+    """
+    Lays out sample events in the Chrome trace event format, one complete event per stage and frame, each
+    inside a slice of its frame.
+
+    Returns:
+        dict: The trace, for json.dump.
+    """
+    if not events:
+        return {'traceEvents': [], 'displayTimeUnit': 'ms'}
+    origin = min(event['start'] for event in events)
+    traceEvents = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': name}}]
+    frames = {}
+    for event in events:
+        frames.setdefault(event['frame'], []).append(event)
+    for frame, frameEvents in frames.items():
+        start = min(event['start'] for event in frameEvents)
+        end = max(event['start'] + event['seconds'] for event in frameEvents)
+        traceEvents.append({'name': 'frame {:g}'.format(frame), 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                            'ts': (start - origin) * 1e6, 'dur': (end - start) * 1e6})
+        for event in frameEvents:
+            traceEvents.append({'name': event['stage'], 'cat': 'stage', 'ph': 'X', 'pid': 1, 'tid': 1,
+                                'ts': (event['start'] - origin) * 1e6, 'dur': event['seconds'] * 1e6,
+                                'args': {'frame': frame}})
+    return {'traceEvents': traceEvents, 'displayTimeUnit': 'ms'}
+
+
+def writeJson(path, data):
+    with open(path, 'w') as handle:
+        json.dump(data, handle, indent=2)
@@ -0,0 +1,94 @@
+"""
+Control shape library of the Auto Ribbon Tool.
+
+Every control curve the tool draws is stored here once, at unit size, with its
+degree, knots and form:
+
+- circle: the periodic degree 3 curve cmds.circle creates, facing +Y
+- square: a closed linear square in the XZ plane
+- arrow: the four-way arrow of the driver control, in the XZ plane
+
+shapeCurve scales and turns a library shape into the curve dict of
+BuildPlan.setCurve. The last MAX_CACHED_CURVES results are cached, so the FK
+ctrls of a rig, which come in two sizes, compute their CVs twice whatever the
+joint count, while the sizes of earlier rigs are dropped again.
+
+This module has no Maya import.
+"""
+
+import collections
+
+import numpy
+
+from AutoRibbonPlan import curveKnots
+
+# The circle's CVs, before the 3 overlapping ones of the periodic form
+CIRCLE_POINTS = [(0.783612, 0, -0.783612), (0, 0, -1.108194), (-0.783612, 0, -0.783612), (-1.108194, 0, 0),
+                 (-0.783612, 0, 0.783612), (0, 0, 1.108194), (0.783612, 0, 0.783612), (1.108194, 0, 0)]
+SQUARE_POINTS = [(-1, 0, -1), (-1, 0, 1), (1, 0, 1), (1, 0, -1), (-1, 0, -1)]
+ARROW_POINTS = [(-4.5, 0, 0), (-2.5, 0, -2), (-2.5, 0, -1.5), (-1.5, 0, -1.5), (-1.5, 0, -2.5), (-2, 0, -2.5),
+                (0, 0, -4.5), (2, 0, -2.5), (1.5, 0, -2.5), (1.5, 0, -1.5), (2.5, 0, -1.5), (2.5, 0, -2),
+                (4.5, 0, 0), (2.5, 0, 2), (2.5, 0, 1.5), (1.5, 0, 1.5), (1.5, 0, 2.5), (2, 0, 2.5),
+                (0, 0, 4.5), (-2, 0, 2.5), (-1.5, 0, 2.5), (-1.5, 0, 1.5), (-2.5, 0, 1.5), (-2.5, 0, 2),
+                (-4.5, 0, 0)]
+
+
+def libraryShape(points, degree=1, periodic=False, knots=None, oriented=False):
+    """
+    Args:
+        points (list): Unit size CVs, without the overlapping ones of a periodic curve.
+        oriented (bool): The shape turns to face the normal shapeCurve is given, like cmds.circle.
+
+    Returns:
+        dict: The library entry.
+    """
+    points = numpy.asarray(points, dtype=float)
+    if periodic:
+        points = numpy.concatenate([points, points[:degree]])
+    return {'points': points, 'degree': degree, 'periodic': periodic, 'oriented': oriented,
+            'knots': list(knots) if knots is not None else curveKnots(len(points), degree, periodic)}
+
+
+SHAPES = {
+    'circle': libraryShape(CIRCLE_POINTS, degree=3, periodic=True, oriented=True),
+    'square': libraryShape(SQUARE_POINTS),
+    # The arrow was always drawn with one knot per CV
+    'arrow': libraryShape(ARROW_POINTS, knots=range(len(ARROW_POINTS))),
+}
+
+# Axis permutations that turn the +Y facing shapes to face each unit axis
+FACING = {(1, 0, 0): [1, 0, 2], (0, 1, 0): [0, 1, 2], (0, 0, 1): [0, 2, 1]}
+
+# Curves kept by shapeCurve, by shape, size and normal. Every rig length adds sizes, so the least recently
+# used ones are dropped.
+MAX_CACHED_CURVES = 64
+_curves = collections.OrderedDict()
+
+
+def shapeCurve(name, size=1.0, normal=(0, 1, 0)):
+    """
+    Args:
+        name (str): Library shape, one of SHAPES.
+        size (float): Scale of the unit shape, the circle's radius or the square's half size.
+        normal (tuple): Unit axis an oriented shape faces.
+
+    Returns:
+        dict: The curve, with 'points' as a list of tuples and 'degree', 'knots' and 'periodic', as
+            BuildPlan.setCurve takes them. Do not modify it, it is shared with every other caller.
+    """
+    if name not in SHAPES:
+        raise ValueError("Unknown control shape '{}', expected one of {}.".format(name, ', '.join(sorted(SHAPES))))
+    shape = SHAPES[name]
+    normal = tuple(int(value) for value in normal) if shape['oriented'] else (0, 1, 0)
+    if normal not in FACING:
+        raise ValueError("The normal of a control shape must be a unit axis.")
+    key = (name, float(size), normal)
+    if key in _curves:
+        _curves.move_to_end(key)
+        return _curves[key]
+    points = shape['points'][:, FACING[normal]] * size
+    _curves[key] = {'points': [tuple(point) for point in points.tolist()], 'degree': shape['degree'],
+                    'knots': shape['knots'], 'periodic': shape['periodic']}
+    if len(_curves) > MAX_CACHED_CURVES:
+        _curves.popitem(last=False)
+    return _curves[key]
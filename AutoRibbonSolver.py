@@ -0,0 +1,196 @@
+"""
+Offline reference solver of the Auto Ribbon Tool's tentacle rig.
+
+solveJoints evaluates what a built rig computes for F frames of driver control
+attribute values and returns every bind joint's transform as an (F, N, 4, 4)
+array. The FK chain with the roll network, the twist and sine deformers and the
+ripple scales are solved for all frames and joints in one vectorized pass, so
+it serves for previews, regression tests of the network math and baking on
+machines without Maya.
+
+The solver models the rig in the driver control's space, with the driver
+control at rest:
+
+- Every FK ctrl group sits at its driver joint's rest position (the ribbon
+  curve CVs) and rotates about the roll axis by its rollAngles value; the
+  optional ctrl rotations are the animator's FK rotations, in Maya's XYZ order.
+- The ribbon follows its driver joints exactly at the follicle UVs, so each
+  bind joint starts from its driver joint's frame.
+- The twist deformer rotates about the primary axis by an angle blended from
+  the end control's Twist (root) to the driver control's Twist (tip) over the
+  rest length.
+- The sine deformer offsets along its handle's X axis, turned about the
+  primary axis by SineRotation:
+  Amplitude * L/2 * (1 - |t|) * sin(2 * pi * (t / Wavelength + Offset)), with t
+  the position along the handle from -1 (root) to 1 (tip) and dropoff 1 as
+  built. The joint frames tilt with the wave's slope.
+- The ripple network scales each joint's X axis by rippleScales.
+
+Matrices are row-major with the translation in the last row, like Maya's.
+
+This module has no Maya import.
+"""
+
+import numpy
+
+import AutoRibbonMath
+from AutoRibbonLayout import AXIS_VECTORS, layoutFromSpec
+
+# Driver control attributes the solver reads, with their defaults from the build. EndTwist is the Twist
+# attribute of the end control CTRL_M_TentacleDrv_End_001.
+DRIVER_DEFAULTS = {
+    'Roll': 0.0, 'Angle': -70.0, 'Falloff': 0.0,
+    'Ripple': 0.0, 'RippleFrequency': 5.0, 'RippleAmplitude': 1.5, 'RippleOffset': 0.0, 'RippleFalloff': 0.05,
+    'Twist': 0.0, 'EndTwist': 0.0,
+    'Amplitude': 0.0, 'Wavelength': 1.0, 'Offset': 0.0, 'SineRotation': 0.0,
+}
+
+def driverArrays(drivers):
+    """
+    Broadcasts driver values to one frame axis, filling in the defaults.
+
+    Args:
+        drivers (dict): Attribute name to a scalar or an (F,) array.
+
+    Returns:
+        dict: Attribute name to an (F,) float array, for every DRIVER_DEFAULTS attribute.
+    """
+    unknown = set(drivers) - set(DRIVER_DEFAULTS)
+    if unknown:
+        raise ValueError("Unknown driver attributes: {}.".format(', '.join(sorted(unknown))))
+    values = dict(DRIVER_DEFAULTS, **drivers)
+    names = sorted(values)
+    arrays = numpy.broadcast_arrays(*(numpy.atleast_1d(numpy.asarray(values[name], dtype=float))
+                                      for name in names))
+    if arrays[0].ndim != 1:
+        raise ValueError("Driver values must be scalars or 1D arrays of frames.")
+    return dict(zip(names, arrays))
+
+
+def axisRotations(axes, angles):
+    """
+    Row-vector rotation matrices about unit axes.
+
+    Args:
+        axes (ndarray): (..., 3) unit axes, or one axis broadcast over the angles.
+        angles (ndarray): (...) angles in radians.
+
+    Returns:
+        numpy.ndarray: (..., 3, 3) matrices M with v' = v @ M.
+    """
+    axes = numpy.asarray(axes, dtype=float)
+    angles = numpy.asarray(angles, dtype=float)
+    axes = numpy.broadcast_to(axes, angles.shape + (3,))
+    x, y, z = axes[..., 0], axes[..., 1], axes[..., 2]
+    cos, sin = numpy.cos(angles), numpy.sin(angles)
+    oneMinusCos = 1.0 - cos
+    # Transpose of the column-vector Rodrigues matrix
+    return numpy.stack([
+        numpy.stack([cos + x * x * oneMinusCos, x * y * oneMinusCos + z * sin, x * z * oneMinusCos - y * sin], -1),
+        numpy.stack([x * y * oneMinusCos - z * sin, cos + y * y * oneMinusCos, y * z * oneMinusCos + x * sin], -1),
+        numpy.stack([x * z * oneMinusCos + y * sin, y * z * oneMinusCos - x * sin, cos + z * z * oneMinusCos], -1),
+    ], -2)
+
+
+def eulerRotations(rotations):
+    """Row-vector matrices of (..., 3) XYZ Euler rotations in degrees, as Maya composes them."""
+    radians = numpy.radians(numpy.asarray(rotations, dtype=float))
+    matrices = [axisRotations(AXIS_VECTORS[axis], radians[..., index]) for index, axis in enumerate('xyz')]
+    return matrices[0] @ matrices[1] @ matrices[2]
+
+
+def chainProducts(localMatrices):
+    """
+    World matrices of a parent chain, local_i @ ... @ local_0 for every i, as a log-depth prefix product so
+    all joints of all frames are multiplied together in each step.
+
+    Args:
+        localMatrices (ndarray): (F, N, K, K) local matrices, each relative to the previous element.
+
+    Returns:
+        numpy.ndarray: (F, N, K, K) world matrices.
+    """
+    worlds = numpy.array(localMatrices, dtype=float)
+    shift = 1
+    while shift < worlds.shape[1]:
+        worlds[:, shift:] = worlds[:, shift:] @ worlds[:, :-shift]
+        shift *= 2
+    return worlds
+
+
+def solveJoints(spec, drivers, ctrlRotations=None, layout=None):
+    """
+    Solves the bind joint transforms of a tentacle rig over F frames.
+
+    Args:
+        spec (dict): Tentacle keyword arguments (jointCount, tentacleLength, isAutoMeasureLength,
+            primaryAxis, rollAxis), as in a batch spec.
+        drivers (dict): Driver attribute name (see DRIVER_DEFAULTS) to a scalar or an (F,) array of frames.
+        ctrlRotations (ndarray): Optional (F, N-1, 3) or (N-1, 3) FK ctrl rotations in degrees.
+        layout (RigLayout): The spec's layout, if already computed.
+
+    Returns:
+        numpy.ndarray: (F, N, 4, 4) world matrices of the bind joints in the driver control's space.
+    """
+    layout = layout or layoutFromSpec(spec)
+    values = driverArrays(drivers)
+    frameCount = len(values['Roll'])
+    jointCount = layout.jointCount
+    ctrlCount = layout.ctrlCount
+    primaryAxis = layout.axisVector
+    length = layout.tentacleLength
+    restPositions = layout.curvePositions
+
+    # FK chain: each ctrl group rotated by its roll angle, at its offset from the previous ctrl
+    angles = AutoRibbonMath.rollAngles(values['Roll'], values['Angle'], values['Falloff'], ctrlCount)
+    rotations = axisRotations(AXIS_VECTORS[spec.get('rollAxis', 'z')], numpy.radians(angles))
+    if ctrlRotations is not None:
+        fkRotations = numpy.broadcast_to(numpy.asarray(ctrlRotations, dtype=float), (frameCount, ctrlCount, 3))
+        rotations = eulerRotations(fkRotations) @ rotations
+    worldRotations = chainProducts(rotations)
+    # Each ctrl's rest offset from the previous one, turned by the previous ctrl's world rotation
+    offsets = numpy.diff(restPositions[:-1], axis=0, prepend=0.0)
+    parentRotations = numpy.concatenate([numpy.broadcast_to(numpy.identity(3), (frameCount, 1, 3, 3)),
+                                         worldRotations[:, :-1]], axis=1)
+    ctrlPositions = numpy.cumsum((offsets[:, None, :] @ parentRotations)[..., 0, :], axis=1)
+
+    # The last driver joint keeps its offset from the last ctrl
+    matrices = numpy.zeros((frameCount, jointCount, 4, 4))
+    matrices[:, :-1, :3, :3] = worldRotations
+    matrices[:, -1, :3, :3] = worldRotations[:, -1]
+    matrices[:, :-1, 3, :3] = ctrlPositions
+    matrices[:, -1, 3, :3] = ctrlPositions[:, -1] + (restPositions[-1] - restPositions[-2]) @ worldRotations[:, -1]
+    matrices[..., 3, 3] = 1.0
+
+    # Twist about the primary axis, blended from root to tip over the rest length
+    along = matrices[..., 3, :3] @ primaryAxis
+    blend = numpy.clip(along / length, 0.0, 1.0)
+    twist = values['EndTwist'][:, None] + (values['Twist'] - values['EndTwist'])[:, None] * blend
+    twistRotations = axisRotations(primaryAxis, numpy.radians(twist))
+    matrices[..., :3, :3] = matrices[..., :3, :3] @ twistRotations
+    matrices[..., 3, :3] = (matrices[..., 3, None, :3] @ twistRotations)[..., 0, :]
+
+    # Sine along the handle, from -1 at the root to 1 at the tip
+    halfLength = length / 2.0
+    t = (along - halfLength) / halfLength
+    inside = numpy.abs(t) <= 1.0
+    dropoff = numpy.where(inside, 1.0 - numpy.abs(t), 0.0)
+    wavelength = numpy.maximum(values['Wavelength'], 1e-6)[:, None]
+    phase = 2.0 * numpy.pi * (t / wavelength + values['Offset'][:, None])
+    amplitude = values['Amplitude'][:, None] * halfLength
+    offsets = amplitude * dropoff * numpy.sin(phase)
+    # Slope of the wave per unit of length, for the frame tilt
+    slopes = amplitude * numpy.where(inside, -numpy.sign(t) * numpy.sin(phase)
+                                     + dropoff * numpy.cos(phase) * 2.0 * numpy.pi / wavelength, 0.0) / halfLength
+    directions = numpy.asarray(AutoRibbonMath.SINE_DIRECTIONS[layout.primaryAxis], dtype=float) @ axisRotations(
+        primaryAxis, numpy.radians(values['SineRotation']))
+    tiltAxes = numpy.cross(primaryAxis, directions)
+    tilts = axisRotations(tiltAxes[:, None, :], numpy.arctan(slopes))
+    matrices[..., :3, :3] = matrices[..., :3, :3] @ tilts
+    matrices[..., 3, :3] += offsets[..., None] * directions[:, None, :]
+
+    # Ripple scales each joint's X axis
+    _, scales = AutoRibbonMath.rippleScales(values['Ripple'], values['RippleFrequency'], values['RippleAmplitude'],
+                                            values['RippleOffset'], values['RippleFalloff'], jointCount)
+    matrices[..., 0, :3] *= scales[..., None]
+    return matrices
@@ -0,0 +1,205 @@
+"""
+On-disk rig template cache of the Auto Ribbon Tool.
+
+A template is a finished rig exported without its model, as a Maya binary
+file, and the registry of the exported nodes as JSON. Its key hashes
+everything the rig graph depends on:
+
+- the build parameters and node names
+- the ribbon curve's CVs
+- the Maya version and the source of the tool modules
+
+Tentacle.buildRig with a templateCache looks its key up first. On a hit, the
+template is imported and the model is bound to its joints. This skips every
+build stage, so an import of a few hundred nodes replaces creating them one by
+one. On a miss, the rig is built as usual and then exported.
+
+Templates are evicted least recently used first once the folder grows past
+maxBytes. A hit refreshes the modification time of its files, and that is the
+only bookkeeping, so several processes can share one folder: scenes are
+exported to a temporary file and moved into place, the registry is written
+last, and eviction skips a template that another process used, stored or
+evicted since it listed the folder.
+
+This module has no Maya import.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy
+
+# The registry file marks a complete template, the scene file is written before it
+REGISTRY_EXTENSION = '.json'
+SCENE_EXTENSION = '.mb'
+# Subfolder of the scenes being exported, which the cache does not count until they are moved into place
+EXPORT_FOLDER = 'exporting'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def sourceDigest(paths):
+    """SHA-1 of the contents of source files, so templates of an older tool version are never hit."""
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def jsonValue(value):
+    """Converts NumPy arrays and scalars in a value to lists and Python numbers, for json.dumps."""
+    if isinstance(value, dict):
+        return {key: jsonValue(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonValue(item) for item in value]
+    if isinstance(value, (numpy.ndarray, numpy.generic)):
+        return value.tolist()
+    return value
+
+
+def templateKey(parts):
+    """
+    Args:
+        parts (dict): Everything the template depends on.
+
+    Returns:
+        str: The hex key of the template.
+    """
+    return hashlib.sha1(json.dumps(jsonValue(parts), sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class TemplateCache(object):
+    """
+    A folder of rig templates with least recently used eviction.
+
+    Args:
+        folder (str): Cache folder, created when missing.
+        maxBytes (int): Size above which the least recently used templates are deleted.
+    """
+
+    def __init__(self, folder, maxBytes=DEFAULT_MAX_BYTES):
+        if maxBytes <= 0:
+            raise ValueError("The template cache size must be positive.")
+        self.folder = folder
+        self.maxBytes = maxBytes
+
+    def registryPath(self, key):
+        return os.path.join(self.folder, key + REGISTRY_EXTENSION)
+
+    def scenePath(self, key):
+        return os.path.join(self.folder, key + SCENE_EXTENSION)
+
+    def exportPath(self, key):
+        """
+        A new temporary file to export the rig of `key` to, creating the cache folder for it. store moves it
+        into place, so no reader sees a scene that is still being written.
+        """
+        folder = os.path.join(self.folder, EXPORT_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        handle, path = tempfile.mkstemp(prefix=key + '_', suffix=SCENE_EXTENSION, dir=folder)
+        os.close(handle)
+        return path
+
+    def contains(self, key):
+        return os.path.isfile(self.registryPath(key)) and os.path.isfile(self.scenePath(key))
+
+    def load(self, key):
+        """
+        Returns:
+            dict: The template stored under `key` with its registry and the path of its scene, or None on a miss.
+        """
+        if not self.contains(key):
+            return None
+        try:
+            with open(self.registryPath(key)) as handle:
+                template = json.load(handle)
+            for path in (self.registryPath(key), self.scenePath(key)):
+                os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            # Evicted by another process meanwhile, or half written by an older version
+            return None
+        template['scene'] = self.scenePath(key)
+        return template
+
+    def store(self, key, template, scene):
+        """
+        Completes a template: moves its scene, exported to an exportPath file, into place, then writes its
+        registry, each in one step so readers never see them half written, then evicts what no longer fits.
+        """
+        os.replace(scene, self.scenePath(key))
+        handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=self.folder)
+        with os.fdopen(handle, 'w') as stream:
+            json.dump(jsonValue(template), stream)
+        os.replace(temporary, self.registryPath(key))
+        self.evict()
+
+    def entries(self):
+        """
+        Returns:
+            list: (last use, size in bytes, key) of every template, least recently used first.
+        """
+        if not os.path.isdir(self.folder):
+            return []
+        used = {}
+        sizes = {}
+        for name in os.listdir(self.folder):
+            key, extension = os.path.splitext(name)
+            if extension not in (REGISTRY_EXTENSION, SCENE_EXTENSION):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            used[key] = max(used.get(key, 0.0), stat.st_mtime)
+            sizes[key] = sizes.get(key, 0) + stat.st_size
+        return sorted((used[key], sizes[key], key) for key in used)
+
+    def lastUse(self, key):
+        """
+        Returns:
+            float: The latest modification time of the files of `key`, or None once none of them exists.
+        """
+        times = []
+        for path in (self.registryPath(key), self.scenePath(key)):
+            try:
+                times.append(os.stat(path).st_mtime)
+            except OSError:
+                pass
+        return max(times) if times else None
+
+    def remove(self, key):
+        for extension in (REGISTRY_EXTENSION, SCENE_EXTENSION):
+            try:
+                os.remove(os.path.join(self.folder, key + extension))
+            except OSError:
+                # Another process evicted it first
+                pass
+
+    def evict(self):
+        """
+        Deletes the least recently used templates until the cache fits in maxBytes. Templates another process
+        evicted meanwhile are skipped, and so are those it used or stored again since the folder was listed.
+
+        Returns:
+            list: The keys of the deleted templates.
+        """
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries)
+        deleted = []
+        for used, entrySize, key in entries:
+            if size <= self.maxBytes:
+                break
+            lastUse = self.lastUse(key)
+            if lastUse is not None and lastUse > used:
+                continue
+            if lastUse is not None:
+                self.remove(key)
+                deleted.append(key)
+            size -= entrySize
+        return deleted
+
+    def clear(self):
+        for _, _, key in self.entries():
+            self.remove(key)
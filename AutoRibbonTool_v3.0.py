@@ -1,24 +1,146 @@
+import importlib.util
+import json
 import os
-from PySide6 import QtCore, QtGui, QtWidgets, QtUiTools
-from PySide6.QtCore import QFile
+import sys
+import time
+
+# String attribute on the driver control holding the node UUIDs of the rig by role
+MANIFEST_ATTR = 'autoRibbonManifest'
+
+# Tentacle arguments stored in the manifest, so updateRig knows what the rig was built with
+BUILD_PARAMETERS = ('jointCount', 'tentacleLength', 'isAutoMeasureLength', 'primaryAxis', 'secondaryAxis', 'rollAxis',
+                    'model', 'attachMode', 'rollMode', 'rippleMode', 'skinMode', 'maxInfluences', 'skinFalloff',
+                    'deformerMode', 'wiringMode', 'ribbonMode', 'ribbonBlend', 'surfaceSpans', 'surfaceTolerance',
+                    'samplingMode', 'lodSwitch', 'weightMode', 'shapeMode')
+
+# Registry roles with one node per joint or per FK ctrl, in chain order. updateRig adds and removes their tails.
+JOINT_SEGMENT_ROLES = ('follicles', 'follicleShapes', 'jointConstraints', 'jointMatrices', 'jointZeroGroups', 'joints',
+                       'drvJoints', 'drvJointMatrices', 'rippleRemaps', 'rippleInAdds', 'rippleOutAdds', 'rippleClamps',
+                       'rippleBlends')
+CTRL_SEGMENT_ROLES = ('fkCtrlGroups', 'fkCtrls', 'rollRemaps', 'rollStartAdds', 'rollStartClamps', 'rollWeightMults',
+                      'rollAngleMults')
+# Segment roles whose nodes go away with their parent's, so updateRig does not delete them itself
+NESTED_SEGMENT_ROLES = ('follicleShapes', 'jointConstraints', 'joints', 'fkCtrls')
+# Registry roles of the DG network that drives the bind joints, frozen or deleted by loadCache
+NETWORK_ROLES = ('uvPin', 'follicleShapes', 'jointMatrices', 'drvJointMatrices', 'ribbonSkinClusters', 'ribbonDrivers',
+                 'deformers', 'rollNodes', 'rippleNodes', 'rollRemaps', 'rollStartAdds', 'rollStartClamps',
+                 'rollWeightMults', 'rollAngleMults', 'rippleRemaps', 'rippleInAdds', 'rippleOutAdds', 'rippleClamps',
+                 'rippleBlends', 'lodNodes')
+# Build stage that creates the nodes of each registry role, for costReport
+STAGE_ROLES = {
+    'setUpTentacleFK': ('drvCtrl', 'surface', 'ribbonGroup', 'jointGroup', 'joints', 'jointZeroGroups', 'drvJoints',
+                        'drvJointMatrices', 'fkCtrls', 'fkCtrlGroups', 'follicleGroup', 'follicles', 'follicleShapes',
+                        'jointConstraints', 'jointMatrices', 'uvPin', 'ribbonSkinClusters', 'ribbonDrivers',
+                        'skinClusters', 'bindJointSet'),
+    'tentacleRoll': ('rollNodes', 'rollWeights', 'rollRemaps', 'rollStartAdds', 'rollStartClamps', 'rollWeightMults',
+                     'rollAngleMults'),
+    'tentacleRipple': ('rippleNodes', 'rippleRemaps', 'rippleInAdds', 'rippleOutAdds', 'rippleClamps', 'rippleBlends'),
+    'tentacleRibbonDeformer': ('endDrvCtrl', 'endDrvCtrlGroup', 'deformers', 'deformerGroup'),
+    'tentacleLod': ('lodNodes',),
+}
+# Registry roles and build parameters of the model binding, which rig templates leave out
+MODEL_ROLES = ('skinClusters', 'bindJointSet')
+MODEL_PARAMETERS = ('model', 'skinMode', 'maxInfluences', 'skinFalloff')
+# Top groups of the rig, deleted by loadCache once the bind joints are moved out
+RIG_GROUP_ROLES = ('drvCtrl', 'jointGroup', 'follicleGroup', 'ribbonGroup')
+# Registry roles of the joint cache nodes loadCache adds
+CACHE_ROLES = ('cacheReader', 'cacheGroup')
+LOAD_CACHE_MODES = ('disable', 'delete')
+# Levels of the driver control's LOD enum, and the registry roles each level above Full turns off on top of the
+# previous ones. Deformers are turned off through their envelope, all other nodes through nodeState.
+LOD_LEVELS = ('Full', 'NoRipple', 'FKOnly', 'Frozen')
+LOD_ROLES = (('rippleNodes', 'rippleRemaps', 'rippleInAdds', 'rippleOutAdds', 'rippleClamps', 'rippleBlends'),
+             ('rollNodes', 'rollRemaps', 'rollStartAdds', 'rollStartClamps', 'rollWeightMults', 'rollAngleMults',
+              'deformers'),
+             ('uvPin', 'follicleShapes', 'jointConstraints', 'jointMatrices', 'drvJointMatrices', 'skinClusters',
+              'ribbonDrivers'))
+
+# Object name of the tool window, used to find and reuse it
+WINDOW_NAME = 'autoRibbonToolWindow'
+
+
+def lazyImport(name):
+    """
+    Returns module `name`, imported on first attribute access unless it is loaded already.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named '{}'".format(name))
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Only what showWindow needs is loaded when the tool is imported, the rest on first use by a build
+cmds = lazyImport('maya.cmds')
+numpy = lazyImport('numpy')
+AutoRibbonCache = lazyImport('AutoRibbonCache')
+AutoRibbonLayout = lazyImport('AutoRibbonLayout')
+AutoRibbonMath = lazyImport('AutoRibbonMath')
+AutoRibbonPlan = lazyImport('AutoRibbonPlan')
+AutoRibbonReport = lazyImport('AutoRibbonReport')
+AutoRibbonShapes = lazyImport('AutoRibbonShapes')
+AutoRibbonTemplates = lazyImport('AutoRibbonTemplates')
+
+
+def showWindow():
+    """
+    Shows the tool window. It is created on first use and reused afterwards, also when this script is run again.
+
+    Returns:
+        QMainWindow: The window.
+    """
+    from PySide6 import QtWidgets
+
+    for widget in QtWidgets.QApplication.topLevelWidgets():
+        if widget.objectName() == WINDOW_NAME:
+            window = widget
+            break
+    else:
+        window = MainWindow(mayaMainWindow()).window
+    window.show()
+    window.raise_()
+    window.activateWindow()
+    return window
+
 
-uiFilePath = os.path.join(os.path.expanduser("~"), "Documents", "maya", "scripts", "Ultimate_Ribbon_Rig_Generator_v2.ui")
+def mayaMainWindow():
+    """The Maya main window as a QWidget, parent of the tool window so Qt keeps it alive."""
+    import maya.OpenMayaUI as omui
+    from PySide6 import QtWidgets
+    from shiboken6 import wrapInstance
+
+    pointer = omui.MQtUtil.mainWindow()
+    return wrapInstance(int(pointer), QtWidgets.QWidget) if pointer else None
 
-def loadUi(uiFilePath):
-    uiFile = QtCore.QFile(uiFilePath)
-    uiFile.open(QtCore.QFile.ReadOnly)
-    uiWindow = QtUiTools.QUiLoader().load(uiFile)
-    uiFile.close()
-    return uiWindow
 
 class MainWindow():
     def __init__(self, parent=None):
-        self.ui = loadUi(uiFilePath)
-        self.ui.show()
+        # The precompiled form (pyside6-uic Ultimate_Ribbon_Rig_Generator_v2.ui -o AutoRibbonUi.py) needs no
+        # .ui parsing or file access at startup
+        from PySide6 import QtWidgets
+        from AutoRibbonUi import Ui_MainWindow
+
+        self.window = QtWidgets.QMainWindow(parent)
+        self.ui = Ui_MainWindow()
+        self.ui.setupUi(self.window)
+        self.window.setObjectName(WINDOW_NAME)
+        # The window keeps its MainWindow alive for the connected slots
+        self.window.autoRibbonTool = self
 
         #Button
         self.ui.Button_Curve.clicked.connect(self.uiCreateRibbonCurve)
         self.ui.Button_RibbonRig.clicked.connect(self.uiCreateRibbonRig)
+        self.ui.Button_CancelRibbonRig.clicked.connect(self.uiCancelRibbonRig)
+        self.ui.Button_DeleteRibbonRig.clicked.connect(self.uiDeleteRibbonRig)
+
+        # The ChunkedBuild in progress
+        self.build = None
 
         #Values
         self.uiJointCount = self.ui.Slider_JointCount.value()
@@ -57,23 +179,84 @@ class MainWindow():
         rollAxis='x',
         drvCtrl="CTRL_M_TentacleDrv_001"
     )
-        tentacle.setUpTentacleFK()
-        tentacle.tentacleRoll()
-        tentacle.tentacleRipple()
-        tentacle.tentacleRibbonDeformer()
-        
+        if cmds.objExists(tentacle.drvCtrl) and cmds.attributeQuery(MANIFEST_ATTR, node=tentacle.drvCtrl, exists=True):
+            # The rig exists already, only the changed segments are rebuilt
+            tentacle.updateRig()
+        else:
+            # Built a chunk at a time through the event loop, so the UI stays responsive and can cancel
+            self.build = ChunkedBuild(tentacle)
+            self.ui.ProgressBar_RibbonRig.setRange(0, self.build.total)
+            self.ui.ProgressBar_RibbonRig.setValue(0)
+            self.ui.Button_RibbonRig.setEnabled(False)
+            self.ui.Button_CancelRibbonRig.setEnabled(True)
+            self.uiBuildStep()
+
+    def uiBuildStep(self):
+        """Builds the next chunk of the rig, then schedules the one after it."""
+        from PySide6 import QtCore
+
+        if self.build is None:
+            return
+        running = self.build.step()
+        self.ui.ProgressBar_RibbonRig.setValue(self.build.done)
+        if running:
+            QtCore.QTimer.singleShot(0, self.uiBuildStep)
+        else:
+            self.uiEndBuild()
+
+    def uiCancelRibbonRig(self):
+        if self.build is not None:
+            self.build.cancel()
+            self.uiEndBuild()
+
+    def uiDeleteRibbonRig(self):
+        tentacle = Tentacle(
+        modelName="tentacle",
+        jointCount=self.uiJointCount,
+        tentacleLength=self.uiTentacleLength,
+        isAutoMeasureLength=True,
+        primaryAxis='y',
+        secondaryAxis='z',
+        rollAxis='x',
+        drvCtrl="CTRL_M_TentacleDrv_001"
+    )
+        if not (cmds.objExists(tentacle.drvCtrl)
+                and cmds.attributeQuery(MANIFEST_ATTR, node=tentacle.drvCtrl, exists=True)):
+            cmds.warning("There is no ribbon rig to delete.")
+            return
+        # The ribbon curve is kept for the next build
+        tentacle.deleteRig()
+        self.window.statusBar().showMessage("Ribbon rig deleted.")
+
+    def uiEndBuild(self):
+        build, self.build = self.build, None
+        self.ui.Button_RibbonRig.setEnabled(True)
+        self.ui.Button_CancelRibbonRig.setEnabled(False)
+        if build.state == 'finished':
+            message = "Ribbon rig built."
+        else:
+            self.ui.ProgressBar_RibbonRig.setValue(0)
+            message = "Ribbon rig build cancelled and rolled back." if build.state == 'cancelled' else \
+                "Ribbon rig build failed and was rolled back: {}".format(build.error)
+            cmds.warning(message)
+        self.window.statusBar().showMessage(message)
+
 
-if __name__ == "__main__":
-    mainWindow = MainWindow()
 
-import maya.cmds as cmds
 class Tentacle:
 
     def __init__(self, modelName, jointCount, tentacleLength, isAutoMeasureLength, primaryAxis='y', secondaryAxis='x', rollAxis='z',
                  axisVector=(0, 1, 0), CTRL_COLOR={'l': 18, 'm': 14, 'r': 20}, 
                  ribbonCurve="crv_ribbon", surface='surface_ribbon', 
                  drvCtrl="CTRL_M_TentacleDrv_001",
-                 model="tentacle"):
+                 model="tentacle", buildMode='cmds', backend=None, rollMode='network',
+                 rippleMode='network', attachMode='follicle', skinMode='default', maxInfluences=2,
+                 skinFalloff=1.0, deformerMode='nonLinear', wiringMode='constraint', ribbonMode='skin',
+                 ribbonBlend=0.0, surfaceSpans=None, surfaceTolerance=0.1, samplingMode='axis', lodSwitch=False,
+                 weightMode='local', shapeMode='unique', templateCache=None, prefix='', layout=None):
+        # Prepended to every node name the tentacle creates, so several tentacles can share a scene
+        self.prefix = prefix
+
         self.modelName = modelName
         self.jointCount = jointCount
         self.tentacleLength = tentacleLength
@@ -85,41 +268,835 @@ class Tentacle:
         self.axisVector = axisVector
         self.CTRL_COLOR = CTRL_COLOR
 
-        self.ribbonCurve = ribbonCurve
-        self.surface = surface
+        self.ribbonCurve = self.prefixed(ribbonCurve)
+        self.surface = self.prefixed(surface)
 
-        self.drvCtrl = drvCtrl
+        self.drvCtrl = self.prefixed(drvCtrl)
 
         self.model = model
 
+        # 'cmds' builds stage by stage through maya.cmds, 'plan' commits one BuildPlan through `backend`
+        self.buildMode = buildMode
+        self.backend = backend
+        # 'network' builds the MASH + per-control utility nodes, 'solver' one autoRibbonRollSolver node
+        self.rollMode = rollMode
+        # 'network' builds the expression, MASH and per-joint nodes, 'solver' one autoRibbonRippleSolver node
+        self.rippleMode = rippleMode
+        # 'follicle' attaches each joint with its own follicle, 'uvPin' pins all joints with one uvPin node
+        self.attachMode = attachMode
+        # 'default' lets Maya bind the model, 'computed' writes chain-projected weights capped to maxInfluences;
+        # skinFalloff is the weight falloff distance in joint spacings
+        self.skinMode = skinMode
+        self.maxInfluences = maxInfluences
+        self.skinFalloff = skinFalloff
+        # 'nonLinear' deforms the ribbon with a twist and a sine deformer, 'fused' with one autoRibbonTwistSine node
+        self.deformerMode = deformerMode
+        # 'constraint' drives bind and driver joints with constraints, 'matrix' with one multMatrix each into
+        # their offsetParentMatrix, and places nodes without temporary constraints
+        self.wiringMode = wiringMode
+        # 'skin' binds the driver joints to the ribbon with a skinCluster, 'direct' moves each CV row with its
+        # driver joint through one autoRibbonCvDrive node; ribbonBlend is the weight of each neighbouring row
+        self.ribbonMode = ribbonMode
+        self.ribbonBlend = ribbonBlend
+        # None lofts the ribbon curve as is, one span per joint; a number refits it with that many cubic spans and
+        # 'auto' with the fewest spans that keep within surfaceTolerance of it, whatever the joint count
+        self.surfaceSpans = surfaceSpans
+        self.surfaceTolerance = surfaceTolerance
+        # 'axis' spaces the joints along the primary axis and the follicles evenly in V, 'arcLength' places both
+        # at equal arc lengths along the ribbon curve as edited
+        self.samplingMode = samplingMode
+        # Adds the LOD enum to the driver control, see tentacleLod
+        self.lodSwitch = lodSwitch
+        # 'local' builds the roll and ripple MASH weight nodes per tentacle, 'shared' reads the constant roll
+        # weights from one network per ctrl count shared by all tentacles, see sharedRollWeights
+        self.weightMode = weightMode
+        # 'unique' gives every FK ctrl its own curve shape, 'shared' instances one shape per ctrl kind (square or
+        # circle) under all ctrls of that kind, see planCtrlShape
+        self.shapeMode = shapeMode
+        # TemplateCache, or its folder, that buildRig imports finished rigs from instead of building them
+        if isinstance(templateCache, str):
+            templateCache = AutoRibbonTemplates.TemplateCache(templateCache)
+        self.templateCache = templateCache
+
         if self.primaryAxis not in ['x', 'y', 'z'] or self.secondaryAxis not in ['x', 'y', 'z']:
             cmds.error("Axes must be 'x', 'y', or 'z'.")
         if self.primaryAxis == self.secondaryAxis:
             cmds.error("Primary axis and secondary axis must be different.")
+        if self.buildMode not in ['cmds', 'plan']:
+            cmds.error("Build mode must be 'cmds' or 'plan'.")
+        if self.rollMode not in ['network', 'solver']:
+            cmds.error("Roll mode must be 'network' or 'solver'.")
+        if self.rippleMode not in ['network', 'solver']:
+            cmds.error("Ripple mode must be 'network' or 'solver'.")
+        if self.attachMode not in ['follicle', 'uvPin']:
+            cmds.error("Attach mode must be 'follicle' or 'uvPin'.")
+        if self.skinMode not in ['default', 'computed']:
+            cmds.error("Skin mode must be 'default' or 'computed'.")
+        if self.deformerMode not in ['nonLinear', 'fused']:
+            cmds.error("Deformer mode must be 'nonLinear' or 'fused'.")
+        if self.wiringMode not in ['constraint', 'matrix']:
+            cmds.error("Wiring mode must be 'constraint' or 'matrix'.")
+        if self.ribbonMode not in ['skin', 'direct']:
+            cmds.error("Ribbon mode must be 'skin' or 'direct'.")
+        if not 0.0 <= self.ribbonBlend <= 0.5:
+            cmds.error("Ribbon blend must be between 0 and 0.5.")
+        if self.surfaceSpans not in (None, 'auto') and not (isinstance(self.surfaceSpans, int)
+                                                             and self.surfaceSpans > 0):
+            cmds.error("Surface spans must be None, 'auto' or a positive number.")
+        if self.surfaceTolerance <= 0.0:
+            cmds.error("Surface tolerance must be positive.")
+        if self.samplingMode not in ['axis', 'arcLength']:
+            cmds.error("Sampling mode must be 'axis' or 'arcLength'.")
+        if self.weightMode not in ['local', 'shared']:
+            cmds.error("Weight mode must be 'local' or 'shared'.")
+        if self.shapeMode not in ['unique', 'shared']:
+            cmds.error("Shape mode must be 'unique' or 'shared'.")
+        if self.skinMode == 'computed' and not 2 <= self.maxInfluences <= 4:
+            cmds.error("Max influences must be between 2 and 4.")
+
+        # Positions, UVs, ctrl sizes and weight windows, computed once for all stages (or passed in precomputed)
+        if layout is None:
+            layout = AutoRibbonLayout.RigLayout(self.jointCount, self.tentacleLength, self.isAutoMeasureLength,
+                                                self.primaryAxis)
+        elif layout.jointCount != self.jointCount or layout.primaryAxis != self.primaryAxis:
+            cmds.error("The layout was computed for a different tentacle.")
+        self.layout = layout
+
+        # Created nodes by role ('joints', 'fkCtrls', ...), consumed by the later stages
+        self.registry = {}
+
+    def prefixed(self, name):
+        return self.prefix + name
+
+    def register(self, **roles):
+        """Records created nodes by role, in chain order, for the later stages."""
+        self.registry.update((role, list(nodes)) for role, nodes in roles.items())
+
+    def registered(self, role):
+        """
+        Nodes of a role from this session's registry, or from the manifest on the driver control when the
+        rig was built in an earlier session.
+
+        Returns:
+            list: Node names in chain order.
+        """
+        if role not in self.registry:
+            self.loadManifest()
+        if role not in self.registry:
+            cmds.error("No '{}' nodes are registered for {}.".format(role, self.drvCtrl))
+        return self.registry[role]
+
+    def storeManifest(self):
+        """
+        Stores the registry as node UUIDs on the driver control, together with the build parameters, so it
+        survives renames and scene reloads.
+        """
+        manifest = {'parameters': {name: getattr(self, name) for name in BUILD_PARAMETERS},
+                    'nodes': {role: cmds.ls(nodes, uuid=True) for role, nodes in self.registry.items()}}
+        if not cmds.attributeQuery(MANIFEST_ATTR, node=self.drvCtrl, exists=True):
+            cmds.addAttr(self.drvCtrl, longName=MANIFEST_ATTR, dataType='string')
+        cmds.setAttr(self.drvCtrl + '.' + MANIFEST_ATTR, json.dumps(manifest), type='string')
+
+    def extendManifest(self, **roles):
+        """Registers the nodes of a later stage and adds them to the manifest of the rig, if it has one."""
+        hasManifest = cmds.attributeQuery(MANIFEST_ATTR, node=self.drvCtrl, exists=True)
+        if hasManifest and 'drvCtrl' not in self.registry:
+            self.loadManifest()
+        self.register(**roles)
+        if hasManifest:
+            self.storeManifest()
+
+    def readManifest(self):
+        """
+        Returns:
+            dict: The manifest on the driver control, with 'parameters' and 'nodes' (UUIDs by role).
+        """
+        if not cmds.objExists(self.drvCtrl) or not cmds.attributeQuery(MANIFEST_ATTR, node=self.drvCtrl, exists=True):
+            cmds.error("{} has no build manifest.".format(self.drvCtrl))
+        return json.loads(cmds.getAttr(self.drvCtrl + '.' + MANIFEST_ATTR))
+
+    def loadManifest(self, strict=True):
+        """
+        Resolves the registry from the manifest on the driver control, one UUID lookup per node.
+
+        Args:
+            strict (bool): Fail when nodes of the rig were deleted, instead of leaving them out.
+
+        Returns:
+            dict: The registry.
+        """
+        for role, uuids in self.readManifest()['nodes'].items():
+            nodes = [cmds.ls(uuid) for uuid in uuids]
+            if strict and not all(nodes):
+                cmds.error("Some '{}' nodes of {} were deleted.".format(role, self.drvCtrl))
+            self.registry[role] = [node[0] for node in nodes if node]
+        return self.registry
+
+    def buildRig(self):
+        self.checkBuild()
+        runSteps(self.buildSteps())
+
+    def buildSteps(self):
+        """
+        buildRig as a generator that yields after every joint, ctrl and network segment and every other stage,
+        buildSize times in all, so ChunkedBuild can spread the build over the event loop.
+        """
+        key = self.templateKey()
+        template = key and self.templateCache.load(key)
+        if template:
+            self.importTemplate(template)
+            yield
+            return
+        if self.buildMode == 'plan':
+            # The plan is committed in one batch, so it is a single step
+            self.buildPlanned()
+            yield
+        else:
+            yield from self.setUpTentacleFKSteps()
+            yield from self.tentacleRollSteps()
+            yield from self.tentacleRippleSteps()
+        self.tentacleRibbonDeformer()
+        yield
+        if self.lodSwitch:
+            self.tentacleLod()
+            yield
+        if key:
+            self.exportTemplate(key)
+
+    def buildSize(self):
+        """
+        Returns:
+            int: The number of steps buildSteps yields.
+        """
+        key = self.templateKey()
+        if key and self.templateCache.contains(key):
+            return 1
+        size = 2 if self.lodSwitch else 1
+        if self.buildMode == 'plan':
+            return size + 1
+        size += self.layout.jointCount + self.layout.ctrlCount
+        if self.rollMode == 'network':
+            size += self.layout.ctrlCount
+        if self.rippleMode == 'network':
+            size += self.layout.jointCount
+        return size
+
+    def validateBuild(self, existing=None):
+        """
+        Checks the scene for what would stop buildRig midway, before anything is created: a missing ribbon curve
+        or model, and every node name the build creates that is taken already.
+
+        Args:
+            existing (set): Node names of the scene, from sceneNames, to share one snapshot between tentacles.
+
+        Returns:
+            list: The problems, empty when the rig can be built.
+        """
+        existing = sceneNames() if existing is None else existing
+        problems = ["The {} {} does not exist.".format(kind, name)
+                    for kind, name in (('ribbon curve', self.ribbonCurve), ('model', self.model))
+                    if name not in existing]
+        problems += ["A node named {} exists already.".format(name) for name in self.buildNames() if name in existing]
+        return problems
+
+    def checkBuild(self, existing=None):
+        """Fails with every problem validateBuild finds, if any."""
+        problems = self.validateBuild(existing)
+        if problems:
+            cmds.error("{} cannot be built:\n{}".format(self.drvCtrl, '\n'.join(problems)))
+
+    def buildNames(self):
+        """
+        Returns:
+            list: The names of the nodes buildRig creates, as planned for the FK, roll and ripple stages, which
+                the cmds build names alike, and as the other stages name them. Nodes that Maya names itself
+                are left out.
+        """
+        # Planning registers the planned nodes, which are not built yet
+        registry = self.registry
+        self.registry = {}
+        try:
+            names = self.buildPlan()[0].nodeNames()
+        finally:
+            self.registry = registry
+        names += [self.prefixed("ribbon_Group"), self.surface, self.surface + 'Shape', self.prefixed("bindJointSet"),
+                  self.prefixed("modelSkinCluster"),
+                  self.prefixed("ribbonSurfaceSkinCluster" if self.ribbonMode == 'skin' else "ribbonSurfaceCvDrive")]
+        endDrvCtrl = self.prefixed("CTRL_M_TentacleDrv_End_001")
+        names += [endDrvCtrl, endDrvCtrl + 'Shape', endDrvCtrl + '_grp']
+        if self.deformerMode == 'fused':
+            names.append(self.surface.replace('surface', 'twistSine'))
+        else:
+            names.append(self.prefixed(f"{self.modelName}_nodeGroup"))
+            for deformer in ('twist', 'sine'):
+                name = self.surface.replace('surface', deformer)
+                names += [name, name + 'Handle', name + 'HandleShape']
+        if self.lodSwitch:
+            names += [self.prefixed('condition_m_tentacleLod_{:03d}'.format(level))
+                      for level in range(1, len(LOD_LEVELS))]
+        return names
+
+    def templateKey(self):
+        """
+        Returns:
+            str: The template cache key of this rig, from its build parameters, node names and ribbon curve and the
+                Maya and tool versions, or None when it is not cached.
+        """
+        # A rig connected to shared weight networks cannot be imported on its own
+        if not self.templateCache or self.weightMode == 'shared' or not cmds.objExists(self.ribbonCurve):
+            return None
+        curveShape = cmds.listRelatives(self.ribbonCurve, shapes=True)[0]
+        # The node plug-in is hashed by path, importing it outside Maya fails
+        sources = [__file__, AutoRibbonLayout.__file__, AutoRibbonMath.__file__, AutoRibbonPlan.__file__,
+                   AutoRibbonShapes.__file__, AutoRibbonTemplates.__file__, AutoRibbonPlan.NODES_PLUGIN]
+        return AutoRibbonTemplates.templateKey({
+            'version': AutoRibbonTemplates.sourceDigest(sources),
+            'maya': cmds.about(version=True),
+            'buildMode': self.buildMode,
+            # The model is bound anew after the import, so the parameters of its skinCluster do not matter
+            'parameters': {name: getattr(self, name) for name in BUILD_PARAMETERS if name not in MODEL_PARAMETERS},
+            'names': [self.prefix, self.modelName, self.drvCtrl, self.ribbonCurve, self.surface, self.CTRL_COLOR],
+            'curve': [cmds.getAttr(self.ribbonCurve + '.cv[*]'), cmds.getAttr(curveShape + '.degree'),
+                      cmds.getAttr(curveShape + '.spans')]})
+
+    def exportTemplate(self, key):
+        """Exports the built rig without the model's skinCluster to the template cache."""
+        registry = {role: nodes for role, nodes in self.registry.items() if role not in MODEL_ROLES}
+        cmds.select([node for nodes in registry.values() for node in nodes], noExpand=True)
+        # The history takes along every utility node that drives the exported ones
+        scene = self.templateCache.exportPath(key)
+        try:
+            cmds.file(scene, force=True, exportSelected=True, type='mayaBinary', constructionHistory=True,
+                      channels=True, constraints=True, expressions=True, shader=False, preserveReferences=False)
+            self.templateCache.store(key, {'registry': registry}, scene)
+        finally:
+            cmds.select(clear=True)
+            if os.path.exists(scene):
+                os.remove(scene)
+
+    def importTemplate(self, template):
+        """
+        Imports a cached rig in place of the ribbon curve it was built from and binds the model to it.
+
+        Args:
+            template (dict): TemplateCache.load output.
+        """
+        cmds.undoInfo(openChunk=True, chunkName='autoRibbonBuild')
+        try:
+            # The template holds a copy of the ribbon curve, equal to this one as it is part of the key
+            cmds.delete(self.ribbonCurve)
+            cmds.file(template['scene'], i=True, type='mayaBinary', preserveReferences=True)
+            self.registry.update(template['registry'])
+            skinClusters = self.bindModel(self.registry['joints'])
+            self.register(skinClusters=self.registry.get('ribbonSkinClusters', []) + skinClusters)
+            if 'lodNodes' in self.registry:
+                self.gateLodNodes(skipGated=True)
+            cmds.select(clear=True)
+            self.storeManifest()
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+    def updateRig(self, jointCount=None, tentacleLength=None):
+        """
+        Updates a built rig to a new joint count and tentacle length in place instead of rebuilding it.
+
+        Only the segments past the shorter of the old and new chain are created or deleted; the kept
+        segments get their new UVs, weight windows and ctrl sizes. The ribbon surface, the driver control
+        with its attributes and the deformers are kept, so a length change resizes the controls like a
+        rebuild on the same ribbon curve would. All other arguments are the ones the rig was built with.
+        The rig has to be in its bind pose.
+
+        Args:
+            jointCount (int): New joint count, defaults to this Tentacle's.
+            tentacleLength (float): New tentacle length, defaults to this Tentacle's.
+
+        Returns:
+            dict: The updated registry.
+        """
+        built = self.readManifest()['parameters']
+        if 'drvCtrl' not in self.registry:
+            self.loadManifest()
+        for name in BUILD_PARAMETERS:
+            if name not in ('jointCount', 'tentacleLength'):
+                # Rigs built before a parameter existed were built with its default
+                setattr(self, name, built.get(name, getattr(self, name)))
+        self.jointCount = jointCount or self.jointCount
+        self.tentacleLength = tentacleLength or self.tentacleLength
+        self.axisVector = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}[self.primaryAxis]
+        oldLayout = AutoRibbonLayout.RigLayout(built['jointCount'], built['tentacleLength'], self.isAutoMeasureLength,
+                                               self.primaryAxis)
+        self.layout = AutoRibbonLayout.RigLayout(self.jointCount, self.tentacleLength, self.isAutoMeasureLength,
+                                                 self.primaryAxis)
+        if self.samplingMode == 'arcLength':
+            self.sampleRibbonCurve()
+
+        cmds.undoInfo(openChunk=True, chunkName='autoRibbonUpdate')
+        try:
+            self.unbindRibbon()
+            self.trimSegments()
+            self.updateJointSegments(oldLayout.jointCount)
+            self.updateCtrlSegments(oldLayout)
+            if 'rollNodes' in self.registry:
+                self.updateRoll(oldLayout.ctrlCount)
+            if 'rippleNodes' in self.registry:
+                self.updateRipple(oldLayout.jointCount)
+            self.bindRibbon(self.registry['drvJoints'], self.registry['joints'])
+            if 'lodNodes' in self.registry:
+                self.gateLodNodes(skipGated=True)
+            self.storeManifest()
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        return self.registry
+
+    def deleteRig(self, keepCurve=True):
+        """
+        Deletes the rig of this Tentacle's driver control, built in this session or an earlier one, in one
+        delete call: every registered node with the shapes, constraints and history below it (see nodeStages)
+        and the joint cache nodes. The model is unbound first, which restores its geometry from before the
+        bind, and a shared roll weight network is only deleted once no other tentacle reads it. Nodes of the
+        rig deleted by hand are skipped.
+
+        Args:
+            keepCurve (bool): Move the ribbon curve out of the rig and show it, ready for the next build,
+                instead of deleting it along.
+
+        Returns:
+            int: The number of nodes deleted, not counting the children deleted along with them.
+        """
+        if not self.registry:
+            self.loadManifest(strict=False)
+        cmds.undoInfo(openChunk=True, chunkName='autoRibbonDelete')
+        try:
+            self.unbindRibbon()
+            if keepCurve:
+                self.releaseRibbonCurve()
+            shared = self.registry.get('rollWeights', [])
+            nodes = [node for node in self.nodeStages() if node not in shared]
+            nodes = cmds.ls(nodes + [node for role in CACHE_ROLES for node in self.registry.get(role, [])])
+            if nodes:
+                cmds.delete(nodes)
+            if shared:
+                releaseSharedNodes(shared)
+            self.registry = {}
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        return len(nodes)
+
+    def releaseRibbonCurve(self):
+        """Moves the ribbon curve out of the ribbon group to where createRibbonCurve left it, and shows it."""
+        if not cmds.objExists(self.ribbonCurve) or not cmds.listRelatives(self.ribbonCurve, parent=True):
+            return
+        cmds.parent(self.ribbonCurve, world=True)
+        cmds.setAttr(self.ribbonCurve + '.translate{}'.format(self.secondaryAxis.upper()), 0)
+        cmds.setAttr(self.ribbonCurve + '.visibility', 1)
+
+    def bakeCache(self, path, startFrame=None, endFrame=None, step=1.0):
+        """
+        Samples the world matrices of the bind joints over a frame range and writes them as a joint cache.
+
+        Args:
+            path (str): .npz file to write.
+            startFrame (float): First frame, defaults to the playback range's start.
+            endFrame (float): Last frame, defaults to the playback range's end.
+            step (float): Frames between samples.
+
+        Returns:
+            str: The cache path.
+        """
+        import maya.api.OpenMaya as om
+
+        joints = self.registered('joints')
+        startFrame = cmds.playbackOptions(query=True, minTime=True) if startFrame is None else startFrame
+        endFrame = cmds.playbackOptions(query=True, maxTime=True) if endFrame is None else endFrame
+        if step <= 0 or endFrame < startFrame:
+            cmds.error("The cache needs a positive step and an end frame after the start frame.")
+        frames = numpy.arange(startFrame, endFrame + step * 0.5, step)
+
+        selection = om.MSelectionList()
+        for joint in joints:
+            selection.add(joint)
+        plugs = [om.MFnDependencyNode(selection.getDependNode(i)).findPlug('worldMatrix', False).elementByLogicalIndex(0)
+                 for i in range(len(joints))]
+
+        matrices = numpy.empty((len(frames), len(joints), 4, 4))
+        currentFrame = cmds.currentTime(query=True)
+        cmds.refresh(suspend=True)
+        try:
+            for index, frame in enumerate(frames):
+                cmds.currentTime(float(frame), update=True)
+                matrices[index] = [list(om.MFnMatrixData(plug.asMObject()).matrix()) for plug in plugs]
+        finally:
+            cmds.currentTime(currentFrame, update=True)
+            cmds.refresh(suspend=False)
+        AutoRibbonCache.writeCache(path, matrices, frames, joints)
+        return path
+
+    def nodeStages(self):
+        """
+        Tags every node of the rig with the build stage that created it. Registered nodes take the stage of their
+        role, the shapes, constraints and handles below them the stage of their closest registered parent, and
+        the construction history of those the stage of the node it feeds.
+
+        Returns:
+            dict: Node name to stage, see STAGE_ROLES.
+        """
+        if 'drvCtrl' not in self.registry:
+            self.loadManifest()
+        stages = {node: stage for stage, roles in STAGE_ROLES.items() for role in roles
+                  for node in self.registry.get(role, [])}
+        queue = list(stages)
+        descendants = []
+        while queue:
+            node = queue.pop()
+            for child in cmds.listRelatives(node, children=True) or []:
+                if child not in stages:
+                    stages[child] = stages[node]
+                    descendants.append(child)
+                    queue.append(child)
+        # Construction history of the shapes below them
+        connections = cmds.listConnections(descendants, source=True, destination=False, connections=True) or []
+        for destination, source in zip(connections[::2], connections[1::2]):
+            if source not in stages:
+                stages[source] = stages[destination.split('.')[0]]
+        return stages
+
+    def costReport(self, path, startFrame=None, endFrame=None, step=1.0, tracePath=None):
+        """
+        Writes the node census of every build stage and how long each one takes to evaluate over a frame range,
+        as a JSON report and a Chrome trace (AutoRibbonReport.py).
+
+        On every frame, the outputs of the stages are pulled with dgeval in dependency order: the roll and
+        ripple networks, the FK chain and the ribbon binding, the deformers, then the joint attachment and the
+        model skinCluster, which count as setUpTentacleFK. Upstream stages are clean by the time a stage is
+        pulled, so each one is timed on its own. Every pull is repeated on the clean graph and that query
+        overhead is subtracted.
+
+        Args:
+            path (str): JSON report to write.
+            startFrame (float): First frame, defaults to the playback range's start.
+            endFrame (float): Last frame, defaults to the playback range's end.
+            step (float): Frames between samples.
+            tracePath (str): Chrome trace to write, defaults to the report path with a '_trace.json' ending.
+
+        Returns:
+            dict: The report.
+        """
+        stages = self.nodeStages()
+        census = AutoRibbonReport.nodeCensus(stages, {node: cmds.nodeType(node) for node in stages})
+
+        startFrame = cmds.playbackOptions(query=True, minTime=True) if startFrame is None else startFrame
+        endFrame = cmds.playbackOptions(query=True, maxTime=True) if endFrame is None else endFrame
+        if step <= 0 or endFrame < startFrame:
+            cmds.error("The report needs a positive step and an end frame after the start frame.")
+        frames = numpy.arange(startFrame, endFrame + step * 0.5, step)
+
+        phases = [(stage, plugs) for stage, plugs in self.stageOutputs() if plugs]
+        events = []
+        currentFrame = cmds.currentTime(query=True)
+        cmds.refresh(suspend=True)
+        try:
+            for frame in frames.tolist():
+                cmds.currentTime(frame, update=False)
+                for stage, plugs in phases:
+                    start = time.perf_counter()
+                    cmds.dgeval(plugs)
+                    seconds = time.perf_counter() - start
+                    overhead = time.perf_counter()
+                    cmds.dgeval(plugs)
+                    overhead = time.perf_counter() - overhead
+                    events.append({'stage': stage, 'frame': frame, 'start': start,
+                                   'seconds': max(seconds - overhead, 0.0)})
+        finally:
+            cmds.currentTime(currentFrame, update=True)
+            cmds.refresh(suspend=False)
+
+        report = {'rig': self.drvCtrl, 'parameters': {name: getattr(self, name) for name in BUILD_PARAMETERS},
+                  'frames': {'start': float(startFrame), 'end': float(endFrame), 'step': float(step)},
+                  'census': census, 'profile': AutoRibbonReport.profileSummary(events, len(frames))}
+        AutoRibbonReport.writeJson(path, report)
+        AutoRibbonReport.writeJson(tracePath or os.path.splitext(path)[0] + '_trace.json',
+                                   AutoRibbonReport.chromeTrace(events, self.drvCtrl))
+        return report
+
+    def stageOutputs(self):
+        """
+        Returns:
+            list: (stage, plugs) in dependency order, the plugs through which each stage drives the next.
+        """
+        registry = self.registry
+        ribbonDeformers = registry.get('ribbonSkinClusters', []) + registry.get('ribbonDrivers', [])
+        modelSkinClusters = [skinCluster for skinCluster in registry.get('skinClusters', [])
+                             if skinCluster not in ribbonDeformers]
+        rollAxis = self.rollAxis.upper()
+        return [
+            ('tentacleRoll', [group + f'.rotate{rollAxis}' for group in registry.get('fkCtrlGroups', [])]
+             if 'rollNodes' in registry else []),
+            ('tentacleRipple', [joint + '.scaleX' for joint in registry.get('joints', [])]
+             if 'rippleNodes' in registry else []),
+            ('setUpTentacleFK', [joint + '.worldMatrix[0]' for joint in registry.get('drvJoints', [])]
+             + [deformer + '.outputGeometry[0]' for deformer in ribbonDeformers]),
+            ('tentacleRibbonDeformer', [node + '.worldSpace[0]' for node in registry.get('surface', [])]
+             if registry.get('deformers') else []),
+            ('setUpTentacleFK', [joint + '.worldMatrix[0]' for joint in registry.get('joints', [])]
+             + [skinCluster + '.outputGeometry[0]' for skinCluster in modelSkinClusters]),
+        ]
+
+    def loadCache(self, path, network='disable'):
+        """
+        Drives the bind joints from a joint cache with one autoRibbonCacheReader node instead of the rig.
+
+        The joints are moved under a new cache group with identity transforms and take the cached world
+        matrices through their offsetParentMatrix, so the model skinCluster keeps working unchanged. The
+        network that drove them is frozen and its controls hidden ('disable'), or deleted with the driver
+        control, the ribbon and its groups ('delete'), which also removes the manifest.
+
+        Args:
+            path (str): Cache written by bakeCache or AutoRibbonCache.writeCache from AutoRibbonSolver
+                matrices, in world space.
+            network (str): 'disable' or 'delete'.
+
+        Returns:
+            str: The cache reader node.
+        """
+        if network not in LOAD_CACHE_MODES:
+            cmds.error("Network must be 'disable' or 'delete'.")
+        joints = self.registered('joints')
+        cache = AutoRibbonCache.readCache(path)
+        if len(cache.joints) != len(joints):
+            cmds.error("The cache has {} joints, {} has {}.".format(len(cache.joints), self.drvCtrl, len(joints)))
+
+        AutoRibbonPlan.loadNodesPlugin()
+        reader = cmds.createNode('autoRibbonCacheReader', name=self.prefixed(f"{self.modelName}_cacheReader"))
+        cmds.setAttr(reader + '.cachePath', path, type='string')
+        cmds.connectAttr('time1.outTime', reader + '.time')
+        cacheGroup = cmds.group(empty=True, world=True, name=self.prefixed(f"{self.modelName}_cache_Group"))
+
+        # Let go of everything that drove the joints, then hand them to the reader
+        if self.registry.get('jointConstraints'):
+            cmds.delete(self.registry['jointConstraints'])
+            self.register(jointConstraints=[])
+        for joint in joints:
+            connections = cmds.listConnections(joint, source=True, destination=False, connections=True,
+                                               plugs=True) or []
+            for destination, source in zip(connections[::2], connections[1::2]):
+                cmds.disconnectAttr(source, destination)
+        cmds.parent(joints, cacheGroup)
+        for i, joint in enumerate(joints):
+            for attr in ('translate', 'rotate', 'jointOrient'):
+                cmds.setAttr(f"{joint}.{attr}", 0, 0, 0)
+            cmds.setAttr(joint + '.scale', 1, 1, 1)
+            cmds.connectAttr('{}.outMatrix[{}]'.format(reader, i), joint + '.offsetParentMatrix')
+
+        networkNodes = [node for role in NETWORK_ROLES for node in self.registry.get(role, [])]
+        if network == 'delete':
+            groups = [node for role in RIG_GROUP_ROLES for node in self.registry.get(role, [])]
+            cmds.delete([node for node in networkNodes + groups if cmds.objExists(node)])
+            if self.registry.get('rollWeights'):
+                releaseSharedNodes(self.registry['rollWeights'])
+            ribbonSkinClusters = self.registry.get('ribbonSkinClusters', [])
+            self.registry = {'joints': joints, 'bindJointSet': self.registry.get('bindJointSet', []),
+                             'skinClusters': [skinCluster for skinCluster in self.registry.get('skinClusters', [])
+                                              if skinCluster not in ribbonSkinClusters]}
+            self.register(cacheReader=[reader], cacheGroup=[cacheGroup])
+        else:
+            for node in networkNodes:
+                cmds.setAttr(node + '.frozen', True)
+            cmds.setAttr(self.drvCtrl + '.visibility', 0)
+            self.extendManifest(cacheReader=[reader], cacheGroup=[cacheGroup])
+        cmds.select(clear=True)
+        return reader
+
+    def trimSegments(self):
+        """Deletes the joint and ctrl segments past the new joint count and drops them from the registry."""
+        removed = []
+        for role in JOINT_SEGMENT_ROLES + CTRL_SEGMENT_ROLES:
+            count = self.layout.jointCount if role in JOINT_SEGMENT_ROLES else self.layout.ctrlCount
+            nodes = self.registry.get(role)
+            if not nodes:
+                continue
+            if role == 'fkCtrlGroups':
+                # Every ctrl group is parented under the previous ctrl, the first removed one takes the others along
+                removed.extend(nodes[count:count + 1])
+            elif role not in NESTED_SEGMENT_ROLES:
+                removed.extend(nodes[count:])
+            self.registry[role] = nodes[:count]
+        if removed:
+            cmds.delete(removed)
+
+    def appendSegments(self, segments):
+        for role, nodes in collectSegments(segments).items():
+            self.registry[role] = self.registry.get(role, []) + nodes
+
+    def updateJointSegments(self, oldJointCount):
+        """Moves the kept joints to their new UVs and creates the added joint segments."""
+        kept = min(oldJointCount, self.jointCount)
+        jointGroup = self.registered('jointGroup')[0]
+        if self.attachMode == 'uvPin':
+            pin = self.registered('uvPin')[0]
+            self.setUvPinCoordinates(pin)
+            segments = [self.createPinnedSegment(i, pin, jointGroup) for i in range(kept, self.jointCount)]
+            # Pinned zero groups take the driver control's scale themselves
+            for segment in segments:
+                for axis in 'xyz':
+                    if axis != self.primaryAxis:
+                        cmds.connectAttr(self.drvCtrl + f'.scale{axis.upper()}',
+                                         segment['jointZeroGroups'] + f'.scale{axis.upper()}')
+        else:
+            follicleShapes = self.registered('follicleShapes')
+            jointDrivers = self.registered('jointMatrices' if self.wiringMode == 'matrix' else 'jointConstraints')
+            for i in range(kept):
+                cmds.setAttr(follicleShapes[i] + '.parameterU', float(self.layout.follicleU[i]))
+                cmds.setAttr(follicleShapes[i] + '.parameterV', float(self.layout.follicleV[i]))
+                # The bind joint keeps its build position as offset from the follicle
+                if self.wiringMode == 'matrix':
+                    offset = numpy.reshape(cmds.getAttr(jointDrivers[i] + '.matrixIn[0]'), (4, 4))
+                    offset[3, :3] = self.layout.jointPositions[i]
+                    cmds.setAttr(jointDrivers[i] + '.matrixIn[0]', offset.ravel().tolist(), type='matrix')
+                else:
+                    cmds.setAttr(jointDrivers[i] + '.target[0].targetOffsetTranslate',
+                                 *self.layout.jointPositions[i].tolist())
+            cmds.select(clear=True)
+            surfaceShape = self.registered('surface')[0]
+            follicleGroup = self.registered('follicleGroup')[0]
+            segments = [self.createFollicleSegment(i, surfaceShape, jointGroup, follicleGroup)
+                        for i in range(kept, self.jointCount)]
+        self.appendSegments(segments)
+
+    def updateCtrlSegments(self, oldLayout):
+        """
+        Moves the kept FK ctrls onto their joints' new places, resizes all controls and creates the added
+        FK ctrls. The driver joint at the end of the kept chain is constrained anew.
+        """
+        kept = min(oldLayout.jointCount, self.jointCount)
+        drvJoints = self.registered('drvJoints')
+        ctrls = self.registered('fkCtrls')
+        ctrlGroups = self.registered('fkCtrlGroups')
+        # Where each driver joint (and its ctrl group) sits in a fresh build
+        targets = self.registered('jointZeroGroups' if self.attachMode == 'uvPin' else 'follicles')
+
+        for ctrlGroup, target in zip(ctrlGroups, targets):
+            # Roll drives one rotate channel of the group, so it is let go while the group is placed
+            rollPlug = f"{ctrlGroup}.rotate{self.rollAxis.upper()}"
+            rollSource = cmds.listConnections(rollPlug, source=True, destination=False, plugs=True)
+            if rollSource:
+                cmds.disconnectAttr(rollSource[0], rollPlug)
+            cmds.matchTransform(ctrlGroup, target, position=True, rotation=True)
+            if rollSource:
+                cmds.connectAttr(rollSource[0], rollPlug)
+        # Ctrls that share a shape are scaled once, through its owner
+        scaledCtrls = ctrls if self.shapeMode == 'unique' else list(self.sharedShapeOwners(ctrls).values())
+        scaleCurveShapes(scaledCtrls, self.layout.lengthPerSegment / oldLayout.lengthPerSegment)
+        scaleCurveShapes([self.drvCtrl], self.layout.drvCtrlScale / oldLayout.drvCtrlScale)
+        if self.registry.get('endDrvCtrl'):
+            scaleCurveShapes(self.registry['endDrvCtrl'], self.layout.endCtrlSize / oldLayout.endCtrlSize)
+            cmds.setAttr(self.registry['endDrvCtrlGroup'][0] + f'.translate{self.primaryAxis.upper()}',
+                         self.tentacleLength)
+        if self.deformerMode == 'fused' and self.registry.get('deformers'):
+            cmds.setAttr(self.registry['deformers'][0] + '.length', self.layout.tentacleLength)
+
+        # The last kept driver joint was constrained to a ctrl that is now deleted or no longer the last one
+        boundary = drvJoints[kept - 1]
+        if self.wiringMode == 'matrix':
+            drvJointMatrices = self.registered('drvJointMatrices')[:kept - 1]
+            cmds.delete(self.registry['drvJointMatrices'][kept - 1])
+        else:
+            cmds.delete(cmds.listRelatives(boundary, type=['parentConstraint', 'scaleConstraint']) or [])
+        cmds.matchTransform(boundary, targets[kept - 1], position=True, rotation=True)
+
+        added = range(len(ctrls), self.layout.ctrlCount)
+        segments = [self.createCtrlSegment(i, drvJoints[i], ctrl)
+                    for i, ctrl in zip(added, self.createCtrlCurves(added, drvJoints) if added else [])]
+        for segment in segments:
+            cmds.parent(segment['fkCtrlGroups'], ctrls[-1] if ctrls else self.drvCtrl)
+            ctrls.append(segment['fkCtrls'])
+            ctrlGroups.append(segment['fkCtrlGroups'])
+
+        # Use the last ctrl to constraint the final joint besides the previous joint
+        if self.wiringMode == 'matrix':
+            drvJointMatrices += [segment['drvJointMatrices'] for segment in segments]
+            self.register(drvJointMatrices=drvJointMatrices + [AutoRibbonPlan.matrixConstraint(ctrls[-1], drvJoints[-1])])
+        else:
+            cmds.parentConstraint(ctrls[-1], drvJoints[-1], maintainOffset=True)
+        cmds.select(clear=True)
+
+    def updateRoll(self, oldCtrlCount):
+        """Sets the new roll weight windows and count, and adds the roll nodes of the added FK ctrls."""
+        fkCtrls = self.registered('fkCtrls')
+        rollNodes = self.registered('rollNodes')
+        if self.rollMode == 'solver':
+            solver = rollNodes[0]
+            cmds.setAttr(solver + '.count', len(fkCtrls))
+            for i in range(oldCtrlCount, len(fkCtrls)):
+                cmds.connectAttr('{}.outRoll[{}]'.format(solver, i), fkCtrls[i] + f'_grp.rotate{self.rollAxis.upper()}')
+            return
+
+        mult = rollNodes[0]
+        kept = min(oldCtrlCount, len(fkCtrls))
+        remaps = self.registered('rollRemaps')
+        adds = self.registered('rollStartAdds')
+        for i in range(kept):
+            cmds.setAttr(remaps[i] + '.inputMax', float(self.layout.rollWeightMax[i]))
+            cmds.setAttr(adds[i] + '.input1', float(self.layout.rollWeightMin[i]))
+        if self.weightMode == 'shared':
+            # The kept ctrls move over to the shared weights of the new count
+            oldWeights = self.registered('rollWeights')
+            self.register(rollWeights=self.sharedRollWeights(len(fkCtrls)))
+            breakout = self.registry['rollWeights'][1]
+            multWeights = self.registered('rollWeightMults')
+            for i in range(kept):
+                cmds.connectAttr('{}.outputs[{}].rotate'.format(breakout, i), multWeights[i] + '.input2', force=True)
+            releaseSharedNodes(oldWeights)
+        else:
+            distr, breakout = rollNodes[1:]
+            cmds.setAttr(distr + '.pointCount', len(fkCtrls))
+        self.appendSegments([self.createRollSegment(i, fkCtrls[i], mult + '.output', breakout)
+                             for i in range(kept, len(fkCtrls))])
+
+    def updateRipple(self, oldJointCount):
+        """Sets the new ripple windows and count, and adds the ripple nodes of the added joints."""
+        jnts = self.registered('joints')
+        rippleNodes = self.registered('rippleNodes')
+        if self.rippleMode == 'solver':
+            solver = rippleNodes[0]
+            cmds.setAttr(solver + '.count', len(jnts))
+            for i in range(oldJointCount, len(jnts)):
+                cmds.connectAttr('{}.outScale[{}]'.format(solver, i), jnts[i] + '.scaleX')
+            return
+
+        expression, remap, multRvs = rippleNodes[:3]
+        breakout = None
+        if self.weightMode == 'local':
+            distr, breakout = rippleNodes[3:]
+            cmds.setAttr(distr + '.pointCount', len(jnts))
+        kept = min(oldJointCount, len(jnts))
+        remaps = self.registered('rippleRemaps')
+        addsIn = self.registered('rippleInAdds')
+        addsOut = self.registered('rippleOutAdds')
+        for i in range(kept):
+            cmds.setAttr(remaps[i] + '.value[1].value_Position', float(self.layout.ripplePeak[i]))
+            cmds.setAttr(addsIn[i] + '.input1', float(self.layout.rippleStart[i]))
+            cmds.setAttr(addsOut[i] + '.input1', float(self.layout.rippleEnd[i]))
+        self.appendSegments([self.createRippleSegment(i, jnts[i], remap + '.outValue', multRvs + '.output', breakout)
+                             for i in range(kept, len(jnts))])
 
     def createRibbonCurve(self):
         # Axis vector for curve direction and joint placement
         self.axisVector = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}[self.primaryAxis]
 
-        # Calculate positions for curve CVs
-        cvPositions = []
-        step = self.tentacleLength / float(self.jointCount - 1)  # Five CVs, four segments
-        for i in range(self.jointCount):
-            position = [v * step * i for v in self.axisVector]
-            cvPositions.append(position)
+        # Positions for curve CVs
+        cvPositions = self.layout.curvePositions.tolist()
 
         # Create the NURBS curve
-        crvName = "crv_ribbon"
+        crvName = self.prefixed("crv_ribbon")
         self.ribbonCurve = cmds.curve(name=crvName, p=cvPositions, d=1)  # Degree 1 for a straight curve
         cmds.select(clear=True)
 
-    def setUpTentacleFK(self):
-        # Axis vector for curve direction and joint placement
-        self.axisVector = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}[self.primaryAxis]
-
+    def createRibbonSurface(self):
         # Set up curve to form ribbon
-        ribbonGroup = cmds.group(empty=True, name="ribbon_Group")
+        ribbonGroup = cmds.group(empty=True, name=self.prefixed("ribbon_Group"))
         cmds.parent(self.ribbonCurve, ribbonGroup)
+        if self.surfaceSpans is not None:
+            self.refitRibbonCurve()
 
         # Duplicate the curve and create ribbon
         ribbonCurveDup = cmds.duplicate(self.ribbonCurve)[0]
@@ -129,7 +1106,7 @@ class Tentacle:
         self.surface = \
         cmds.loft(ribbonCurveDup, self.ribbonCurve, constructionHistory=False, uniform=True, degree=3, sectionSpans=1,
                   range=False, polygon=0,
-                  name='surface_ribbon')[0]
+                  name=self.prefixed('surface_ribbon'))[0]
         cmds.parent(self.surface, ribbonGroup)
 
         surfaceShape = cmds.listRelatives(self.surface, shapes=True)[0]
@@ -139,108 +1116,65 @@ class Tentacle:
         cmds.setAttr(ribbonCurveDup + '.visibility', 0)
         cmds.setAttr(self.surface + '.visibility', 0)
 
+        self.register(ribbonGroup=[ribbonGroup])
+        return surfaceShape
+
+    def refitRibbonCurve(self):
+        """
+        Replaces the ribbon curve with a cubic fit of its CVs with surfaceSpans spans, so the ribbon surface's
+        resolution follows the curve's shape instead of the joint count. The follicles and pins keep sampling
+        the surface at the layout UVs.
+
+        Returns:
+            int: The span count.
+        """
+        points = cmds.getAttr(self.ribbonCurve + '.cv[*]')
+        spanCount = self.surfaceSpans
+        if spanCount == 'auto':
+            spanCount = AutoRibbonMath.surfaceSpanCount(points, self.surfaceTolerance)
+        cvs = AutoRibbonMath.fitCurve(points, spanCount)[0]
+        cmds.curve(self.ribbonCurve, replace=True, point=cvs.tolist(), degree=3, knot=AutoRibbonPlan.curveKnots(len(cvs), 3))
+        return spanCount
+
+    def sampleRibbonCurve(self):
+        """
+        Resamples the layout's joint positions and follicle V values at equal arc lengths of the ribbon curve.
+        The curve's CVs, knots and degree are read once and evaluated in NumPy, without per joint queries.
+
+        Only where the joints sit is resampled, not how they turn: the joints and FK ctrls are placed on the
+        follicle or uvPin frames of the ribbon surface, which is lofted along this curve, so their frames
+        already follow its tangent at the new V values. The primaryAxis joint orient is set inside that frame.
+        """
+        curveShape = cmds.listRelatives(self.ribbonCurve, shapes=True)[0]
+        curveInfo = cmds.createNode('curveInfo')
+        cmds.connectAttr(curveShape + '.local', curveInfo + '.inputCurve')
+        knots = cmds.getAttr(curveInfo + '.knots[*]')
+        cmds.delete(curveInfo)
+        self.layout.sampleCurve(cmds.getAttr(self.ribbonCurve + '.cv[*]'), knots, cmds.getAttr(curveShape + '.degree'))
 
-        # Create follicle group
-        follicleGroup = cmds.group(empty=True, name="follicle_Group")
-
-        # Calculate length per segment
-        if self.isAutoMeasureLength:
-            lengthPerSegment = self.tentacleLength / self.jointCount
-        else:
-            lengthPerSegment = self.tentacleLength
-
-        # Create joints and place the first joint in a joint group
-        jointGroup = cmds.group(empty=True, name=f"{self.modelName}_jointGroup")
-        joints = []
-        jointZeroGroups = []
-        previousJoint = None
-
-        drvJoints = []
-
-        for i in range(self.jointCount):
-            # create follicles
-            follicleShape = cmds.createNode('follicle', name="follicleShape_m_tentacle_{:03d}".format(i + 1))
-
-            # rename follicle transform node
-            follicle = cmds.listRelatives(follicleShape, parent=True)[0]
-            follicleName = follicle.replace("follicleShape", "follicle")
-            follicle = cmds.rename(follicle, follicleName)
-
-            cmds.parent(follicle, follicleGroup)
-
-            # Connect Follicle
-            cmds.connectAttr(surfaceShape + '.worldSpace[0]', follicleShape + '.inputSurface')
-            # connect follicle shape to transofrm
-            cmds.connectAttr(follicleShape + '.outTranslate', follicle + '.translate')
-            cmds.connectAttr(follicleShape + '.outRotate', follicle + '.rotate')
-            # Set UV value
-            cmds.setAttr(follicleShape + '.parameterU', 0.5)
-            cmds.setAttr(follicleShape + '.parameterV', float(i) / (self.jointCount - 1))
-
-            # Calculate joint position
-            position = [v * lengthPerSegment * i for v in self.axisVector]
-
-            # Create joint
-            jointName = "jnt_m_tentacle_{:03d}".format(i + 1)
-            joint = cmds.joint(position=position, name=jointName)
-
-            # Rotate the joint
-            if self.primaryAxis == 'x':
-                cmds.setAttr(joint + '.rotateY', 90)
-            elif self.primaryAxis == 'z':
-                cmds.setAttr(joint + '.rotateX', 90)
-            else:
-                cmds.setAttr(joint + '.rotate', 0, 0, 0)
-
-            cmds.makeIdentity(joint, apply=True, rotate=True)
-
-            # if i<self.jointCount-1:
-            joints.append(joint)
-
-            jointZeroGroup = cmds.group(joint, name=f"Zero_{jointName}")
-            cmds.parent(joint, jointZeroGroup)
-
-            jointZeroGroups.append(jointZeroGroup)
-
-            # Parent the first joint to the joint group
-            # if i == 0:
-            if cmds.listRelatives(jointZeroGroup, parent=True) != [jointGroup]:
-                cmds.parent(jointZeroGroup, jointGroup)
-
-            # Create Driver Joint to bind ribbon surface and control it
-            cmds.select(clear=True)
-            drvJointName = "drv_jnt_m_tentacle_{:03d}".format(i + 1)
-            drvJoint = cmds.joint(position=position, name=drvJointName)
-
-            # Rotate the joint
-            if self.primaryAxis == 'x':
-                cmds.setAttr(drvJoint + '.rotateY', 90)
-            elif self.primaryAxis == 'z':
-                cmds.setAttr(drvJoint + '.rotateX', 90)
-            else:
-                cmds.setAttr(drvJoint + '.rotate', 0, 0, 0)
-
-            cmds.makeIdentity(drvJoint, apply=True, rotate=True)
-
-            drvJoints.append(drvJoint)
-            cmds.parent(drvJoint, jointGroup)
-
-            # Move joint to follicle's position and use follicle to constraint it
-            cmds.delete(cmds.parentConstraint(follicle, jointZeroGroup, maintainOffset=False))
-            cmds.parentConstraint(follicle, joint, maintainOffset=True)
+    def setUpTentacleFK(self):
+        return runSteps(self.setUpTentacleFKSteps())
 
-            #
-            cmds.delete(cmds.parentConstraint(follicle, drvJoint, maintainOffset=False))
+    def setUpTentacleFKSteps(self):
+        """
+        setUpTentacleFK as a generator that yields after every joint and FK ctrl segment, for buildSteps.
 
-            # Make the next joint not the child of this joint (for ribbon setting, the existence of parent relation has no influence on FK)
-            cmds.select(clear=True)
+        Returns:
+            dict: The registry, as the generator's return value.
+        """
+        # Axis vector for curve direction and joint placement
+        self.axisVector = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}[self.primaryAxis]
 
-            # Parent the current joint to the previous joint
-            # if previousJoint:
-            # if cmds.listRelatives(joint, parent=True) != [previousJoint]:
-            # cmds.parent(joint, previousJoint)
+        surfaceShape = self.createRibbonSurface()
+        if self.samplingMode == 'arcLength':
+            self.sampleRibbonCurve()
 
-            # previousJoint = joint
+        # Create joints and place the first joint in a joint group
+        jointGroup = cmds.group(empty=True, name=self.prefixed(f"{self.modelName}_jointGroup"))
+        if self.attachMode == 'uvPin':
+            joints, jointZeroGroups, drvJoints = yield from self.setUpUvPinJoints(surfaceShape, jointGroup)
+        else:
+            joints, jointZeroGroups, drvJoints = yield from self.setUpFollicleJoints(surfaceShape, jointGroup)
 
         # Set orient joint for all joints
         #orientString = f"{self.primaryAxis}{''.join([x for x in ['x', 'y', 'z'] if x != self.primaryAxis and x != self.secondaryAxis])}{self.secondaryAxis}"
@@ -250,39 +1184,20 @@ class Tentacle:
         #for drvJoint in drvJoints:
             #cmds.joint(drvJoint, edit=True, orientJoint=orientString, zeroScaleOrient=True)
 
-        # Create controllers and groups
-        ctrls = []
-        ctrlGroups = []
-        for i, drvJoint in enumerate(drvJoints):
-            if i < len(drvJoints) - 1:
-                ctrlName = drvJoint.replace("jnt", "ctrl")
-
-                # Add PlaceHolder Extra FK Ctrls
-                if i%4 != 0: 
-                    ctrl = cmds.circle(name=ctrlName, normal=self.axisVector, radius=lengthPerSegment / 1.0)[0]
-                    cmds.setAttr(f"{ctrl}.overrideEnabled", 1)
-                    cmds.setAttr(f"{ctrl}.overrideColor", self.CTRL_COLOR['m'])
-                else:
-                    ctrl = createSquareCurve(name = ctrlName, size=lengthPerSegment / 0.5)
-                    cmds.setAttr(f"{ctrl}.overrideEnabled", 1)
-                    cmds.setAttr(f"{ctrl}.overrideColor", self.CTRL_COLOR['l'])
-
-                ctrlGroup = cmds.group(ctrl, name=f"{ctrlName}_grp")
-                ctrls.append(ctrl)
-                ctrlGroups.append(ctrlGroup)
-
-                # Match controller group to joint
-                cmds.delete(cmds.parentConstraint(drvJoint, ctrlGroup))
-                # cmds.makeIdentity(ctrlGroup, apply=True, rotate=True)
-
-                # Parent constraint controller to joint
-                cmds.parentConstraint(ctrl, drvJoint, maintainOffset=True)
-                cmds.scaleConstraint(ctrl, drvJoint)  # This only take effect in the scale of primary axis
-
-
-            # Use the last ctrl to constraint the final joint besides the previous joint
-            else:
-                cmds.parentConstraint(ctrls[-1], drvJoint, maintainOffset=True)
+        # Create controllers in one batch, then their groups
+        ctrlSegments = []
+        for i, ctrl in enumerate(self.createCtrlCurves(range(self.layout.ctrlCount), drvJoints)):
+            ctrlSegments.append(self.createCtrlSegment(i, drvJoints[i], ctrl))
+            yield
+        ctrls = [segment['fkCtrls'] for segment in ctrlSegments]
+        ctrlGroups = [segment['fkCtrlGroups'] for segment in ctrlSegments]
+
+        # Use the last ctrl to constraint the final joint besides the previous joint
+        if self.wiringMode == 'matrix':
+            self.register(drvJointMatrices=[segment['drvJointMatrices'] for segment in ctrlSegments] +
+                          [AutoRibbonPlan.matrixConstraint(ctrls[-1], drvJoints[-1])])
+        else:
+            cmds.parentConstraint(ctrls[-1], drvJoints[-1], maintainOffset=True)
 
         # Establish parent-child relationships between controller groups
         for i in range(1, len(ctrlGroups)):
@@ -291,13 +1206,14 @@ class Tentacle:
                 
 
         # Put ctrl groups under main drvCtrl
-        drvCtrlName = "CTRL_M_TentacleDrv_001"
+        drvCtrlName = self.prefixed("CTRL_M_TentacleDrv_001")
         # self.drvCtrl = cmds.circle(name=drvCtrlName, normal=self.axisVector, radius= 100)[0]
         self.drvCtrl = createArrowCurve(name=drvCtrlName)
         cmds.setAttr(f"{self.drvCtrl}.overrideEnabled", 1)
         cmds.setAttr(f"{self.drvCtrl}.overrideColor", self.CTRL_COLOR['r'])
 
-        cmds.setAttr(self.drvCtrl + '.scale', lengthPerSegment / 0.5, lengthPerSegment / 0.5, lengthPerSegment / 0.5)
+        drvCtrlScale = self.layout.drvCtrlScale
+        cmds.setAttr(self.drvCtrl + '.scale', drvCtrlScale, drvCtrlScale, drvCtrlScale)
         cmds.makeIdentity(self.drvCtrl, apply=True, scale=True)
         cmds.parent(ctrlGroups[0], self.drvCtrl)
 
@@ -311,30 +1227,385 @@ class Tentacle:
         # if axis!= self.primaryAxis:
         # cmds.connectAttr(ctrl + f'.scale{axis.upper()}', jointZeroGroup + f'.scale{axis.upper()}')
 
+        # Pinned zero groups take world matrices from the uvPin, so they get the scale themselves
+        scaledGroups = jointZeroGroups if self.attachMode == 'uvPin' else [jointGroup]
         for axis in 'xyz':
             if axis != self.primaryAxis:
-                cmds.connectAttr(self.drvCtrl + f'.scale{axis.upper()}', jointGroup + f'.scale{axis.upper()}')
+                for scaledGroup in scaledGroups:
+                    cmds.connectAttr(self.drvCtrl + f'.scale{axis.upper()}', scaledGroup + f'.scale{axis.upper()}')
+
+        cmds.select(clear=True)
+
+        self.register(drvCtrl=[self.drvCtrl], surface=[surfaceShape], jointGroup=[jointGroup], joints=joints,
+                      jointZeroGroups=jointZeroGroups, drvJoints=drvJoints, fkCtrls=ctrls, fkCtrlGroups=ctrlGroups)
+        self.bindRibbon(drvJoints, joints)
+        self.storeManifest()
+
+        return self.registry
+
+    def createCtrlCurves(self, indices, drvJoints):
+        """
+        Creates the FK ctrls `indices` of the chain at the origin, named after their driver joints, as one
+        BuildPlan (see planCtrlShape). The plan is committed through `backend` when one was passed, else in one
+        MDagModifier batch for the batched build and through maya.cmds for the cmds build.
+
+        Returns:
+            list: The ctrls.
+        """
+        ctrls = [drvJoints[i].replace("jnt", "ctrl") for i in indices]
+        plan = AutoRibbonPlan.BuildPlan()
+        owners = self.ctrlShapeOwners()
+        for i, ctrl in zip(indices, ctrls):
+            self.planCtrlShape(plan, i, ctrl, owners)
+        backend = self.backend
+        if not backend:
+            backend = AutoRibbonPlan.MayaModifierBackend() if self.buildMode == 'plan' else AutoRibbonPlan.CmdsBackend()
+        backend.commit(plan)
+        return ctrls
+
+    def planCtrlShape(self, plan, i, ctrl, owners, parent=None):
+        """
+        Plans FK ctrl `i` of the chain as a library curve (AutoRibbonShapes.py) called `ctrl`.
+
+        With shapeMode 'shared', the first ctrl of each kind owns the curve shape and its color, and the later
+        ctrls of that kind instance it. All squares and all circles of a rig have the same size, so a rig holds
+        two ctrl shapes whatever its joint count.
+
+        Args:
+            owners (dict): The shape path of each kind's owner, from ctrlShapeOwners. A planned owner adds itself.
+            parent (str): Node to plan the ctrl under.
+        """
+        kind = 'square' if self.layout.ctrlIsSquare[i] else 'circle'
+        if kind in owners:
+            plan.createNode('transform', ctrl, parent=parent)
+            plan.instanceShape(owners[kind], ctrl)
+            return
+        plan.createNode('nurbsCurve', ctrl, parent=parent)
+        curve = AutoRibbonShapes.shapeCurve(kind, float(self.layout.ctrlSizes[i]), self.axisVector)
+        plan.setCurve(ctrl + 'Shape', curve['points'], curve['degree'], curve['knots'], curve['periodic'])
+        # A shared shape carries the color for all its ctrls
+        colored = ctrl + 'Shape' if self.shapeMode == 'shared' else ctrl
+        plan.setAttr(f"{colored}.overrideEnabled", 1)
+        plan.setAttr(f"{colored}.overrideColor", self.CTRL_COLOR['l' if kind == 'square' else 'm'])
+        if self.shapeMode == 'shared':
+            owners[kind] = f"{ctrl}|{ctrl}Shape"
+
+    def ctrlShapeOwners(self):
+        """The shape paths of the registered FK ctrls that own a shared shape, by kind, for planCtrlShape."""
+        if self.shapeMode != 'shared':
+            return {}
+        return {kind: f"{ctrl}|{ctrl}Shape"
+                for kind, ctrl in self.sharedShapeOwners(self.registry.get('fkCtrls', [])).items()}
+
+    def sharedShapeOwners(self, ctrls):
+        """The first of the FK ctrls `ctrls`, in chain order, of each kind: 'square' and 'circle'."""
+        owners = {}
+        for ctrl, isSquare in zip(ctrls, self.layout.ctrlIsSquare.tolist()):
+            owners.setdefault('square' if isSquare else 'circle', ctrl)
+        return owners
+
+    def createCtrlSegment(self, i, drvJoint, ctrl):
+        """
+        Puts FK ctrl `i` in its group at its driver joint and constrains the driver joint to it.
+
+        Returns:
+            dict: The ctrl and its group by registry role.
+        """
+        ctrlGroup = cmds.group(ctrl, name=f"{ctrl}_grp")
+
+        if self.wiringMode == 'matrix':
+            # The ctrl sits on its joint, so the matrix drive needs no offset
+            cmds.matchTransform(ctrlGroup, drvJoint, position=True, rotation=True)
+            return {'fkCtrls': ctrl, 'fkCtrlGroups': ctrlGroup,
+                    'drvJointMatrices': AutoRibbonPlan.matrixConstraint(ctrl, drvJoint, maintainOffset=False)}
+
+        # Match controller group to joint
+        cmds.delete(cmds.parentConstraint(drvJoint, ctrlGroup))
+        # cmds.makeIdentity(ctrlGroup, apply=True, rotate=True)
+
+        # Parent constraint controller to joint
+        cmds.parentConstraint(ctrl, drvJoint, maintainOffset=True)
+        cmds.scaleConstraint(ctrl, drvJoint)  # This only take effect in the scale of primary axis
+
+        return {'fkCtrls': ctrl, 'fkCtrlGroups': ctrlGroup}
+
+    def setUpFollicleJoints(self, surfaceShape, jointGroup):
+        """
+        Attaches every joint with its own follicle on the ribbon surface, yielding after every joint.
+
+        Returns:
+            tuple: (joints, jointZeroGroups, drvJoints), as the generator's return value.
+        """
+        # Create follicle group
+        follicleGroup = cmds.group(empty=True, name=self.prefixed("follicle_Group"))
+
+        segments = []
+        for i in range(self.jointCount):
+            segments.append(self.createFollicleSegment(i, surfaceShape, jointGroup, follicleGroup))
+            yield
+        attachRoles = ('follicles', 'follicleShapes',
+                       'jointMatrices' if self.wiringMode == 'matrix' else 'jointConstraints')
+        self.register(follicleGroup=[follicleGroup], **collectSegments(segments, attachRoles))
+        return tuple([segment[role] for segment in segments] for role in ('joints', 'jointZeroGroups', 'drvJoints'))
+
+    def createFollicleSegment(self, i, surfaceShape, jointGroup, follicleGroup):
+        """
+        Creates follicle `i` with its bind joint, zero group and driver joint.
+
+        Returns:
+            dict: The created nodes by registry role.
+        """
+        # create follicles
+        follicleShape = cmds.createNode('follicle', name=self.prefixed("follicleShape_m_tentacle_{:03d}".format(i + 1)))
+
+        # rename follicle transform node
+        follicle = cmds.listRelatives(follicleShape, parent=True)[0]
+        follicleName = follicle.replace("follicleShape", "follicle")
+        follicle = cmds.rename(follicle, follicleName)
+
+        cmds.parent(follicle, follicleGroup)
+
+        # Connect Follicle
+        cmds.connectAttr(surfaceShape + '.worldSpace[0]', follicleShape + '.inputSurface')
+        # connect follicle shape to transofrm
+        cmds.connectAttr(follicleShape + '.outTranslate', follicle + '.translate')
+        cmds.connectAttr(follicleShape + '.outRotate', follicle + '.rotate')
+        # Set UV value
+        cmds.setAttr(follicleShape + '.parameterU', float(self.layout.follicleU[i]))
+        cmds.setAttr(follicleShape + '.parameterV', float(self.layout.follicleV[i]))
+
+        # Joint position
+        position = self.layout.jointPositions[i].tolist()
+
+        # Create joint
+        jointName = self.prefixed("jnt_m_tentacle_{:03d}".format(i + 1))
+        joint = cmds.joint(position=position, name=jointName)
+
+        # Rotate the joint
+        if self.primaryAxis == 'x':
+            cmds.setAttr(joint + '.rotateY', 90)
+        elif self.primaryAxis == 'z':
+            cmds.setAttr(joint + '.rotateX', 90)
+        else:
+            cmds.setAttr(joint + '.rotate', 0, 0, 0)
 
+        cmds.makeIdentity(joint, apply=True, rotate=True)
+
+        jointZeroGroup = cmds.group(joint, name=f"Zero_{jointName}")
+        cmds.parent(joint, jointZeroGroup)
+
+        # Parent the first joint to the joint group
+        # if i == 0:
+        if cmds.listRelatives(jointZeroGroup, parent=True) != [jointGroup]:
+            cmds.parent(jointZeroGroup, jointGroup)
+
+        # Create Driver Joint to bind ribbon surface and control it
         cmds.select(clear=True)
+        drvJointName = self.prefixed("drv_jnt_m_tentacle_{:03d}".format(i + 1))
+        drvJoint = cmds.joint(position=position, name=drvJointName)
 
+        # Rotate the joint
+        if self.primaryAxis == 'x':
+            cmds.setAttr(drvJoint + '.rotateY', 90)
+        elif self.primaryAxis == 'z':
+            cmds.setAttr(drvJoint + '.rotateX', 90)
+        else:
+            cmds.setAttr(drvJoint + '.rotate', 0, 0, 0)
+
+        cmds.makeIdentity(drvJoint, apply=True, rotate=True)
+
+        cmds.parent(drvJoint, jointGroup)
+
+        if self.wiringMode == 'matrix':
+            # Same placement and offset as the constraints below, without any constraint node
+            cmds.matchTransform(jointZeroGroup, follicle, position=True, rotation=True)
+            cmds.matchTransform(drvJoint, follicle, position=True, rotation=True)
+            segment = {'jointMatrices': AutoRibbonPlan.matrixConstraint(follicle, joint)}
+        else:
+            # Move joint to follicle's position and use follicle to constraint it
+            cmds.delete(cmds.parentConstraint(follicle, jointZeroGroup, maintainOffset=False))
+            segment = {'jointConstraints': cmds.parentConstraint(follicle, joint, maintainOffset=True)[0]}
+
+            #
+            cmds.delete(cmds.parentConstraint(follicle, drvJoint, maintainOffset=False))
+
+        # Make the next joint not the child of this joint (for ribbon setting, the existence of parent relation has no influence on FK)
+        cmds.select(clear=True)
+
+        segment.update(follicles=follicle, follicleShapes=follicleShape, jointZeroGroups=jointZeroGroup, joints=joint,
+                       drvJoints=drvJoint)
+        return segment
+
+    def setUpUvPinJoints(self, surfaceShape, jointGroup):
+        """
+        Pins every joint zero group with one multi-output uvPin node instead of one follicle per joint.
+        The uvPin output matrices drive the zero groups' offsetParentMatrix, so the bind joints sit at
+        identity inside them. Yields after every joint.
+
+        Args:
+            surfaceShape (str): The ribbon surface shape.
+            jointGroup (str): Group the zero groups and driver joints are created under.
+
+        Returns:
+            tuple: (joints, jointZeroGroups, drvJoints), as the generator's return value.
+        """
+        pin = cmds.createNode('uvPin', name=self.prefixed('uvPin_m_tentacle_001'))
+        cmds.connectAttr(surfaceShape + '.worldSpace[0]', pin + '.deformedGeometry')
+        normalAxis, tangentAxis = self.uvPinAxes()
+        cmds.setAttr(pin + '.normalAxis', normalAxis)
+        cmds.setAttr(pin + '.tangentAxis', tangentAxis)
+        self.setUvPinCoordinates(pin)
+
+        segments = []
+        for i in range(self.jointCount):
+            segments.append(self.createPinnedSegment(i, pin, jointGroup))
+            yield
+        self.register(uvPin=[pin])
+        return tuple([segment[role] for segment in segments] for role in ('joints', 'jointZeroGroups', 'drvJoints'))
+
+    def setUvPinCoordinates(self, pin):
+        # All UVs in one call
+        coordinates = [value for uv in zip(self.layout.follicleU.tolist(), self.layout.follicleV.tolist()) for value in uv]
+        cmds.setAttr(pin + '.coordinate[0:{}]'.format(self.jointCount - 1), *coordinates, size=self.jointCount)
+
+    def createPinnedSegment(self, i, pin, jointGroup):
+        """
+        Creates the zero group and bind joint on output `i` of the uvPin, and the driver joint placed on it.
+
+        Returns:
+            dict: The created nodes by registry role.
+        """
+        jointName = self.prefixed("jnt_m_tentacle_{:03d}".format(i + 1))
+        jointZeroGroup = cmds.createNode('transform', name=f"Zero_{jointName}", parent=jointGroup)
+        joint = cmds.createNode('joint', name=jointName, parent=jointZeroGroup)
+        cmds.connectAttr('{}.outputMatrix[{}]'.format(pin, i), jointZeroGroup + '.offsetParentMatrix')
+
+        # Driver joint placed on the pin, no temporary constraint needed
+        drvJoint = cmds.createNode('joint', name=self.prefixed("drv_jnt_m_tentacle_{:03d}".format(i + 1)), parent=jointGroup)
+        cmds.matchTransform(drvJoint, jointZeroGroup, position=True, rotation=True)
+
+        return {'jointZeroGroups': jointZeroGroup, 'joints': joint, 'drvJoints': drvJoint}
+
+    def uvPinAxes(self):
+        """
+        Returns:
+            tuple: (normalAxis, tangentAxis) enum values of the uvPin, so the pin frame matches the build
+            orientation: normal on the remaining axis, tangent on the secondary axis.
+        """
+        normalAxis = [x for x in 'xyz' if x not in (self.primaryAxis, self.secondaryAxis)][0]
+        return 'xyz'.index(normalAxis), 'xyz'.index(self.secondaryAxis)
+
+    def bindRibbon(self, drvJoints, joints):
+        ribbonSkinClusters = []
         # Bind Driver Joints to the ribbon surface, then the follicle attached to surface will control "Joints" bound to model
-        if cmds.objExists(self.surface) and all(cmds.objExists(drvJoint) for drvJoint in drvJoints):
+        ribbonReady = cmds.objExists(self.surface) and all(cmds.objExists(drvJoint) for drvJoint in drvJoints)
+        if ribbonReady and self.ribbonMode == 'direct':
+            self.driveRibbon(drvJoints)
+        elif ribbonReady:
             cmds.select(drvJoints)
             cmds.select(self.surface, add=True)
-            cmds.skinCluster(toSelectedBones=True, name="ribbonSurfaceSkinCluster")
-
-        joints.pop(-1)
+            # Front of chain so a rebind from updateRig stays before the twist and sine deformers
+            ribbonSkinClusters = cmds.skinCluster(toSelectedBones=True, name=self.prefixed("ribbonSurfaceSkinCluster"),
+                                                  frontOfChain=True)
+
+        skinClusters = self.bindModel(joints)
+        self.register(skinClusters=ribbonSkinClusters + skinClusters, ribbonSkinClusters=ribbonSkinClusters)
+
+    def bindModel(self, joints):
+        """
+        Binds the model to the bind joints but the last one.
+
+        Returns:
+            list: The model skinCluster, if the ribbon and the joints exist.
+        """
+        skinClusters = []
+        chainJoints = joints
+        joints = joints[:-1]
         if cmds.objExists(self.surface) and all(cmds.objExists(joint) for joint in joints):
             cmds.select(joints)
-            cmds.sets(name="bindJointSet")
+            bindJointSet = cmds.sets(name=self.prefixed("bindJointSet"))
+            self.register(bindJointSet=[bindJointSet])
             cmds.select(self.model, add=True)
-            cmds.skinCluster(toSelectedBones=True, name="modelSkinCluster",
-                             maximumInfluences=int(self.jointCount / 2.0))
-
-        return drvJoints
+            if self.skinMode == 'computed':
+                # Cheapest bind method, its weights are replaced right away
+                skinCluster = cmds.skinCluster(toSelectedBones=True, name=self.prefixed("modelSkinCluster"), bindMethod=0,
+                                               maximumInfluences=self.maxInfluences, obeyMaxInfluences=True)[0]
+                self.setComputedWeights(skinCluster, chainJoints)
+                skinClusters.append(skinCluster)
+            else:
+                skinClusters += cmds.skinCluster(toSelectedBones=True, name=self.prefixed("modelSkinCluster"),
+                                                 maximumInfluences=int(self.jointCount / 2.0))
+        return skinClusters
+
+    def driveRibbon(self, drvJoints):
+        """
+        Moves each CV row of the ribbon surface with its driver joint through one autoRibbonCvDrive node, bound
+        at the joints' current matrices, instead of a skinCluster.
+        """
+        AutoRibbonPlan.loadNodesPlugin()
+        # Front of chain like the skinCluster, so the twist and sine deformers act on the driven surface
+        drive = cmds.deformer(self.surface, type='autoRibbonCvDrive', frontOfChain=True,
+                              name=self.prefixed("ribbonSurfaceCvDrive"))[0]
+        cmds.setAttr(drive + '.blend', self.ribbonBlend)
+        for i, drvJoint in enumerate(drvJoints):
+            cmds.setAttr('{}.bindPreMatrix[{}]'.format(drive, i), cmds.getAttr(drvJoint + '.worldInverseMatrix[0]'),
+                         type='matrix')
+            cmds.connectAttr(drvJoint + '.worldMatrix[0]', '{}.driverMatrix[{}]'.format(drive, i))
+        self.register(ribbonDrivers=[drive])
+
+    def unbindRibbon(self):
+        """Unbinds the ribbon surface and the model and deletes the bind joint set, for updateRig."""
+        for skinCluster in self.registry.get('skinClusters', []):
+            cmds.skinCluster(skinCluster, edit=True, unbind=True)
+        if self.registry.get('bindJointSet'):
+            cmds.delete(self.registry['bindJointSet'])
+        if self.registry.get('ribbonDrivers'):
+            cmds.delete(self.registry['ribbonDrivers'])
+        self.register(skinClusters=[], ribbonSkinClusters=[], ribbonDrivers=[], bindJointSet=[])
+
+    def setComputedWeights(self, skinCluster, chainJoints):
+        """
+        Projects every model vertex onto the joint chain and writes the capped weights in one
+        MFnSkinCluster.setWeights call.
+
+        Args:
+            skinCluster (str): The model skinCluster, bound to all chain joints but the last.
+            chainJoints (list): Bind joints in chain order, including the last one.
+        """
+        import maya.api.OpenMaya as om
+        import maya.api.OpenMayaAnim as oma
+
+        selection = om.MSelectionList()
+        selection.add(skinCluster)
+        fnSkin = oma.MFnSkinCluster(selection.getDependNode(0))
+        shapePath = fnSkin.getPathAtIndex(0)
+
+        points = numpy.array([(p.x, p.y, p.z) for p in om.MItGeometry(shapePath).allPositions(om.MSpace.kWorld)])
+        chainPositions = numpy.array([cmds.xform(joint, query=True, worldSpace=True, translation=True)
+                                      for joint in chainJoints])
+
+        # Columns in the skinCluster's influence order. Joints are told apart by full path, since tentacles
+        # built under different groups can share short names.
+        chainSelection = om.MSelectionList()
+        for joint in chainJoints:
+            chainSelection.add(joint)
+        chainIndices = {chainSelection.getDagPath(i).fullPathName(): i for i in range(len(chainJoints))}
+        influences = fnSkin.influenceObjects()
+        columns = [chainIndices[path.fullPathName()] for path in influences]
+        weights = AutoRibbonMath.chainSkinWeights(points, chainPositions, columns, self.maxInfluences,
+                                                  self.skinFalloff)
+
+        fnComponent = om.MFnSingleIndexedComponent()
+        components = fnComponent.create(om.MFn.kMeshVertComponent)
+        fnComponent.setCompleteData(len(points))
+        fnSkin.setWeights(shapePath, components, om.MIntArray(list(range(len(influences)))),
+                          om.MDoubleArray(weights.ravel().tolist()), False)
 
     def tentacleRoll(self):
+        runSteps(self.tentacleRollSteps())
 
+    def tentacleRollSteps(self):
+        """tentacleRoll as a generator that yields after every roll network segment, for buildSteps."""
 
         # Add Roll Attribute
         cmds.addAttr(self.drvCtrl, longName='rollDivider', niceName='----- ROLL -----', attributeType='enum',
@@ -348,78 +1619,159 @@ class Tentacle:
         angleAttr = self.drvCtrl + '.Angle'
         falloffAttr = self.drvCtrl + '.Falloff'
 
+        if self.rollMode == 'solver':
+            fkCtrls = self.registered('fkCtrls')
+
+            # One solver node outputs the roll angle of every ctrl as an array plug
+            AutoRibbonPlan.loadNodesPlugin()
+            solver = cmds.createNode('autoRibbonRollSolver', name=self.prefixed('solver_m_tentacleRoll_001'))
+            cmds.connectAttr(rollAttr, solver + '.roll')
+            cmds.connectAttr(angleAttr, solver + '.angle')
+            cmds.connectAttr(falloffAttr, solver + '.falloff')
+            cmds.setAttr(solver + '.count', len(fkCtrls))
+            for i, fkCtrl in enumerate(fkCtrls):
+                cmds.connectAttr('{}.outRoll[{}]'.format(solver, i), fkCtrl + f'_grp.rotate{self.rollAxis.upper()}')
+            self.extendManifest(rollNodes=[solver])
+            return
+
         # Use a multi node to reverse falloff value for subtraction
-        mult = cmds.createNode('multDoubleLinear', name='mult_M_TentacleRollFalloffRvs_001')
+        mult = cmds.createNode('multDoubleLinear', name=self.prefixed('mult_M_TentacleRollFalloffRvs_001'))
         cmds.connectAttr(falloffAttr, mult + '.input1')
         cmds.setAttr(mult + '.input2', -1)
         falloffAttr = mult + '.output'
 
-        # fkCtrls = cmds.ls('ctrl_m_tentacle_???', type = 'transform')
-        fkCtrls = cmds.ls('drv_ctrl_m_tentacle_???', type='transform')
+        # fkCtrls = cmds.ls(self.prefixed('ctrl_m_tentacle_???'), type = 'transform')
+        fkCtrls = self.registered('fkCtrls')
         fkCtrlNum = len(fkCtrls)
 
-        # Create MASH distribute node
-        distr = cmds.createNode('MASH_Distribute', name='distribute_M_TentacleRoll_001')
-        cmds.setAttr(distr + '.pointCount', fkCtrlNum)
+        if fkCtrlNum != self.layout.ctrlCount:
+            cmds.error("Found {} FK ctrls, expected {}.".format(fkCtrlNum, self.layout.ctrlCount))
+
+        roles = {}
+        if self.weightMode == 'shared':
+            roles['rollWeights'] = self.sharedRollWeights(fkCtrlNum)
+            breakout = roles['rollWeights'][1]
+            rollNodes = [mult]
+        else:
+            # Create MASH distribute node
+            distr = cmds.createNode('MASH_Distribute', name=self.prefixed('distribute_M_TentacleRoll_001'))
+            cmds.setAttr(distr + '.pointCount', fkCtrlNum)
 
-        # set Rotate in main axis to 1 to gather weight value from 0-1
-        cmds.setAttr(distr + f'.rotate{self.rollAxis.upper()}', 1)
-        # cmds.setAttr(distr + '.rotateX', 1)
+            # set Rotate in main axis to 1 to gather weight value from 0-1
+            cmds.setAttr(distr + f'.rotate{self.rollAxis.upper()}', 1)
+            # cmds.setAttr(distr + '.rotateX', 1)
 
-        # Create breakout node
-        breakout = cmds.createNode('MASH_Breakout', name='breakout_m_tentacleRoll_001')
-        cmds.connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+            # Create breakout node
+            breakout = cmds.createNode('MASH_Breakout', name=self.prefixed('breakout_m_tentacleRoll_001'))
+            cmds.connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+            rollNodes = [mult, distr, breakout]
 
         # loop in each control to do the roll setup
+        segments = []
         for i, fkCtrl in enumerate(fkCtrls):
-            # get connect group
-            # connect = fkCtrl.replace('ctrl_', 'connect_')
-            connect = fkCtrl + '_grp'
+            segments.append(self.createRollSegment(i, fkCtrl, falloffAttr, breakout))
+            yield
+        roles.update(collectSegments(segments))
+        self.extendManifest(rollNodes=rollNodes, **roles)
+
+    def sharedRollWeights(self, count, plan=None):
+        """
+        The roll weight network shared by every tentacle with `count` FK ctrls and this roll axis. Its weights
+        are constant for a given count, so the first tentacle creates it, without prefix, and the others
+        connect to it instead of building their own.
+
+        Args:
+            count (int): Number of FK ctrls.
+            plan (BuildPlan): Plans the nodes, when missing, instead of creating them.
+
+        Returns:
+            list: The MASH_Distribute and MASH_Breakout nodes.
+        """
+        suffix = '{}{:03d}'.format(self.rollAxis.upper(), count)
+        distr = 'distribute_m_tentacleRollWeights_' + suffix
+        breakout = 'breakout_m_tentacleRollWeights_' + suffix
+        if cmds.objExists(breakout):
+            return [distr, breakout]
+        if plan:
+            plan.createNode('MASH_Distribute', distr)
+            plan.createNode('MASH_Breakout', breakout)
+        else:
+            cmds.createNode('MASH_Distribute', name=distr)
+            cmds.createNode('MASH_Breakout', name=breakout)
+        (plan or cmds).setAttr(distr + '.pointCount', count)
+        (plan or cmds).setAttr(distr + f'.rotate{self.rollAxis.upper()}', 1)
+        (plan or cmds).connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+        return [distr, breakout]
+
+    def createRollSegment(self, i, fkCtrl, falloffAttr, breakout):
+        """
+        Creates the roll weight nodes of FK ctrl `i` and connects them to its group.
+
+        Args:
+            falloffAttr (str): The reversed Falloff plug.
+            breakout (str): The roll MASH_Breakout node.
+
+        Returns:
+            dict: The created nodes by registry role.
+        """
+        rollAttr = self.drvCtrl + '.Roll'
+        angleAttr = self.drvCtrl + '.Angle'
 
-            # create remap node to roll will only happen in the given section
-            remap = cmds.createNode('remapValue', name='remap_m_tentacleRollWeight_{:03d}'.format(i + 1))
-
-            # connect tentacle roll to remap
-            cmds.connectAttr(rollAttr, remap + '.inputValue')
-            # get max value by weight
-            weightMax = 1 - float(i) / fkCtrlNum
-            cmds.setAttr(remap + '.inputMax', weightMax)
-
-            # get min value
-            weightMin = 1 - float(i + 1) / fkCtrlNum
-            # add node to subtract falloff so the joint can roll before the previous finshed
-            add = cmds.createNode('addDoubleLinear', name='add_m_TentacleRollStart_{:03d}'.format(i + 1))
-            cmds.setAttr(add + '.input1', weightMin)
-            cmds.connectAttr(falloffAttr, add + '.input2')
-            # clamp value so it wont go below 0
-            clamp = cmds.createNode('clamp', name='clamp_m_TentacleRollStart_{:03d}'.format(i + 1))
-            cmds.setAttr(clamp + '.maxR', 1)
-            cmds.connectAttr(add + '.output', clamp + '.inputR')
-            # connect with min value
-            cmds.connectAttr(clamp + '.outputR', remap + '.inputMin')
-
-            # multply divide node to mult remap weight with distribute weight to get the final roll weight for each joint
-            # because MASH doesn't work with single axis, we need to use multiply divide to breakout single axis rotation
-            multWeight = cmds.createNode('multiplyDivide', name='mult_m_TentacleRotWeight_{:03d}'.format(i + 1))
-            cmds.connectAttr(remap + '.outValue', multWeight + '.input1X')
-            cmds.connectAttr('{}.outputs[{}].rotate'.format(breakout, i), multWeight + '.input2')
-
-            # mult with roll angle to get output
-            multAngle = cmds.createNode('multDoubleLinear', name='mult_m_TentacleRotAngle_{:03d}'.format(i + 1))
-            cmds.connectAttr(multWeight + '.outputX', multAngle + '.input1')
-            cmds.connectAttr(angleAttr, multAngle + '.input2')
-
-            # connect with connect group
-            cmds.connectAttr(multAngle + '.output', connect + f'.rotate{self.rollAxis.upper()}')
+        # get connect group
+        # connect = fkCtrl.replace('ctrl_', 'connect_')
+        connect = fkCtrl + '_grp'
+
+        # create remap node to roll will only happen in the given section
+        remap = cmds.createNode('remapValue', name=self.prefixed('remap_m_tentacleRollWeight_{:03d}'.format(i + 1)))
+
+        # connect tentacle roll to remap
+        cmds.connectAttr(rollAttr, remap + '.inputValue')
+        # max value by weight
+        cmds.setAttr(remap + '.inputMax', float(self.layout.rollWeightMax[i]))
+
+        # min value
+        weightMin = float(self.layout.rollWeightMin[i])
+        # add node to subtract falloff so the joint can roll before the previous finshed
+        add = cmds.createNode('addDoubleLinear', name=self.prefixed('add_m_TentacleRollStart_{:03d}'.format(i + 1)))
+        cmds.setAttr(add + '.input1', weightMin)
+        cmds.connectAttr(falloffAttr, add + '.input2')
+        # clamp value so it wont go below 0
+        clamp = cmds.createNode('clamp', name=self.prefixed('clamp_m_TentacleRollStart_{:03d}'.format(i + 1)))
+        cmds.setAttr(clamp + '.maxR', 1)
+        cmds.connectAttr(add + '.output', clamp + '.inputR')
+        # connect with min value
+        cmds.connectAttr(clamp + '.outputR', remap + '.inputMin')
+
+        # multply divide node to mult remap weight with distribute weight to get the final roll weight for each joint
+        # because MASH doesn't work with single axis, we need to use multiply divide to breakout single axis rotation
+        multWeight = cmds.createNode('multiplyDivide', name=self.prefixed('mult_m_TentacleRotWeight_{:03d}'.format(i + 1)))
+        cmds.connectAttr(remap + '.outValue', multWeight + '.input1X')
+        cmds.connectAttr('{}.outputs[{}].rotate'.format(breakout, i), multWeight + '.input2')
+
+        # mult with roll angle to get output
+        multAngle = cmds.createNode('multDoubleLinear', name=self.prefixed('mult_m_TentacleRotAngle_{:03d}'.format(i + 1)))
+        cmds.connectAttr(multWeight + '.outputX', multAngle + '.input1')
+        cmds.connectAttr(angleAttr, multAngle + '.input2')
+
+        # connect with connect group
+        cmds.connectAttr(multAngle + '.output', connect + f'.rotate{self.rollAxis.upper()}')
+
+        return {'rollRemaps': remap, 'rollStartAdds': add, 'rollStartClamps': clamp, 'rollWeightMults': multWeight,
+                'rollAngleMults': multAngle}
 
     def tentacleRipple(self):
+        runSteps(self.tentacleRippleSteps())
+
+    def tentacleRippleSteps(self):
+        """tentacleRipple as a generator that yields after every ripple network segment, for buildSteps."""
 
         # Add attrs
         cmds.addAttr(self.drvCtrl, longName='rippleDivider', niceName='----- RIPPLE -----', attributeType='enum',
                      enumName='', keyable=False)
         cmds.setAttr(self.drvCtrl + '.rippleDivider', channelBox=True, lock=True)
         cmds.addAttr(self.drvCtrl, longName='Ripple', attributeType='float', keyable=True)
-        cmds.addAttr(self.drvCtrl, longName='RippleOut', attributeType='float', keyable=False)
+        if self.rippleMode == 'network':
+            cmds.addAttr(self.drvCtrl, longName='RippleOut', attributeType='float', keyable=False)
         cmds.addAttr(self.drvCtrl, longName='RippleFrequency', attributeType='float', keyable=True, minValue=0,
                      defaultValue=5)
         cmds.addAttr(self.drvCtrl, longName='RippleAmplitude', attributeType='float', keyable=True, minValue=1,
@@ -428,11 +1780,26 @@ class Tentacle:
         cmds.addAttr(self.drvCtrl, longName='RippleFalloff', attributeType='float', keyable=True, minValue=0,
                      maxValue=1, defaultValue=0.05)
 
-        cmds.expression(string='{}.RippleOut = ({}.Ripple + {}.RippleOffset) % {}.RippleFrequency'.format(self.drvCtrl,
-                                                                                                          self.drvCtrl,
-                                                                                                          self.drvCtrl,
-                                                                                                          self.drvCtrl),
-                        name='expr_m_rippleOut_001')
+        if self.rippleMode == 'solver':
+            jnts = self.registered('joints')
+
+            # One solver node computes RippleOut and every joint's scale without an expression.
+            # The network's scaleY output is constant 1, so only scaleX is driven.
+            AutoRibbonPlan.loadNodesPlugin()
+            solver = cmds.createNode('autoRibbonRippleSolver', name=self.prefixed('solver_m_tentacleRipple_001'))
+            for attr, solverAttr in [('Ripple', 'ripple'), ('RippleFrequency', 'frequency'),
+                                     ('RippleAmplitude', 'amplitude'), ('RippleOffset', 'offset'),
+                                     ('RippleFalloff', 'falloff')]:
+                cmds.connectAttr(self.drvCtrl + '.' + attr, solver + '.' + solverAttr)
+            cmds.setAttr(solver + '.count', len(jnts))
+            for i, j in enumerate(jnts):
+                cmds.connectAttr('{}.outScale[{}]'.format(solver, i), j + '.scaleX')
+            self.extendManifest(rippleNodes=[solver])
+            return
+
+        expression = cmds.expression(
+            string='{0}.RippleOut = ({0}.Ripple + {0}.RippleOffset) % {0}.RippleFrequency'.format(self.drvCtrl),
+            name=self.prefixed('expr_m_rippleOut_001'))
 
         rippleAttr = self.drvCtrl + '.RippleOut'
         freqAttr = self.drvCtrl + '.RippleFrequency'
@@ -441,85 +1808,117 @@ class Tentacle:
         falloffAttr = self.drvCtrl + '.RippleFalloff'
 
         # remap ripple out to 0-1
-        remap = cmds.createNode('remapValue', name='remap_m_tentacleRippleVal_001')
+        remap = cmds.createNode('remapValue', name=self.prefixed('remap_m_tentacleRippleVal_001'))
         cmds.connectAttr(rippleAttr, remap + '.inputValue')
         cmds.connectAttr(freqAttr, remap + '.inputMax')
 
         rippleAttr = remap + '.outValue'
 
         # use multDoubleLinear node to reverse falloff attr
-        multRvs = cmds.createNode('multDoubleLinear', name='mult_m_tentacleRippleNeg_001')
+        multRvs = cmds.createNode('multDoubleLinear', name=self.prefixed('mult_m_tentacleRippleNeg_001'))
         cmds.connectAttr(falloffAttr, multRvs + '.input1')
         cmds.setAttr(multRvs + '.input2', -1)
         falloffRvsAttr = multRvs + '.output'
 
-        jnts = cmds.ls('jnt_m_tentacle_???', type='transform')
+        jnts = self.registered('joints')
         jntsNum = len(jnts)
-
-        # Create MASH distribute node
-        distr = cmds.createNode('MASH_Distribute', name='distribute_m_tentacleRipple_001')
-        cmds.setAttr(distr + '.pointCount', jntsNum)
-
-        # connect scale with amplitude
-        cmds.connectAttr(ampAttr, distr + '.scaleX')
-        cmds.connectAttr(ampAttr, distr + '.scaleY')
-
-        # create breakout node
-        breakout = cmds.createNode('MASH_Breakout', name='breakout_m_tentacleRipple_001')
-        cmds.connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+        if jntsNum != self.layout.jointCount:
+            cmds.error("Found {} joints, expected {}.".format(jntsNum, self.layout.jointCount))
+
+        rippleNodes = [expression, remap, multRvs]
+        breakout = None
+        # Every point of the distribution has the amplitude as scale, so shared weights take it directly
+        if self.weightMode == 'local':
+            # Create MASH distribute node
+            distr = cmds.createNode('MASH_Distribute', name=self.prefixed('distribute_m_tentacleRipple_001'))
+            cmds.setAttr(distr + '.pointCount', jntsNum)
+
+            # connect scale with amplitude
+            cmds.connectAttr(ampAttr, distr + '.scaleX')
+            cmds.connectAttr(ampAttr, distr + '.scaleY')
+
+            # create breakout node
+            breakout = cmds.createNode('MASH_Breakout', name=self.prefixed('breakout_m_tentacleRipple_001'))
+            cmds.connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+            rippleNodes += [distr, breakout]
 
         # loop in each joint
-        unitVal = 1 / float(jntsNum + 1)
+        segments = []
         for i, j in enumerate(jnts):
-            # create remap node to do wave effect
-            remapJnt = cmds.createNode('remapValue', name='remap_m_tentacleRipple_{:03d}'.format(i + 1))
-
-            cmds.connectAttr(rippleAttr, remapJnt + '.inputValue')
-
-            # set Remap Position
-            cmds.setAttr(remapJnt + '.value[1].value_Position', (i + 0.5) * unitVal)
-            cmds.setAttr(remapJnt + '.value[1].value_FloatValue', 1)
-            cmds.setAttr(remapJnt + '.value[1].value_Interp', 2)
-
-            # Set in and out point, default should be half unit
-            addIn = cmds.createNode('addDoubleLinear', name='add_m_tentacleRippleIn_{:03d}'.format(i + 1))
-            addOut = cmds.createNode('addDoubleLinear', name='add_m_tentacleRippleOut_{:03d}'.format(i + 1))
-
-            cmds.setAttr(addIn + '.input1', i * unitVal)
-            cmds.setAttr(addOut + '.input1', (i + 1) * unitVal)
-
-            cmds.connectAttr(falloffRvsAttr, addIn + '.input2')
-            cmds.connectAttr(falloffAttr, addOut + '.input2')
-
-            # clamp the output in 0-1
-            clamp = cmds.createNode('clamp', name='clamp_m_tentacleRipple_{:03d}'.format(i + 1))
-            cmds.connectAttr(addIn + '.output', clamp + '.inputR')
-            cmds.connectAttr(addOut + '.output', clamp + '.inputG')
-            cmds.setAttr(clamp + '.maxR', 1)
-            cmds.setAttr(clamp + '.maxG', 1)
-
-            # connect clamp output to point position
-            cmds.connectAttr(clamp + '.outputR', remapJnt + '.value[0].value_Position')
-            cmds.setAttr(remapJnt + '.value[0].value_FloatValue', 0)
-            cmds.setAttr(remapJnt + '.value[0].value_Interp', 2)
-            cmds.connectAttr(clamp + '.outputG', remapJnt + '.value[2].value_Position')
-            cmds.setAttr(remapJnt + '.value[2].value_FloatValue', 0)
-            cmds.setAttr(remapJnt + '.value[2].value_Interp', 2)
-
-            # connect output ripple weight with MASH distribute node
-            blendRipple = cmds.createNode('blendColors', name='blend_m_tentacleRippleScale_{:03d}'.format(i + 1))
-            cmds.connectAttr(remapJnt + '.outValue', blendRipple + '.blender')
+            segments.append(self.createRippleSegment(i, j, rippleAttr, falloffRvsAttr, breakout))
+            yield
+        self.extendManifest(rippleNodes=rippleNodes, **collectSegments(segments))
+
+    def createRippleSegment(self, i, joint, rippleAttr, falloffRvsAttr, breakout):
+        """
+        Creates the ripple wave nodes of joint `i` and connects them to its scale.
+
+        Args:
+            rippleAttr (str): The 0-1 remapped RippleOut plug.
+            falloffRvsAttr (str): The reversed RippleFalloff plug.
+            breakout (str): The ripple MASH_Breakout node, None to scale by RippleAmplitude directly.
+
+        Returns:
+            dict: The created nodes by registry role.
+        """
+        falloffAttr = self.drvCtrl + '.RippleFalloff'
+
+        # create remap node to do wave effect
+        remapJnt = cmds.createNode('remapValue', name=self.prefixed('remap_m_tentacleRipple_{:03d}'.format(i + 1)))
+
+        cmds.connectAttr(rippleAttr, remapJnt + '.inputValue')
+
+        # set Remap Position
+        cmds.setAttr(remapJnt + '.value[1].value_Position', float(self.layout.ripplePeak[i]))
+        cmds.setAttr(remapJnt + '.value[1].value_FloatValue', 1)
+        cmds.setAttr(remapJnt + '.value[1].value_Interp', 2)
+
+        # Set in and out point, default should be half unit
+        addIn = cmds.createNode('addDoubleLinear', name=self.prefixed('add_m_tentacleRippleIn_{:03d}'.format(i + 1)))
+        addOut = cmds.createNode('addDoubleLinear', name=self.prefixed('add_m_tentacleRippleOut_{:03d}'.format(i + 1)))
+
+        cmds.setAttr(addIn + '.input1', float(self.layout.rippleStart[i]))
+        cmds.setAttr(addOut + '.input1', float(self.layout.rippleEnd[i]))
+
+        cmds.connectAttr(falloffRvsAttr, addIn + '.input2')
+        cmds.connectAttr(falloffAttr, addOut + '.input2')
+
+        # clamp the output in 0-1
+        clamp = cmds.createNode('clamp', name=self.prefixed('clamp_m_tentacleRipple_{:03d}'.format(i + 1)))
+        cmds.connectAttr(addIn + '.output', clamp + '.inputR')
+        cmds.connectAttr(addOut + '.output', clamp + '.inputG')
+        cmds.setAttr(clamp + '.maxR', 1)
+        cmds.setAttr(clamp + '.maxG', 1)
+
+        # connect clamp output to point position
+        cmds.connectAttr(clamp + '.outputR', remapJnt + '.value[0].value_Position')
+        cmds.setAttr(remapJnt + '.value[0].value_FloatValue', 0)
+        cmds.setAttr(remapJnt + '.value[0].value_Interp', 2)
+        cmds.connectAttr(clamp + '.outputG', remapJnt + '.value[2].value_Position')
+        cmds.setAttr(remapJnt + '.value[2].value_FloatValue', 0)
+        cmds.setAttr(remapJnt + '.value[2].value_Interp', 2)
+
+        # connect output ripple weight with MASH distribute node
+        blendRipple = cmds.createNode('blendColors', name=self.prefixed('blend_m_tentacleRippleScale_{:03d}'.format(i + 1)))
+        cmds.connectAttr(remapJnt + '.outValue', blendRipple + '.blender')
+        if breakout:
             cmds.connectAttr('{}.outputs[{}].scale'.format(breakout, i), blendRipple + '.color1')
-            cmds.setAttr(blendRipple + '.color2', 1, 1, 1)
+        else:
+            cmds.setAttr(blendRipple + '.color1', 1, 1, 1)
+            cmds.connectAttr(self.drvCtrl + '.RippleAmplitude', blendRipple + '.color1G')
+        cmds.setAttr(blendRipple + '.color2', 1, 1, 1)
+
+        cmds.connectAttr(blendRipple + '.outputG', joint + '.scaleX')
+        cmds.connectAttr(blendRipple + '.outputB', joint + '.scaleY')
 
-            cmds.connectAttr(blendRipple + '.outputG', j + '.scaleX')
-            cmds.connectAttr(blendRipple + '.outputB', j + '.scaleY')
+        return {'rippleRemaps': remapJnt, 'rippleInAdds': addIn, 'rippleOutAdds': addOut, 'rippleClamps': clamp,
+                'rippleBlends': blendRipple}
 
     def tentacleRibbonDeformer(self):
 
-        endDrvCtrlName = "CTRL_M_TentacleDrv_End_001"
+        endDrvCtrlName = self.prefixed("CTRL_M_TentacleDrv_End_001")
         # endDrvCtrl = cmds.circle(name=endDrvCtrlName, normal=self.axisVector, radius=self.tentacleLength / 3.0)[0]
-        endDrvCtrl = createSquareCurve(name=endDrvCtrlName, size=self.tentacleLength / 3.0)
+        endDrvCtrl = createSquareCurve(name=endDrvCtrlName, size=self.layout.endCtrlSize)
         cmds.setAttr(f"{endDrvCtrl}.overrideEnabled", 1)
         cmds.setAttr(f"{endDrvCtrl}.overrideColor", self.CTRL_COLOR['r'])
 
@@ -529,25 +1928,14 @@ class Tentacle:
         # Put the ctrl into a group
         cmds.parent(endDrvCtrlGroup, self.drvCtrl)
 
-        # Create a node group
-        nodeGroup = cmds.createNode("transform", name=f"{self.modelName}_nodeGroup")
-
-        ### Add Twist Deformer
+        ### Add Twist Attributes
         cmds.addAttr(self.drvCtrl, longName='twistDivider', niceName='----- TWIST -----', attributeType='enum',
                      enumName='', keyable=False)
         cmds.setAttr(self.drvCtrl + '.twistDivider', channelBox=True, lock=True)
         cmds.addAttr(self.drvCtrl, longName='Twist', attributeType='float', keyable=True)
         cmds.addAttr(endDrvCtrl, longName='Twist', attributeType='float', keyable=True)
-        # Twist Deformer
-        twistNode, twistHandle = cmds.nonLinear(self.surface, type='twist',
-                                                name=self.surface.replace('surface', 'twist'))
-        cmds.parent(twistHandle, nodeGroup)
-        # Connect Twist Attr to drvCtrl and endDrvCtrl
-        twistHandleShape = cmds.listRelatives(twistHandle, shapes=True)[0]
-        cmds.connectAttr(self.drvCtrl + '.Twist', twistNode + '.endAngle')
-        cmds.connectAttr(endDrvCtrl + '.Twist', twistNode + '.startAngle')
 
-        ### Add Sine Deformer
+        ### Add Sine Attributes
         cmds.addAttr(self.drvCtrl, longName='sineDivider', niceName='----- SINE -----', attributeType='enum',
                      enumName='', keyable=False)
         cmds.setAttr(self.drvCtrl + '.sineDivider', channelBox=True, lock=True)
@@ -556,7 +1944,35 @@ class Tentacle:
                      defaultValue=1)
         cmds.addAttr(self.drvCtrl, longName='Offset', attributeType='float', keyable=True)
         cmds.addAttr(self.drvCtrl, longName='SineRotation', attributeType='float', keyable=True)
+
+        if self.deformerMode == 'fused':
+            deformers = [self.createTwistSineDeformer(endDrvCtrl)]
+        else:
+            deformers = self.createNonLinearDeformers(endDrvCtrl)
+
+        self.extendManifest(endDrvCtrl=[endDrvCtrl], endDrvCtrlGroup=[endDrvCtrlGroup], deformers=deformers)
+
+    def createNonLinearDeformers(self, endDrvCtrl):
+        """
+        Deforms the ribbon with a twist and a sine deformer, their handles in a hidden node group under the
+        driver control.
+
+        Returns:
+            list: The twist and sine deformer nodes.
+        """
+        # Create a node group
+        nodeGroup = cmds.createNode("transform", name=self.prefixed(f"{self.modelName}_nodeGroup"))
+
         # Twist Deformer
+        twistNode, twistHandle = cmds.nonLinear(self.surface, type='twist',
+                                                name=self.surface.replace('surface', 'twist'))
+        cmds.parent(twistHandle, nodeGroup)
+        # Connect Twist Attr to drvCtrl and endDrvCtrl
+        twistHandleShape = cmds.listRelatives(twistHandle, shapes=True)[0]
+        cmds.connectAttr(self.drvCtrl + '.Twist', twistNode + '.endAngle')
+        cmds.connectAttr(endDrvCtrl + '.Twist', twistNode + '.startAngle')
+
+        # Sine Deformer
         sineNode, sineHandle = cmds.nonLinear(self.surface, type='sine', name=self.surface.replace('surface', 'sine'))
         cmds.parent(sineHandle, nodeGroup)
         # Rotate the sine handle. if primary axis is Y, don't rotate the handle, if X, rotateZ = 90; if Z, rotateX = 90
@@ -577,24 +1993,618 @@ class Tentacle:
 
         # Put Node Group under self.drvCtrl
         cmds.parent(nodeGroup, self.drvCtrl)
+        self.register(deformerGroup=[nodeGroup])
 
 
         #Hide node group and deformers
         cmds.setAttr(nodeGroup + '.visibility', 0)
 
-def createSquareCurve(name="squareCurve", size=1.0):
-    # 定义正方形的顶点坐标
-    points = [
-        (-size, 0, -size),  # 左下角
-        (-size, 0, size),  # 左上角
-        (size, 0, size),  # 右上角
-        (size, 0, -size),  # 右下角
-        (-size, 0, -size)  # 回到左下角，闭合
-    ]
+        return [twistNode, sineNode]
+
+    def createTwistSineDeformer(self, endDrvCtrl):
+        """
+        Deforms the ribbon with one autoRibbonTwistSine node, which applies the twist and the sine of
+        createNonLinearDeformers in a single pass over the surface points, without handles.
+
+        Returns:
+            str: The deformer node.
+        """
+        AutoRibbonPlan.loadNodesPlugin()
+        deformer = cmds.deformer(self.surface, type='autoRibbonTwistSine',
+                                 name=self.surface.replace('surface', 'twistSine'))[0]
+        cmds.setAttr(deformer + '.primaryAxis', 'xyz'.index(self.primaryAxis))
+        cmds.setAttr(deformer + '.length', self.layout.tentacleLength)
+        cmds.setAttr(deformer + '.dropoff', 1)
+        cmds.connectAttr(self.drvCtrl + '.Twist', deformer + '.endAngle')
+        cmds.connectAttr(endDrvCtrl + '.Twist', deformer + '.startAngle')
+        for attr in ('Amplitude', 'Wavelength', 'Offset', 'SineRotation'):
+            cmds.connectAttr(f"{self.drvCtrl}.{attr}", f"{deformer}.{attr[0].lower()}{attr[1:]}")
+        return deformer
+
+    def tentacleLod(self):
+        """
+        Adds the LOD enum to the driver control. Every level above Full turns more of the rig off in bulk:
+        NoRipple the ripple network, FKOnly also the roll network and the deformers, Frozen also the joint
+        attachments and the skinClusters, so a background tentacle costs next to nothing per frame. One
+        condition node per level drives the nodeState or envelope of all its nodes. Turned off nodes hold
+        their last output, so levels are best switched in a rest pose.
+        """
+        cmds.addAttr(self.drvCtrl, longName='lodDivider', niceName='----- LOD -----', attributeType='enum',
+                     enumName='', keyable=False)
+        cmds.setAttr(self.drvCtrl + '.lodDivider', channelBox=True, lock=True)
+        cmds.addAttr(self.drvCtrl, longName='LOD', attributeType='enum', enumName=':'.join(LOD_LEVELS), keyable=True)
+
+        gates = []
+        for level in range(1, len(LOD_LEVELS)):
+            gate = cmds.createNode('condition', name=self.prefixed('condition_m_tentacleLod_{:03d}'.format(level)))
+            cmds.connectAttr(self.drvCtrl + '.LOD', gate + '.firstTerm')
+            cmds.setAttr(gate + '.secondTerm', level)
+            # Greater or Equal: R is the nodeState (2 blocks the node), G the envelope
+            cmds.setAttr(gate + '.operation', 3)
+            cmds.setAttr(gate + '.colorIfTrue', 2, 0, 0)
+            cmds.setAttr(gate + '.colorIfFalse', 0, 1, 0)
+            gates.append(gate)
+        self.extendManifest(lodNodes=gates)
+        self.gateLodNodes()
+
+    def gateLodNodes(self, skipGated=False):
+        """
+        Connects the nodes of every LOD_ROLES level to the level's condition node.
+
+        Args:
+            skipGated (bool): Leave nodes whose gate plug is connected already, for the segments and
+                skinClusters updateRig kept.
+        """
+        for gate, roles in zip(self.registered('lodNodes'), LOD_ROLES):
+            for role in roles:
+                attr, output = ('envelope', 'outColorG') if role == 'deformers' else ('nodeState', 'outColorR')
+                for node in self.registry.get(role, []):
+                    if skipGated and cmds.listConnections(node + '.' + attr, source=True, destination=False):
+                        continue
+                    cmds.connectAttr(gate + '.' + output, node + '.' + attr)
+
+    def buildPlanned(self, backend=None):
+        """
+        Builds setUpTentacleFK, tentacleRoll and tentacleRipple as one BuildPlan committed in a single batch.
+
+        Args:
+            backend: Plan backend, defaults to self.backend or a MayaModifierBackend.
+
+        Returns:
+            list: The driver joints.
+        """
+        self.axisVector = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}[self.primaryAxis]
+
+        cmds.undoInfo(openChunk=True, chunkName='autoRibbonBuild')
+        try:
+            surfaceShape = self.createRibbonSurface()
+            if self.samplingMode == 'arcLength':
+                self.sampleRibbonCurve()
+            plan, joints, drvJoints = self.buildPlan(surfaceShape)
+            (backend or self.backend or AutoRibbonPlan.MayaModifierBackend()).commit(plan)
+            self.bindRibbon(drvJoints, joints)
+            self.storeManifest()
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        return drvJoints
+
+    def buildPlan(self, surfaceShape=None):
+        """
+        Plans the FK, roll and ripple stages without touching the scene.
+
+        Returns:
+            tuple: (plan, joints, drvJoints)
+        """
+        self.axisVector = {'x': (1, 0, 0), 'y': (0, 1, 0), 'z': (0, 0, 1)}[self.primaryAxis]
+        plan = AutoRibbonPlan.BuildPlan()
+        joints, drvJoints, ctrls = self.planTentacleFK(plan, surfaceShape or self.surface + 'Shape')
+        self.planRoll(plan, ctrls)
+        self.planRipple(plan, joints)
+        return plan, joints, drvJoints
+
+    def planTentacleFK(self, plan, surfaceShape):
+        # Joint orient replaces rotate + makeIdentity of setUpTentacleFK
+        jointOrient = self.layout.jointOrient
+        parametersU = self.layout.follicleU.tolist()
+        parametersV = self.layout.follicleV.tolist()
+
+        if self.attachMode == 'uvPin':
+            pin = plan.createNode('uvPin', self.prefixed('uvPin_m_tentacle_001'))
+            plan.connectAttr(surfaceShape + '.worldSpace[0]', pin + '.deformedGeometry')
+            normalAxis, tangentAxis = self.uvPinAxes()
+            plan.setAttr(pin + '.normalAxis', normalAxis)
+            plan.setAttr(pin + '.tangentAxis', tangentAxis)
+        else:
+            follicleGroup = plan.createNode('transform', self.prefixed("follicle_Group"))
+        jointGroup = plan.createNode('transform', self.prefixed(f"{self.modelName}_jointGroup"))
+        joints = []
+        jointZeroGroups = []
+        drvJoints = []
+        follicles = []
+        follicleShapes = []
+        jointConstraints = []
+
+        for i in range(self.jointCount):
+            jointName = self.prefixed("jnt_m_tentacle_{:03d}".format(i + 1))
+            if self.attachMode == 'uvPin':
+                # Zero group follows its pin, the joints need no orient or constraint
+                plan.setAttr('{}.coordinate[{}]'.format(pin, i), parametersU[i], parametersV[i])
+                jointZeroGroup = plan.createNode('transform', f"Zero_{jointName}", parent=jointGroup)
+                plan.connectAttr('{}.outputMatrix[{}]'.format(pin, i), jointZeroGroup + '.offsetParentMatrix')
+                joints.append(plan.createNode('joint', jointName, parent=jointZeroGroup))
+                jointZeroGroups.append(jointZeroGroup)
+
+                drvJoint = plan.createNode('joint', self.prefixed("drv_jnt_m_tentacle_{:03d}".format(i + 1)), parent=jointGroup)
+                plan.matchTransform(drvJoint, jointZeroGroup)
+                drvJoints.append(drvJoint)
+                continue
+
+            # create follicles
+            follicleShape = self.prefixed("follicleShape_m_tentacle_{:03d}".format(i + 1))
+            follicle = plan.createNode('follicle', self.prefixed("follicle_m_tentacle_{:03d}".format(i + 1)), parent=follicleGroup,
+                                       shapeName=follicleShape)
+            plan.connectAttr(surfaceShape + '.worldSpace[0]', follicleShape + '.inputSurface')
+            plan.connectAttr(follicleShape + '.outTranslate', follicle + '.translate')
+            plan.connectAttr(follicleShape + '.outRotate', follicle + '.rotate')
+            plan.setAttr(follicleShape + '.parameterU', parametersU[i])
+            plan.setAttr(follicleShape + '.parameterV', parametersV[i])
+
+            # Bind joint in its zero group, driver joint directly under the joint group
+            jointZeroGroup = plan.createNode('transform', f"Zero_{jointName}", parent=jointGroup)
+            joint = plan.createNode('joint', jointName, parent=jointZeroGroup)
+            plan.setAttr(joint + '.jointOrient', *jointOrient)
+            joints.append(joint)
+            jointZeroGroups.append(jointZeroGroup)
 
+            drvJoint = plan.createNode('joint', self.prefixed("drv_jnt_m_tentacle_{:03d}".format(i + 1)), parent=jointGroup)
+            plan.setAttr(drvJoint + '.jointOrient', *jointOrient)
+            drvJoints.append(drvJoint)
+
+            # Move joints to follicle's position and use follicle to constraint the bind joint
+            plan.matchTransform(jointZeroGroup, follicle)
+            plan.matchTransform(drvJoint, follicle)
+            attachType = 'matrix' if self.wiringMode == 'matrix' else 'parent'
+            jointConstraints.append(plan.constrain(attachType, follicle, joint, maintainOffset=True))
+            follicles.append(follicle)
+            follicleShapes.append(follicleShape)
+
+        # Main drvCtrl, created first so the ctrl groups can be planned under it
+        drvCtrl = plan.createNode('nurbsCurve', self.prefixed("CTRL_M_TentacleDrv_001"))
+        drvCtrlScale = self.layout.drvCtrlScale
+        curve = AutoRibbonShapes.shapeCurve('arrow', drvCtrlScale)
+        plan.setCurve(drvCtrl + 'Shape', curve['points'], curve['degree'], curve['knots'])
+        plan.setAttr(f"{drvCtrl}.overrideEnabled", 1)
+        plan.setAttr(f"{drvCtrl}.overrideColor", self.CTRL_COLOR['r'])
+        self.drvCtrl = drvCtrl
+
+        # Create controllers and groups, each group under the previous ctrl
+        ctrls = []
+        ctrlGroups = []
+        drvJointMatrices = []
+        owners = self.ctrlShapeOwners()
+        for i, drvJoint in enumerate(drvJoints[:-1]):
+            ctrl = drvJoint.replace("jnt", "ctrl")
+            ctrlGroup = plan.createNode('transform', f"{ctrl}_grp", parent=ctrls[-1] if ctrls else drvCtrl)
+            self.planCtrlShape(plan, i, ctrl, owners, parent=ctrlGroup)
+            ctrls.append(ctrl)
+            ctrlGroups.append(ctrlGroup)
+
+            plan.matchTransform(ctrlGroup, drvJoint)
+            if self.wiringMode == 'matrix':
+                drvJointMatrices.append(plan.constrain('matrix', ctrl, drvJoint))
+            else:
+                plan.constrain('parent', ctrl, drvJoint, maintainOffset=True)
+                plan.constrain('scale', ctrl, drvJoint)
+
+        # Use the last ctrl to constraint the final joint besides the previous joint
+        if self.wiringMode == 'matrix':
+            drvJointMatrices.append(plan.constrain('matrix', ctrls[-1], drvJoints[-1], maintainOffset=True))
+        else:
+            plan.constrain('parent', ctrls[-1], drvJoints[-1], maintainOffset=True)
+
+        # Pinned zero groups take world matrices from the uvPin, so they get the scale themselves
+        scaledGroups = jointZeroGroups if self.attachMode == 'uvPin' else [jointGroup]
+        for axis in 'xyz':
+            if axis != self.primaryAxis:
+                for scaledGroup in scaledGroups:
+                    plan.connectAttr(drvCtrl + f'.scale{axis.upper()}', scaledGroup + f'.scale{axis.upper()}')
+
+        self.register(drvCtrl=[drvCtrl], surface=[surfaceShape], jointGroup=[jointGroup], joints=joints,
+                      jointZeroGroups=jointZeroGroups, drvJoints=drvJoints, fkCtrls=ctrls, fkCtrlGroups=ctrlGroups)
+        if self.wiringMode == 'matrix':
+            self.register(drvJointMatrices=drvJointMatrices)
+        if self.attachMode == 'uvPin':
+            self.register(uvPin=[pin])
+        else:
+            self.register(follicleGroup=[follicleGroup], follicles=follicles, follicleShapes=follicleShapes,
+                          **{'jointMatrices' if self.wiringMode == 'matrix' else 'jointConstraints': jointConstraints})
+
+        return joints, drvJoints, ctrls
+
+    def planRoll(self, plan, fkCtrls):
+        plan.addAttr(self.drvCtrl, 'rollDivider', 'enum', niceName='----- ROLL -----', enumName='', keyable=False,
+                     channelBox=True, lock=True)
+        rollAttr = plan.addAttr(self.drvCtrl, 'Roll', 'float', minValue=0, maxValue=1, keyable=True)
+        angleAttr = plan.addAttr(self.drvCtrl, 'Angle', 'float', defaultValue=-70, keyable=True)
+        falloffAttr = plan.addAttr(self.drvCtrl, 'Falloff', 'float', minValue=0, maxValue=1, keyable=True)
+
+        if self.rollMode == 'solver':
+            solver = plan.createNode('autoRibbonRollSolver', self.prefixed('solver_m_tentacleRoll_001'))
+            plan.connectAttr(rollAttr, solver + '.roll')
+            plan.connectAttr(angleAttr, solver + '.angle')
+            plan.connectAttr(falloffAttr, solver + '.falloff')
+            plan.setAttr(solver + '.count', len(fkCtrls))
+            for i, fkCtrl in enumerate(fkCtrls):
+                plan.connectAttr('{}.outRoll[{}]'.format(solver, i), fkCtrl + f'_grp.rotate{self.rollAxis.upper()}')
+            self.register(rollNodes=[solver])
+            return
+
+        # Use a multi node to reverse falloff value for subtraction
+        mult = plan.createNode('multDoubleLinear', self.prefixed('mult_M_TentacleRollFalloffRvs_001'))
+        plan.connectAttr(falloffAttr, mult + '.input1')
+        plan.setAttr(mult + '.input2', -1)
+        falloffAttr = mult + '.output'
+
+        fkCtrlNum = len(fkCtrls)
+        weightsMin = self.layout.rollWeightMin.tolist()
+        weightsMax = self.layout.rollWeightMax.tolist()
+
+        roles = {}
+        if self.weightMode == 'shared':
+            roles['rollWeights'] = self.sharedRollWeights(fkCtrlNum, plan)
+            breakout = roles['rollWeights'][1]
+            rollNodes = [mult]
+        else:
+            # MASH distribute gathers the 0-1 weight in the roll axis
+            distr = plan.createNode('MASH_Distribute', self.prefixed('distribute_M_TentacleRoll_001'))
+            plan.setAttr(distr + '.pointCount', fkCtrlNum)
+            plan.setAttr(distr + f'.rotate{self.rollAxis.upper()}', 1)
+            breakout = plan.createNode('MASH_Breakout', self.prefixed('breakout_m_tentacleRoll_001'))
+            plan.connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+            rollNodes = [mult, distr, breakout]
+
+        segments = []
+        for i, fkCtrl in enumerate(fkCtrls):
+            connect = fkCtrl + '_grp'
+
+            remap = plan.createNode('remapValue', self.prefixed('remap_m_tentacleRollWeight_{:03d}'.format(i + 1)))
+            plan.connectAttr(rollAttr, remap + '.inputValue')
+            plan.setAttr(remap + '.inputMax', weightsMax[i])
+
+            add = plan.createNode('addDoubleLinear', self.prefixed('add_m_TentacleRollStart_{:03d}'.format(i + 1)))
+            plan.setAttr(add + '.input1', weightsMin[i])
+            plan.connectAttr(falloffAttr, add + '.input2')
+            clamp = plan.createNode('clamp', self.prefixed('clamp_m_TentacleRollStart_{:03d}'.format(i + 1)))
+            plan.setAttr(clamp + '.maxR', 1)
+            plan.connectAttr(add + '.output', clamp + '.inputR')
+            plan.connectAttr(clamp + '.outputR', remap + '.inputMin')
+
+            multWeight = plan.createNode('multiplyDivide', self.prefixed('mult_m_TentacleRotWeight_{:03d}'.format(i + 1)))
+            plan.connectAttr(remap + '.outValue', multWeight + '.input1X')
+            plan.connectAttr('{}.outputs[{}].rotate'.format(breakout, i), multWeight + '.input2')
+
+            multAngle = plan.createNode('multDoubleLinear', self.prefixed('mult_m_TentacleRotAngle_{:03d}'.format(i + 1)))
+            plan.connectAttr(multWeight + '.outputX', multAngle + '.input1')
+            plan.connectAttr(angleAttr, multAngle + '.input2')
+
+            plan.connectAttr(multAngle + '.output', connect + f'.rotate{self.rollAxis.upper()}')
+            segments.append({'rollRemaps': remap, 'rollStartAdds': add, 'rollStartClamps': clamp,
+                             'rollWeightMults': multWeight, 'rollAngleMults': multAngle})
+
+        roles.update(collectSegments(segments))
+        self.register(rollNodes=rollNodes, **roles)
+
+    def planRipple(self, plan, jnts):
+        plan.addAttr(self.drvCtrl, 'rippleDivider', 'enum', niceName='----- RIPPLE -----', enumName='',
+                     keyable=False, channelBox=True, lock=True)
+        plan.addAttr(self.drvCtrl, 'Ripple', 'float', keyable=True)
+        if self.rippleMode == 'network':
+            rippleAttr = plan.addAttr(self.drvCtrl, 'RippleOut', 'float', keyable=False)
+        freqAttr = plan.addAttr(self.drvCtrl, 'RippleFrequency', 'float', keyable=True, minValue=0, defaultValue=5)
+        ampAttr = plan.addAttr(self.drvCtrl, 'RippleAmplitude', 'float', keyable=True, minValue=1,
+                               defaultValue=1.5)
+        plan.addAttr(self.drvCtrl, 'RippleOffset', 'float', keyable=True)
+        falloffAttr = plan.addAttr(self.drvCtrl, 'RippleFalloff', 'float', keyable=True, minValue=0, maxValue=1,
+                                   defaultValue=0.05)
+
+        if self.rippleMode == 'solver':
+            solver = plan.createNode('autoRibbonRippleSolver', self.prefixed('solver_m_tentacleRipple_001'))
+            for attr, solverAttr in [('Ripple', 'ripple'), ('RippleFrequency', 'frequency'),
+                                     ('RippleAmplitude', 'amplitude'), ('RippleOffset', 'offset'),
+                                     ('RippleFalloff', 'falloff')]:
+                plan.connectAttr(self.drvCtrl + '.' + attr, solver + '.' + solverAttr)
+            plan.setAttr(solver + '.count', len(jnts))
+            for i, j in enumerate(jnts):
+                plan.connectAttr('{}.outScale[{}]'.format(solver, i), j + '.scaleX')
+            self.register(rippleNodes=[solver])
+            return
+
+        expression = plan.expression(self.prefixed('expr_m_rippleOut_001'),
+                                     '{0}.RippleOut = ({0}.Ripple + {0}.RippleOffset) % {0}.RippleFrequency'.format(self.drvCtrl))
+
+        # remap ripple out to 0-1
+        remap = plan.createNode('remapValue', self.prefixed('remap_m_tentacleRippleVal_001'))
+        plan.connectAttr(rippleAttr, remap + '.inputValue')
+        plan.connectAttr(freqAttr, remap + '.inputMax')
+        rippleAttr = remap + '.outValue'
+
+        multRvs = plan.createNode('multDoubleLinear', self.prefixed('mult_m_tentacleRippleNeg_001'))
+        plan.connectAttr(falloffAttr, multRvs + '.input1')
+        plan.setAttr(multRvs + '.input2', -1)
+        falloffRvsAttr = multRvs + '.output'
+
+        jntsNum = len(jnts)
+
+        rippleNodes = [expression, remap, multRvs]
+        if self.weightMode == 'local':
+            distr = plan.createNode('MASH_Distribute', self.prefixed('distribute_m_tentacleRipple_001'))
+            plan.setAttr(distr + '.pointCount', jntsNum)
+            plan.connectAttr(ampAttr, distr + '.scaleX')
+            plan.connectAttr(ampAttr, distr + '.scaleY')
+            breakout = plan.createNode('MASH_Breakout', self.prefixed('breakout_m_tentacleRipple_001'))
+            plan.connectAttr(distr + '.outputPoints', breakout + '.inputPoints')
+            rippleNodes += [distr, breakout]
+
+        rippleStarts = self.layout.rippleStart.tolist()
+        ripplePeaks = self.layout.ripplePeak.tolist()
+        rippleEnds = self.layout.rippleEnd.tolist()
+        segments = []
+        for i, j in enumerate(jnts):
+            remapJnt = plan.createNode('remapValue', self.prefixed('remap_m_tentacleRipple_{:03d}'.format(i + 1)))
+            plan.connectAttr(rippleAttr, remapJnt + '.inputValue')
+            plan.setAttr(remapJnt + '.value[1].value_Position', ripplePeaks[i])
+            plan.setAttr(remapJnt + '.value[1].value_FloatValue', 1)
+            plan.setAttr(remapJnt + '.value[1].value_Interp', 2)
+
+            addIn = plan.createNode('addDoubleLinear', self.prefixed('add_m_tentacleRippleIn_{:03d}'.format(i + 1)))
+            addOut = plan.createNode('addDoubleLinear', self.prefixed('add_m_tentacleRippleOut_{:03d}'.format(i + 1)))
+            plan.setAttr(addIn + '.input1', rippleStarts[i])
+            plan.setAttr(addOut + '.input1', rippleEnds[i])
+            plan.connectAttr(falloffRvsAttr, addIn + '.input2')
+            plan.connectAttr(falloffAttr, addOut + '.input2')
+
+            clamp = plan.createNode('clamp', self.prefixed('clamp_m_tentacleRipple_{:03d}'.format(i + 1)))
+            plan.connectAttr(addIn + '.output', clamp + '.inputR')
+            plan.connectAttr(addOut + '.output', clamp + '.inputG')
+            plan.setAttr(clamp + '.maxR', 1)
+            plan.setAttr(clamp + '.maxG', 1)
+
+            plan.connectAttr(clamp + '.outputR', remapJnt + '.value[0].value_Position')
+            plan.setAttr(remapJnt + '.value[0].value_FloatValue', 0)
+            plan.setAttr(remapJnt + '.value[0].value_Interp', 2)
+            plan.connectAttr(clamp + '.outputG', remapJnt + '.value[2].value_Position')
+            plan.setAttr(remapJnt + '.value[2].value_FloatValue', 0)
+            plan.setAttr(remapJnt + '.value[2].value_Interp', 2)
+
+            blendRipple = plan.createNode('blendColors', self.prefixed('blend_m_tentacleRippleScale_{:03d}'.format(i + 1)))
+            plan.connectAttr(remapJnt + '.outValue', blendRipple + '.blender')
+            if self.weightMode == 'local':
+                plan.connectAttr('{}.outputs[{}].scale'.format(breakout, i), blendRipple + '.color1')
+            else:
+                plan.setAttr(blendRipple + '.color1', 1, 1, 1)
+                plan.connectAttr(ampAttr, blendRipple + '.color1G')
+            plan.setAttr(blendRipple + '.color2', 1, 1, 1)
+
+            plan.connectAttr(blendRipple + '.outputG', j + '.scaleX')
+            plan.connectAttr(blendRipple + '.outputB', j + '.scaleY')
+            segments.append({'rippleRemaps': remapJnt, 'rippleInAdds': addIn, 'rippleOutAdds': addOut,
+                             'rippleClamps': clamp, 'rippleBlends': blendRipple})
+
+        self.register(rippleNodes=rippleNodes, **collectSegments(segments))
+
+
+def buildTentacles(specs, processes=None):
+    """
+    Builds many tentacles in one pass, e.g. all arms of a creature.
+
+    The layouts are precomputed in a process pool, then every tentacle is built inside one undo chunk
+    with the viewport refresh suspended. A tentacle whose ribbon curve does not exist yet gets the
+    default straight one.
+
+    Args:
+        specs (list): Tentacle keyword argument dicts. Each needs its own 'prefix' so the node names
+            of the tentacles do not collide.
+        processes (int): Worker count of the layout pool, see AutoRibbonLayout.computeLayouts.
+
+    Returns:
+        list: The built Tentacles, in spec order.
+    """
+    prefixes = [spec.get('prefix', '') for spec in specs]
+    if len(set(prefixes)) != len(prefixes):
+        cmds.error("Every tentacle of a batch needs its own prefix.")
+
+    layouts = AutoRibbonLayout.computeLayouts(specs, processes)
+    tentacles = [Tentacle(layout=layout, **spec) for spec, layout in zip(specs, layouts)]
+    # One snapshot of the scene's names checks all tentacles, missing ribbon curves are created below
+    existing = sceneNames()
+    for tentacle in tentacles:
+        tentacle.checkBuild(existing | {tentacle.ribbonCurve})
+
+    cmds.undoInfo(openChunk=True, chunkName='autoRibbonBuildTentacles')
+    cmds.refresh(suspend=True)
+    try:
+        for tentacle in tentacles:
+            if not cmds.objExists(tentacle.ribbonCurve):
+                tentacle.createRibbonCurve()
+            runSteps(tentacle.buildSteps())
+    finally:
+        cmds.refresh(suspend=False)
+        cmds.undoInfo(closeChunk=True)
+    return tentacles
+
+
+def runSteps(steps):
+    """Runs a build stage generator to its end and returns its return value."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class ChunkedBuild(object):
+    """
+    Tentacle.buildRig spread over several calls, so the UI can show progress and stay responsive. Each step
+    call builds for about `chunkSeconds` as one undo chunk of its own, so whatever the artist does between
+    two calls stays out of the build's undo steps. The first call checks the scene with
+    Tentacle.validateBuild, and fails without building anything when it finds problems.
+
+    A node added callback, registered for the length of each step call only, records the nodes the build
+    creates without relying on the undo queue or listing the scene, so nodes the artist creates between two
+    calls are not recorded. A failed or cancelled build deletes the recorded nodes that still exist, unbinds
+    the model and moves the ribbon curve back out of the rig, which leaves the scene as it was before the
+    build. A ribbon curve refit to surfaceSpans keeps its refit CVs.
+
+    Attributes:
+        done (int): Steps built so far, out of `total`.
+        state (str): 'pending', 'running', 'finished', 'failed' or 'cancelled'.
+        error (Exception): Why the build failed.
+        created (list): MObjectHandles of the nodes the build created so far.
+    """
+
+    def __init__(self, tentacle, chunkSeconds=0.05):
+        self.tentacle = tentacle
+        self.chunkSeconds = chunkSeconds
+        self.total = tentacle.buildSize()
+        self.done = 0
+        self.state = 'pending'
+        self.error = None
+        self.created = []
+        self._steps = tentacle.buildSteps()
+
+    def step(self):
+        """
+        Builds the next chunk.
+
+        Returns:
+            bool: True while there is more to build.
+        """
+        if self.state == 'pending':
+            # Nothing is built yet, so a failed check leaves nothing to roll back
+            try:
+                self.tentacle.checkBuild()
+            except Exception as error:
+                self.error = error
+                self.state = 'failed'
+                return False
+            if not cmds.undoInfo(query=True, state=True):
+                cmds.warning("The undo queue is off, so the ribbon rig build cannot be undone. "
+                             "Delete Rig removes it.")
+            self.state = 'running'
+        if self.state != 'running':
+            return False
+
+        import maya.api.OpenMaya as om
+
+        deadline = time.perf_counter() + self.chunkSeconds
+        callback = om.MDGMessage.addNodeAddedCallback(self.nodeAdded, 'dependNode')
+        cmds.undoInfo(openChunk=True, chunkName='autoRibbonBuild')
+        cmds.refresh(suspend=True)
+        try:
+            # At least one step per chunk, however slow it is
+            while True:
+                next(self._steps)
+                self.done += 1
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self.done = self.total
+            self.state = 'finished'
+        except Exception as error:
+            self.error = error
+            self.state = 'failed'
+        finally:
+            cmds.refresh(suspend=False)
+            cmds.undoInfo(closeChunk=True)
+            om.MMessage.removeCallback(callback)
+        if self.state == 'failed':
+            self.rollBack('failed')
+        return self.state == 'running'
+
+    def cancel(self):
+        """Stops the build and rolls back what it built so far."""
+        if self.state == 'running':
+            self._steps.close()
+            self.rollBack('cancelled')
+        elif self.state == 'pending':
+            self.state = 'cancelled'
+
+    def nodeAdded(self, node, clientData):
+        """MDGMessage node added callback of the running step call."""
+        import maya.api.OpenMaya as om
+
+        self.created.append(om.MObjectHandle(node))
+
+    def createdNodes(self):
+        """
+        Returns:
+            list: Full names of the nodes the build created that still exist, leaving out the ones it deleted
+                again, like its temporary nodes.
+        """
+        import maya.api.OpenMaya as om
+
+        nodes = []
+        for handle in self.created:
+            if not handle.isValid():
+                continue
+            node = handle.object()
+            if node.hasFn(om.MFn.kDagNode):
+                nodes.append(om.MFnDagNode(node).fullPathName())
+            else:
+                nodes.append(om.MFnDependencyNode(node).name())
+        return nodes
+
+    def rollBack(self, state):
+        """Deletes the nodes the build created in one call, after unbinding the model and freeing the curve."""
+        tentacle = self.tentacle
+        cmds.undoInfo(openChunk=True, chunkName='autoRibbonRollBack')
+        try:
+            tentacle.unbindRibbon()
+            tentacle.releaseRibbonCurve()
+            nodes = self.createdNodes()
+            if nodes:
+                cmds.delete(nodes)
+            tentacle.registry = {}
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        self.state = state
+
+
+def collectSegments(segments, roles=None):
+    """
+    Turns per-segment {role: node} dicts into {role: [node per segment]}, for Tentacle.register.
+
+    Args:
+        roles (tuple): Roles to collect, all roles of the segments by default.
+    """
+    roles = roles or (segments[0].keys() if segments else ())
+    return {role: [segment[role] for segment in segments] for role in roles}
+
+
+def sceneNames():
+    """The short names of all nodes in the scene, from one ls call."""
+    return set(name.split('|')[-1] for name in cmds.ls())
+
+
+def releaseSharedNodes(nodes):
+    """Deletes a shared network, given source first and output last, once no tentacle reads its output."""
+    if not cmds.listConnections(nodes[-1], source=False, destination=True):
+        cmds.delete(nodes)
+
+
+def scaleCurveShapes(curves, factor):
+    """Scales the CVs of control curves by `factor` around each curve's pivot."""
+    if factor == 1.0:
+        return
+    for curve in curves:
+        pivot = cmds.xform(curve, query=True, worldSpace=True, rotatePivot=True)
+        cmds.scale(factor, factor, factor, curve + '.cv[*]', relative=True, pivot=pivot)
+
+
+def createSquareCurve(name="squareCurve", size=1.0):
     # 创建曲线
-    curve = cmds.curve(p=points, d=1, name=name)  # d=1 表示线性曲线，连接点之间为直线
-    return curve
+    curve = AutoRibbonShapes.shapeCurve('square', size)
+    return cmds.curve(degree=curve['degree'], knot=curve['knots'], point=curve['points'], name=name)
 
 
 def createArrowCurve(name="arrowCurve"):
@@ -607,37 +2617,8 @@ def createArrowCurve(name="arrowCurve"):
     Returns:
         str: The name of the created curve.
     """
-    # Define the knot and point data
-    knots = [i for i in range(25)]  # Knot values
-    points = [(-4.5, 0, 0),
-              (-2.5, 0, -2),
-              (-2.5, 0, -1.5),
-              (-1.5, 0, -1.5),
-              (-1.5, 0, -2.5),
-              (-2, 0, -2.5),
-              (0, 0, -4.5),
-              (2, 0, -2.5),
-              (1.5, 0, -2.5),
-              (1.5, 0, -1.5),
-              (2.5, 0, -1.5),
-              (2.5, 0, -2),
-              (4.5, 0, 0),
-              (2.5, 0, 2),
-              (2.5, 0, 1.5),
-              (1.5, 0, 1.5),
-              (1.5, 0, 2.5),
-              (2, 0, 2.5),
-              (0, 0, 4.5),
-              (-2, 0, 2.5),
-              (-1.5, 0, 2.5),
-              (-1.5, 0, 1.5),
-              (-2.5, 0, 1.5),
-              (-2.5, 0, 2),
-              (-4.5, 0, 0)]
-
-    # Create the curve
-    curve = cmds.curve(degree=1, knot=knots, point=points, name=name)
-    return curve
+    curve = AutoRibbonShapes.shapeCurve('arrow')
+    return cmds.curve(degree=curve['degree'], knot=curve['knots'], point=curve['points'], name=name)
 
 
 # Example Usage
@@ -658,3 +2639,7 @@ tentacle.tentacleRoll()
 tentacle.tentacleRipple()
 tentacle.tentacleRibbonDeformer()
 """
+
+
+if __name__ == "__main__":
+    showWindow()
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'Ultimate_Ribbon_Rig_Generator_v2.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QApplication, QCheckBox, QFrame, QLabel,
+    QLineEdit, QMainWindow, QMenuBar, QProgressBar,
+    QPushButton, QRadioButton, QSizePolicy, QSlider,
+    QSpinBox, QStatusBar, QWidget)
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        if not MainWindow.objectName():
+            MainWindow.setObjectName(u"MainWindow")
+        MainWindow.resize(810, 1035)
+        self.centralwidget = QWidget(MainWindow)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.RadioButton_MainAxisX = QRadioButton(self.centralwidget)
+        self.RadioButton_MainAxisX.setObjectName(u"RadioButton_MainAxisX")
+        self.RadioButton_MainAxisX.setGeometry(QRect(140, 280, 92, 20))
+        self.RadioButton_MainAxisY = QRadioButton(self.centralwidget)
+        self.RadioButton_MainAxisY.setObjectName(u"RadioButton_MainAxisY")
+        self.RadioButton_MainAxisY.setGeometry(QRect(220, 280, 92, 20))
+        self.RadioButton_MainAxisY.setChecked(True)
+        self.RadioButton_MainAxisZ = QRadioButton(self.centralwidget)
+        self.RadioButton_MainAxisZ.setObjectName(u"RadioButton_MainAxisZ")
+        self.RadioButton_MainAxisZ.setGeometry(QRect(290, 280, 92, 20))
+        self.label = QLabel(self.centralwidget)
+        self.label.setObjectName(u"label")
+        self.label.setGeometry(QRect(20, 280, 101, 16))
+        self.FrameCurve = QFrame(self.centralwidget)
+        self.FrameCurve.setObjectName(u"FrameCurve")
+        self.FrameCurve.setGeometry(QRect(-10, 150, 821, 291))
+        self.FrameCurve.setFrameShape(QFrame.Shape.StyledPanel)
+        self.FrameCurve.setFrameShadow(QFrame.Shadow.Raised)
+        self.Slider_JointCount = QSlider(self.FrameCurve)
+        self.Slider_JointCount.setObjectName(u"Slider_JointCount")
+        self.Slider_JointCount.setGeometry(QRect(160, 90, 160, 16))
+        self.Slider_JointCount.setMinimum(2)
+        self.Slider_JointCount.setMaximum(100)
+        self.Slider_JointCount.setValue(2)
+        self.Slider_JointCount.setOrientation(Qt.Orientation.Horizontal)
+        self.Slider_JointCount.setInvertedAppearance(False)
+        self.Slider_JointCount.setInvertedControls(False)
+        self.NumberLabel_JointCount = QLabel(self.FrameCurve)
+        self.NumberLabel_JointCount.setObjectName(u"NumberLabel_JointCount")
+        self.NumberLabel_JointCount.setGeometry(QRect(350, 90, 49, 16))
+        self.Frame_JointCount = QFrame(self.FrameCurve)
+        self.Frame_JointCount.setObjectName(u"Frame_JointCount")
+        self.Frame_JointCount.setGeometry(QRect(340, 90, 31, 21))
+        self.Frame_JointCount.setFrameShape(QFrame.Shape.StyledPanel)
+        self.Frame_JointCount.setFrameShadow(QFrame.Shadow.Raised)
+        self.Label_JointCount = QLabel(self.FrameCurve)
+        self.Label_JointCount.setObjectName(u"Label_JointCount")
+        self.Label_JointCount.setGeometry(QRect(30, 90, 101, 16))
+        self.Title_Curve = QLabel(self.FrameCurve)
+        self.Title_Curve.setObjectName(u"Title_Curve")
+        self.Title_Curve.setGeometry(QRect(30, 10, 341, 31))
+        font = QFont()
+        font.setFamilies([u"Sans Serif Collection"])
+        font.setPointSize(12)
+        font.setBold(True)
+        self.Title_Curve.setFont(font)
+        self.Button_Curve = QPushButton(self.FrameCurve)
+        self.Button_Curve.setObjectName(u"Button_Curve")
+        self.Button_Curve.setGeometry(QRect(290, 230, 211, 41))
+        self.Label_JointPrefix = QLabel(self.FrameCurve)
+        self.Label_JointPrefix.setObjectName(u"Label_JointPrefix")
+        self.Label_JointPrefix.setGeometry(QRect(30, 52, 101, 16))
+        self.LineEdit_JointPrefix = QLineEdit(self.FrameCurve)
+        self.LineEdit_JointPrefix.setObjectName(u"LineEdit_JointPrefix")
+        self.LineEdit_JointPrefix.setGeometry(QRect(160, 45, 113, 31))
+        self.line_5 = QFrame(self.FrameCurve)
+        self.line_5.setObjectName(u"line_5")
+        self.line_5.setGeometry(QRect(10, 280, 811, 20))
+        font1 = QFont()
+        font1.setBold(True)
+        self.line_5.setFont(font1)
+        self.line_5.setFrameShape(QFrame.Shape.HLine)
+        self.line_5.setFrameShadow(QFrame.Shadow.Sunken)
+        self.label_2 = QLabel(self.FrameCurve)
+        self.label_2.setObjectName(u"label_2")
+        self.label_2.setGeometry(QRect(30, 170, 101, 16))
+        self.Spinbox_CurveLength = QSpinBox(self.FrameCurve)
+        self.Spinbox_CurveLength.setObjectName(u"Spinbox_CurveLength")
+        self.Spinbox_CurveLength.setGeometry(QRect(160, 165, 51, 31))
+        self.Spinbox_CurveLength.setMinimum(1)
+        self.Spinbox_CurveLength.setMaximum(1000)
+        self.Spinbox_CurveLength.setValue(1)
+        self.Frame_JointCount.raise_()
+        self.Slider_JointCount.raise_()
+        self.NumberLabel_JointCount.raise_()
+        self.Label_JointCount.raise_()
+        self.Title_Curve.raise_()
+        self.Button_Curve.raise_()
+        self.Label_JointPrefix.raise_()
+        self.LineEdit_JointPrefix.raise_()
+        self.line_5.raise_()
+        self.label_2.raise_()
+        self.Spinbox_CurveLength.raise_()
+        self.Frame_Ribbon = QFrame(self.centralwidget)
+        self.Frame_Ribbon.setObjectName(u"Frame_Ribbon")
+        self.Frame_Ribbon.setGeometry(QRect(0, 440, 811, 591))
+        self.Frame_Ribbon.setFrameShape(QFrame.Shape.StyledPanel)
+        self.Frame_Ribbon.setFrameShadow(QFrame.Shadow.Raised)
+        self.Button_RibbonRig = QPushButton(self.Frame_Ribbon)
+        self.Button_RibbonRig.setObjectName(u"Button_RibbonRig")
+        self.Button_RibbonRig.setGeometry(QRect(280, 500, 211, 41))
+        self.Title_Ribbon = QLabel(self.Frame_Ribbon)
+        self.Title_Ribbon.setObjectName(u"Title_Ribbon")
+        self.Title_Ribbon.setGeometry(QRect(20, 10, 341, 31))
+        self.Title_Ribbon.setFont(font)
+        self.SubTitle_FKDeform = QLabel(self.Frame_Ribbon)
+        self.SubTitle_FKDeform.setObjectName(u"SubTitle_FKDeform")
+        self.SubTitle_FKDeform.setGeometry(QRect(20, 150, 101, 16))
+        self.CheckBox_Roll = QCheckBox(self.Frame_Ribbon)
+        self.CheckBox_Roll.setObjectName(u"CheckBox_Roll")
+        self.CheckBox_Roll.setGeometry(QRect(40, 180, 78, 20))
+        self.CheckBox_Roll.setChecked(True)
+        self.RadioButton_RollX = QRadioButton(self.Frame_Ribbon)
+        self.RadioButton_RollX.setObjectName(u"RadioButton_RollX")
+        self.RadioButton_RollX.setEnabled(False)
+        self.RadioButton_RollX.setGeometry(QRect(160, 216, 92, 20))
+        self.label_12 = QLabel(self.Frame_Ribbon)
+        self.label_12.setObjectName(u"label_12")
+        self.label_12.setGeometry(QRect(40, 216, 101, 16))
+        self.RadioButton_RollY = QRadioButton(self.Frame_Ribbon)
+        self.RadioButton_RollY.setObjectName(u"RadioButton_RollY")
+        self.RadioButton_RollY.setEnabled(False)
+        self.RadioButton_RollY.setGeometry(QRect(240, 216, 92, 20))
+        self.CheckBox_Ripple = QCheckBox(self.Frame_Ribbon)
+        self.CheckBox_Ripple.setObjectName(u"CheckBox_Ripple")
+        self.CheckBox_Ripple.setGeometry(QRect(40, 250, 78, 20))
+        self.CheckBox_Ripple.setChecked(True)
+        self.label_13 = QLabel(self.Frame_Ribbon)
+        self.label_13.setObjectName(u"label_13")
+        self.label_13.setGeometry(QRect(20, 430, 101, 16))
+        self.CheckBox_Twist = QCheckBox(self.Frame_Ribbon)
+        self.CheckBox_Twist.setObjectName(u"CheckBox_Twist")
+        self.CheckBox_Twist.setGeometry(QRect(40, 460, 78, 20))
+        self.CheckBox_Twist.setChecked(True)
+        self.CheckBox_Sine = QCheckBox(self.Frame_Ribbon)
+        self.CheckBox_Sine.setObjectName(u"CheckBox_Sine")
+        self.CheckBox_Sine.setGeometry(QRect(150, 460, 78, 20))
+        self.CheckBox_Sine.setChecked(True)
+        self.CheckBox_Wire = QCheckBox(self.Frame_Ribbon)
+        self.CheckBox_Wire.setObjectName(u"CheckBox_Wire")
+        self.CheckBox_Wire.setGeometry(QRect(250, 460, 78, 20))
+        self.CheckBox_Wire.setChecked(True)
+        self.label_16 = QLabel(self.Frame_Ribbon)
+        self.label_16.setObjectName(u"label_16")
+        self.label_16.setGeometry(QRect(20, 48, 101, 16))
+        self.line = QFrame(self.Frame_Ribbon)
+        self.line.setObjectName(u"line")
+        self.line.setGeometry(QRect(-10, 290, 801, 20))
+        self.line.setFrameShape(QFrame.Shape.HLine)
+        self.line.setFrameShadow(QFrame.Shadow.Sunken)
+        self.LineEdit = QLineEdit(self.Frame_Ribbon)
+        self.LineEdit.setObjectName(u"LineEdit")
+        self.LineEdit.setGeometry(QRect(170, 66, 113, 31))
+        self.label_17 = QLabel(self.Frame_Ribbon)
+        self.label_17.setObjectName(u"label_17")
+        self.label_17.setGeometry(QRect(42, 76, 131, 16))
+        self.CheckBox_FKDriverCTRL = QCheckBox(self.Frame_Ribbon)
+        self.CheckBox_FKDriverCTRL.setObjectName(u"CheckBox_FKDriverCTRL")
+        self.CheckBox_FKDriverCTRL.setGeometry(QRect(40, 110, 251, 20))
+        self.label_18 = QLabel(self.Frame_Ribbon)
+        self.label_18.setObjectName(u"label_18")
+        self.label_18.setGeometry(QRect(20, 320, 101, 16))
+        self.label_19 = QLabel(self.Frame_Ribbon)
+        self.label_19.setObjectName(u"label_19")
+        self.label_19.setGeometry(QRect(42, 350, 131, 16))
+        self.LineEdit_RibbonPrefix = QLineEdit(self.Frame_Ribbon)
+        self.LineEdit_RibbonPrefix.setObjectName(u"LineEdit_RibbonPrefix")
+        self.LineEdit_RibbonPrefix.setGeometry(QRect(170, 343, 113, 31))
+        self.label_21 = QLabel(self.Frame_Ribbon)
+        self.label_21.setObjectName(u"label_21")
+        self.label_21.setGeometry(QRect(42, 385, 131, 16))
+        self.Frame_RibbonWidth = QFrame(self.Frame_Ribbon)
+        self.Frame_RibbonWidth.setObjectName(u"Frame_RibbonWidth")
+        self.Frame_RibbonWidth.setGeometry(QRect(350, 390, 31, 21))
+        self.Frame_RibbonWidth.setFrameShape(QFrame.Shape.StyledPanel)
+        self.Frame_RibbonWidth.setFrameShadow(QFrame.Shadow.Raised)
+        self.NumberLabel_RibbonWidth = QLabel(self.Frame_RibbonWidth)
+        self.NumberLabel_RibbonWidth.setObjectName(u"NumberLabel_RibbonWidth")
+        self.NumberLabel_RibbonWidth.setGeometry(QRect(10, 0, 49, 16))
+        self.Slider_RibbonWidth = QSlider(self.Frame_Ribbon)
+        self.Slider_RibbonWidth.setObjectName(u"Slider_RibbonWidth")
+        self.Slider_RibbonWidth.setGeometry(QRect(170, 390, 160, 16))
+        self.Slider_RibbonWidth.setMaximum(40)
+        self.Slider_RibbonWidth.setValue(0)
+        self.Slider_RibbonWidth.setOrientation(Qt.Orientation.Horizontal)
+        self.Slider_RibbonWidth.setInvertedAppearance(False)
+        self.Slider_RibbonWidth.setInvertedControls(False)
+        self.RadioButton_RollZ = QRadioButton(self.Frame_Ribbon)
+        self.RadioButton_RollZ.setObjectName(u"RadioButton_RollZ")
+        self.RadioButton_RollZ.setEnabled(False)
+        self.RadioButton_RollZ.setGeometry(QRect(310, 216, 92, 20))
+        self.RadioButton_RollZ.setChecked(True)
+        self.Button_CancelRibbonRig = QPushButton(self.Frame_Ribbon)
+        self.Button_CancelRibbonRig.setObjectName(u"Button_CancelRibbonRig")
+        self.Button_CancelRibbonRig.setEnabled(False)
+        self.Button_CancelRibbonRig.setGeometry(QRect(510, 500, 101, 41))
+        self.Button_DeleteRibbonRig = QPushButton(self.Frame_Ribbon)
+        self.Button_DeleteRibbonRig.setObjectName(u"Button_DeleteRibbonRig")
+        self.Button_DeleteRibbonRig.setGeometry(QRect(630, 500, 101, 41))
+        self.ProgressBar_RibbonRig = QProgressBar(self.Frame_Ribbon)
+        self.ProgressBar_RibbonRig.setObjectName(u"ProgressBar_RibbonRig")
+        self.ProgressBar_RibbonRig.setGeometry(QRect(280, 550, 331, 23))
+        self.ProgressBar_RibbonRig.setValue(0)
+        self.frame_4 = QFrame(self.centralwidget)
+        self.frame_4.setObjectName(u"frame_4")
+        self.frame_4.setGeometry(QRect(0, 60, 811, 91))
+        self.frame_4.setFrameShape(QFrame.Shape.StyledPanel)
+        self.frame_4.setFrameShadow(QFrame.Shadow.Raised)
+        self.label_14 = QLabel(self.frame_4)
+        self.label_14.setObjectName(u"label_14")
+        self.label_14.setGeometry(QRect(20, 10, 341, 31))
+        self.label_14.setFont(font)
+        self.LineEdit_ModelName = QLineEdit(self.frame_4)
+        self.LineEdit_ModelName.setObjectName(u"LineEdit_ModelName")
+        self.LineEdit_ModelName.setGeometry(QRect(150, 40, 113, 31))
+        self.label_15 = QLabel(self.frame_4)
+        self.label_15.setObjectName(u"label_15")
+        self.label_15.setGeometry(QRect(20, 50, 131, 16))
+        self.line_2 = QFrame(self.frame_4)
+        self.line_2.setObjectName(u"line_2")
+        self.line_2.setGeometry(QRect(0, 80, 811, 20))
+        self.line_2.setFont(font1)
+        self.line_2.setFrameShape(QFrame.Shape.HLine)
+        self.line_2.setFrameShadow(QFrame.Shadow.Sunken)
+        self.frame_6 = QFrame(self.centralwidget)
+        self.frame_6.setObjectName(u"frame_6")
+        self.frame_6.setGeometry(QRect(0, -40, 811, 101))
+        self.frame_6.setFrameShape(QFrame.Shape.StyledPanel)
+        self.frame_6.setFrameShadow(QFrame.Shadow.Raised)
+        self.label_6 = QLabel(self.frame_6)
+        self.label_6.setObjectName(u"label_6")
+        self.label_6.setGeometry(QRect(290, 40, 351, 41))
+        font2 = QFont()
+        font2.setFamilies([u"Sans Serif Collection"])
+        font2.setPointSize(14)
+        font2.setBold(True)
+        self.label_6.setFont(font2)
+        self.label_7 = QLabel(self.frame_6)
+        self.label_7.setObjectName(u"label_7")
+        self.label_7.setGeometry(QRect(600, 60, 49, 16))
+        self.label_8 = QLabel(self.frame_6)
+        self.label_8.setObjectName(u"label_8")
+        self.label_8.setGeometry(QRect(330, 80, 161, 16))
+        font3 = QFont()
+        font3.setBold(False)
+        self.label_8.setFont(font3)
+        self.line_4 = QFrame(self.frame_6)
+        self.line_4.setObjectName(u"line_4")
+        self.line_4.setGeometry(QRect(0, 100, 811, 20))
+        self.line_4.setFont(font1)
+        self.line_4.setFrameShape(QFrame.Shape.HLine)
+        self.line_4.setFrameShadow(QFrame.Shadow.Sunken)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.Frame_Ribbon.raise_()
+        self.FrameCurve.raise_()
+        self.RadioButton_MainAxisX.raise_()
+        self.RadioButton_MainAxisY.raise_()
+        self.RadioButton_MainAxisZ.raise_()
+        self.label.raise_()
+        self.frame_4.raise_()
+        self.frame_6.raise_()
+        self.menubar = QMenuBar(MainWindow)
+        self.menubar.setObjectName(u"menubar")
+        self.menubar.setGeometry(QRect(0, 0, 810, 17))
+        MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QStatusBar(MainWindow)
+        self.statusbar.setObjectName(u"statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        self.Slider_JointCount.sliderMoved.connect(self.NumberLabel_JointCount.setNum)
+        self.CheckBox_Roll.toggled.connect(self.RadioButton_RollZ.setEnabled)
+        self.CheckBox_Roll.toggled.connect(self.RadioButton_RollX.setEnabled)
+        self.CheckBox_Roll.toggled.connect(self.RadioButton_RollY.setEnabled)
+        self.Slider_RibbonWidth.sliderMoved.connect(self.NumberLabel_RibbonWidth.setNum)
+
+        QMetaObject.connectSlotsByName(MainWindow)
+    # setupUi
+
+    def retranslateUi(self, MainWindow):
+        MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"MainWindow", None))
+        self.RadioButton_MainAxisX.setText(QCoreApplication.translate("MainWindow", u"X", None))
+        self.RadioButton_MainAxisY.setText(QCoreApplication.translate("MainWindow", u"Y", None))
+        self.RadioButton_MainAxisZ.setText(QCoreApplication.translate("MainWindow", u"Z", None))
+        self.label.setText(QCoreApplication.translate("MainWindow", u"Main Axis:", None))
+        self.NumberLabel_JointCount.setText(QCoreApplication.translate("MainWindow", u"2", None))
+        self.Label_JointCount.setText(QCoreApplication.translate("MainWindow", u"Joint Count:", None))
+        self.Title_Curve.setText(QCoreApplication.translate("MainWindow", u"Ribbon Joint Guide Curve", None))
+        self.Button_Curve.setText(QCoreApplication.translate("MainWindow", u"Generate NURBS Curve", None))
+        self.Label_JointPrefix.setText(QCoreApplication.translate("MainWindow", u"Joint Prefix:", None))
+        self.LineEdit_JointPrefix.setText(QCoreApplication.translate("MainWindow", u"JNT", None))
+        self.label_2.setText(QCoreApplication.translate("MainWindow", u"Curve Length:", None))
+        self.Button_RibbonRig.setText(QCoreApplication.translate("MainWindow", u"Generate Ribbon Rig", None))
+        self.Title_Ribbon.setText(QCoreApplication.translate("MainWindow", u"Ribbon Rig Generation", None))
+        self.SubTitle_FKDeform.setText(QCoreApplication.translate("MainWindow", u"FK Deform:", None))
+        self.CheckBox_Roll.setText(QCoreApplication.translate("MainWindow", u"Roll", None))
+        self.RadioButton_RollX.setText(QCoreApplication.translate("MainWindow", u"X", None))
+        self.label_12.setText(QCoreApplication.translate("MainWindow", u"Roll Axis:", None))
+        self.RadioButton_RollY.setText(QCoreApplication.translate("MainWindow", u"Y", None))
+        self.CheckBox_Ripple.setText(QCoreApplication.translate("MainWindow", u"Ripple", None))
+        self.label_13.setText(QCoreApplication.translate("MainWindow", u"Ribbon Deformer:", None))
+        self.CheckBox_Twist.setText(QCoreApplication.translate("MainWindow", u"Twist", None))
+        self.CheckBox_Sine.setText(QCoreApplication.translate("MainWindow", u"Sine", None))
+        self.CheckBox_Wire.setText(QCoreApplication.translate("MainWindow", u"Bend", None))
+        self.label_16.setText(QCoreApplication.translate("MainWindow", u"FK:", None))
+        self.LineEdit.setText(QCoreApplication.translate("MainWindow", u"FK", None))
+        self.label_17.setText(QCoreApplication.translate("MainWindow", u"FK CTRL Prefix:", None))
+        self.CheckBox_FKDriverCTRL.setText(QCoreApplication.translate("MainWindow", u" Generate FK Driver CTRL", None))
+        self.label_18.setText(QCoreApplication.translate("MainWindow", u"Ribbon:", None))
+        self.label_19.setText(QCoreApplication.translate("MainWindow", u"Ribbon Prefix:", None))
+        self.LineEdit_RibbonPrefix.setText(QCoreApplication.translate("MainWindow", u"Ribbon", None))
+        self.label_21.setText(QCoreApplication.translate("MainWindow", u"Ribbon Width:", None))
+        self.NumberLabel_RibbonWidth.setText(QCoreApplication.translate("MainWindow", u"0", None))
+        self.RadioButton_RollZ.setText(QCoreApplication.translate("MainWindow", u"Z", None))
+        self.Button_CancelRibbonRig.setText(QCoreApplication.translate("MainWindow", u"Cancel", None))
+        self.Button_DeleteRibbonRig.setText(QCoreApplication.translate("MainWindow", u"Delete Rig", None))
+        self.label_14.setText(QCoreApplication.translate("MainWindow", u"Target Model", None))
+        self.LineEdit_ModelName.setText(QCoreApplication.translate("MainWindow", u"tentacle", None))
+        self.label_15.setText(QCoreApplication.translate("MainWindow", u"Model Name:", None))
+        self.label_6.setText(QCoreApplication.translate("MainWindow", u"Ultimate Ribbon Rig", None))
+        self.label_7.setText(QCoreApplication.translate("MainWindow", u"v 1.0.0", None))
+        self.label_8.setText(QCoreApplication.translate("MainWindow", u"Created by Jim Zhao", None))
+    # retranslateUi
+
@@ -0,0 +1,163 @@
+"""
+Regression tests of the Auto Ribbon Tool's Maya-free math: AutoRibbonMath,
+the RigLayout precomputation and the offline solver.
+
+The RigLayout values are checked against the per-joint formulas of the
+original cmds build, so a change of the vectorized layout that moves a joint,
+follicle, ctrl or weight window shows up here before it shows up in a rig.
+
+Usage:
+    python -m pytest -q test_AutoRibbon.py
+    python AutoRibbonBench.py --check    (runs these as well)
+"""
+
+import numpy
+import pytest
+
+import AutoRibbonMath
+import AutoRibbonSolver
+from AutoRibbonLayout import AXIS_VECTORS, RigLayout
+
+LAYOUT_CASES = [(2, 100.0, True, 'y'), (5, 500.0, True, 'y'), (9, 30.0, False, 'x'), (17, 240.0, True, 'z')]
+
+
+def test_rollAnglesFollowTheRollSections():
+    # Four ctrls, sections [0.75, 1], [0.5, 0.75], [0.25, 0.5], [0, 0.25], scaled by the 0..1 ramp
+    assert AutoRibbonMath.rollAngles(0.0, -70.0, 0.0, 4) == pytest.approx([0.0, 0.0, 0.0, 0.0])
+    assert AutoRibbonMath.rollAngles(0.5, -70.0, 0.0, 4) == pytest.approx([0.0, 0.0, -140.0 / 3.0, -70.0])
+    assert AutoRibbonMath.rollAngles(1.0, -70.0, 0.0, 4) == pytest.approx([0.0, -70.0 / 3.0, -140.0 / 3.0, -70.0])
+    # Half way through the third section, and a falloff that starts every section 0.25 earlier
+    assert AutoRibbonMath.rollAngles(0.375, 30.0, 0.0, 4) == pytest.approx([0.0, 0.0, 10.0, 30.0])
+    assert AutoRibbonMath.rollAngles(0.5, 30.0, 0.25, 4) == pytest.approx([0.0, 5.0, 20.0, 30.0])
+
+
+def test_rollAnglesBroadcastOverFrames():
+    rolls = numpy.array([0.0, 0.5, 1.0])
+    angles = AutoRibbonMath.rollAngles(rolls, -70.0, 0.0, 4)
+    assert angles.shape == (3, 4)
+    for frame, roll in enumerate(rolls):
+        assert angles[frame] == pytest.approx(AutoRibbonMath.rollAngles(roll, -70.0, 0.0, 4))
+
+
+def test_rippleScalesPeakAtTheRippledJoint():
+    # Joint 1 of 4 peaks at 1.5 / 5 of the frequency
+    out, scales = AutoRibbonMath.rippleScales(1.5, 5.0, 1.5, 0.0, 0.0, 4)
+    assert float(out) == pytest.approx(1.5)
+    assert scales == pytest.approx([1.0, 1.5, 1.0, 1.0])
+    # RippleOut wraps at the frequency and adds the offset
+    out, wrapped = AutoRibbonMath.rippleScales(6.0, 5.0, 1.5, 0.5, 0.0, 4)
+    assert float(out) == pytest.approx(1.5)
+    assert wrapped == pytest.approx(scales)
+    # At rest, and with a zero frequency, nothing scales
+    assert AutoRibbonMath.rippleScales(0.0, 5.0, 1.5, 0.0, 0.05, 4)[1] == pytest.approx(numpy.ones(4))
+    assert AutoRibbonMath.rippleScales(1.5, 0.0, 1.5, 0.0, 0.05, 4)[1] == pytest.approx(numpy.ones(4))
+
+
+def test_cappedWeightsKeepTheNearestInfluences():
+    weights = AutoRibbonMath.cappedWeights([0.0, 0.25, 1.5, 3.0, 7.0], 4, maxInfluences=2, falloff=1.0)
+    assert weights.sum(axis=1) == pytest.approx(numpy.ones(5))
+    assert weights[0] == pytest.approx([1.0, 0.0, 0.0, 0.0])
+    assert weights[1] == pytest.approx([0.75, 0.25, 0.0, 0.0])
+    assert weights[2] == pytest.approx([0.0, 0.5, 0.5, 0.0])
+    assert weights[3] == pytest.approx([0.0, 0.0, 0.0, 1.0])
+    # Out of every influence's reach, the point goes fully to the nearest one
+    assert weights[4] == pytest.approx([0.0, 0.0, 0.0, 1.0])
+    # A wide falloff reaches all four influences, of which the cap keeps the two nearest
+    wide = AutoRibbonMath.cappedWeights([1.4], 4, maxInfluences=2, falloff=3.0)
+    assert wide[0] == pytest.approx(numpy.array([0.0, 2.6, 2.4, 0.0]) / 5.0)
+
+
+def test_chainSkinWeightsFollowTheInfluenceOrder():
+    chain = numpy.outer(numpy.arange(4.0), (0.0, 10.0, 0.0))
+    points = [(1.0, 5.0, 0.0), (0.0, 22.5, 0.0)]
+    inChainOrder = AutoRibbonMath.chainSkinWeights(points, chain, [0, 1, 2])
+    assert inChainOrder == pytest.approx(numpy.array([[0.5, 0.5, 0.0], [0.0, 0.0, 1.0]]))
+    assert AutoRibbonMath.chainSkinWeights(points, chain, [2, 0, 1]) == pytest.approx(inChainOrder[:, [2, 0, 1]])
+
+
+def test_arcLengthSamplesAreEvenlySpaced():
+    # A polyline with uneven CV spacing is measured exactly
+    cvs = [(0.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 10.0, 0.0)]
+    positions, parameters, length = AutoRibbonMath.arcLengthSamples(cvs, [0.0, 1.0, 2.0], 1, 5)
+    assert length == pytest.approx(10.0)
+    assert positions[:, 1] == pytest.approx([0.0, 2.5, 5.0, 7.5, 10.0])
+    assert parameters == pytest.approx([0.0, (1.0 + 1.5 / 9.0) / 2.0, (1.0 + 4.0 / 9.0) / 2.0,
+                                        (1.0 + 6.5 / 9.0) / 2.0, 1.0])
+
+    # A bent cubic curve within the table's resolution
+    cvs = [(0.0, 0.0, 0.0), (0.0, 40.0, 0.0), (30.0, 60.0, 0.0), (80.0, 60.0, 10.0), (100.0, 20.0, 0.0)]
+    knots = [0.0, 0.0, 0.0, 1.0, 2.0, 2.0, 2.0]
+    positions, parameters, length = AutoRibbonMath.arcLengthSamples(cvs, knots, 3, 12)
+    # Arc length between consecutive samples, measured on a finer polyline than the sampling table
+    fine = numpy.linspace(parameters[:-1], parameters[1:], 257, axis=1) * 2.0
+    finePoints = AutoRibbonMath.curvePoints(cvs, AutoRibbonMath.fullKnots(knots), 3, fine.ravel()).reshape(11, 257, 3)
+    spacing = numpy.linalg.norm(numpy.diff(finePoints, axis=1), axis=2).sum(axis=1)
+    assert spacing == pytest.approx(numpy.full(11, length / 11.0), rel=1e-3)
+    assert positions[[0, -1]] == pytest.approx(numpy.array([cvs[0], cvs[-1]]))
+    assert parameters[[0, -1]] == pytest.approx([0.0, 1.0])
+    assert numpy.all(numpy.diff(parameters) > 0.0)
+
+
+def test_surfaceSpanCountIsTheFewestWithinTolerance():
+    straight = numpy.outer(numpy.arange(9.0), (0.0, 10.0, 0.0))
+    assert AutoRibbonMath.surfaceSpanCount(straight, 0.01) == 1
+
+    angle = numpy.linspace(0.0, 1.5 * numpy.pi, 25)
+    bent = numpy.stack([numpy.cos(angle), numpy.sin(angle), angle / 4.0], axis=1) * 50.0
+    tolerance = 0.5
+    spanCount = AutoRibbonMath.surfaceSpanCount(bent, tolerance)
+    assert 1 < spanCount < len(bent) - 1
+    assert AutoRibbonMath.fitCurve(bent, spanCount)[1] <= tolerance
+    assert AutoRibbonMath.fitCurve(bent, spanCount - 1)[1] > tolerance
+    assert AutoRibbonMath.surfaceSpanCount(bent, tolerance, maxSpans=2) == 2
+
+
+@pytest.mark.parametrize('jointCount, tentacleLength, isAutoMeasureLength, primaryAxis', LAYOUT_CASES)
+def test_rigLayoutMatchesTheCmdsBuild(jointCount, tentacleLength, isAutoMeasureLength, primaryAxis):
+    layout = RigLayout(jointCount, tentacleLength, isAutoMeasureLength, primaryAxis)
+    axisVector = AXIS_VECTORS[primaryAxis]
+    lengthPerSegment = tentacleLength / jointCount if isAutoMeasureLength else tentacleLength
+    step = tentacleLength / float(jointCount - 1)
+    fkCtrlNum = jointCount - 1
+    unitVal = 1 / float(jointCount + 1)
+
+    for i in range(jointCount):
+        assert layout.curvePositions[i] == pytest.approx([v * step * i for v in axisVector])
+        assert layout.jointPositions[i] == pytest.approx([v * lengthPerSegment * i for v in axisVector])
+        assert layout.follicleU[i] == pytest.approx(0.5)
+        assert layout.follicleV[i] == pytest.approx(float(i) / (jointCount - 1))
+        assert layout.rippleStart[i] == pytest.approx(i * unitVal)
+        assert layout.ripplePeak[i] == pytest.approx((i + 0.5) * unitVal)
+        assert layout.rippleEnd[i] == pytest.approx((i + 1) * unitVal)
+
+    assert layout.ctrlCount == fkCtrlNum
+    for i in range(fkCtrlNum):
+        assert layout.ctrlIsSquare[i] == (i % 4 == 0)
+        assert layout.ctrlSizes[i] == pytest.approx(lengthPerSegment / 0.5 if i % 4 == 0 else lengthPerSegment / 1.0)
+        assert layout.rollWeightMax[i] == pytest.approx(1 - float(i) / fkCtrlNum)
+        assert layout.rollWeightMin[i] == pytest.approx(1 - float(i + 1) / fkCtrlNum)
+
+    assert layout.drvCtrlScale == pytest.approx(lengthPerSegment / 0.5)
+    assert layout.endCtrlSize == pytest.approx(tentacleLength / 3.0)
+
+
+def test_rigLayoutNeedsTwoJoints():
+    with pytest.raises(ValueError):
+        RigLayout(1, 100.0)
+
+
+@pytest.mark.parametrize('primaryAxis, rollAxis', [('y', 'x'), ('x', 'z'), ('z', 'y')])
+def test_solveJointsAtDefaultDriversIsTheRestPose(primaryAxis, rollAxis):
+    spec = {'jointCount': 9, 'tentacleLength': 400.0, 'primaryAxis': primaryAxis, 'rollAxis': rollAxis}
+    matrices = AutoRibbonSolver.solveJoints(spec, {})
+    layout = RigLayout(9, 400.0, primaryAxis=primaryAxis)
+
+    assert matrices.shape == (1, 9, 4, 4)
+    rest = numpy.broadcast_to(numpy.identity(4), (9, 4, 4)).copy()
+    rest[:, 3, :3] = layout.curvePositions
+    assert matrices[0] == pytest.approx(rest)
+
+
+def test_solveJointsRejectsUnknownDrivers():
+    with pytest.raises(ValueError):
+        AutoRibbonSolver.solveJoints({'jointCount': 4, 'tentacleLength': 100.0}, {'Wobble': 1.0})